@@ -0,0 +1,262 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# Action codes used by the vectorized engine (mirrors reflex_agent's "Clean"/"Move")
+CLEAN = 0
+MOVE = 1
+IDLE = 2
+ACTION_NAMES = ("Clean", "Move", "Idle")
+
+
+# Vectorized reflex agent: same rule as reflex_agent(), applied to a whole array of percepts
+def reflex_agent_batch(dirty):
+    """Return CLEAN where the percept is dirty and MOVE everywhere else."""
+    return np.where(dirty, CLEAN, MOVE).astype(np.uint8)
+
+
+class ReflexPolicy:
+    """The original "Clean if Dirty else Move" rule for every world and agent at once.
+
+    A policy is asked for (cleaning, new_pos) each step: a boolean array of
+    agents that clean their cell and the cell every agent ends up on, both
+    shaped like world.agent_pos. update() runs after the world has applied
+    cleaning and re-spawn, so stateful policies can follow the changes.
+    """
+    name = "reflex"
+
+    def reset(self, world):
+        pass
+
+    def act(self, world):
+        cleaning = reflex_agent_batch(world.percepts()) == CLEAN
+        new_pos = np.where(cleaning, world.agent_pos, (world.agent_pos + 1) % world.n_cells)
+        return cleaning, new_pos
+
+    def update(self, world):
+        pass
+
+
+@dataclass(frozen=True)
+class GridConfig:
+    """One seeded vacuum-world configuration.
+
+    dirt_prob    -- chance that each cell starts dirty
+    respawn_prob -- chance per cell per step that dirt reappears (0 = static world)
+    """
+    width: int = 2
+    height: int = 2
+    dirt_prob: float = 0.25
+    respawn_prob: float = 0.0
+    n_agents: int = 1
+    seed: int = 0
+    max_steps: int = 1000
+    policy: str = "reflex"
+
+    @property
+    def shape_key(self):
+        """Configs sharing this key can be stepped together in one batch."""
+        return (self.height, self.width, self.n_agents, self.max_steps, self.policy)
+
+
+class BatchVacuumWorld:
+    """Many independent height x width vacuum worlds advanced in lock-step.
+
+    Cells are stored flattened in row-major order starting at the top-left,
+    which matches the Room1..Room4 order of the original 2x2 demo, so an
+    agent "moving to the next room" simply advances its cell index by one.
+
+    dirt      -- uint8 array of shape (n_envs, height * width), 1 = dirty
+    agent_pos -- int64 array of shape (n_envs, n_agents), the flat cell of each agent
+    cleaned, spawned -- indices into dirt.reshape(-1) that changed in the last step
+
+    dirt_prob and respawn_prob may be scalars or one value per world. Set
+    record_every to sample the clean fraction of every world every N steps.
+    policy decides what the agents do (ReflexPolicy by default). profiler
+    (e.g. profiling.PhaseTimer) gets a "decide" and an "update" lap per step.
+    """
+
+    def __init__(self, n_envs=1, height=2, width=2, dirt_prob=0.25, respawn_prob=0.0,
+                 n_agents=1, seed=None, dirt=None, agent_pos=None, record_every=0, policy=None,
+                 profiler=None):
+        self.n_envs = n_envs
+        self.height = height
+        self.width = width
+        self.n_agents = n_agents
+        self.n_cells = height * width
+        self.rng = np.random.default_rng(seed)
+        self.respawn_prob = np.broadcast_to(np.asarray(respawn_prob, dtype=float), (n_envs,)).copy()
+
+        if dirt is None:
+            dirt_prob = np.broadcast_to(np.asarray(dirt_prob, dtype=float), (n_envs,))
+            dirt = self.rng.random((n_envs, self.n_cells)) < dirt_prob[:, None]
+        self.dirt = np.ascontiguousarray(dirt, dtype=np.uint8).reshape(n_envs, self.n_cells)
+        self._flat_dirt = self.dirt.reshape(-1)
+
+        if agent_pos is None:
+            # Spread the agents evenly along the cleaning cycle
+            agent_pos = np.linspace(0, self.n_cells, n_agents, endpoint=False).astype(np.int64)
+        self.agent_pos = np.broadcast_to(np.asarray(agent_pos, dtype=np.int64).reshape(-1, n_agents),
+                                         (n_envs, n_agents)).copy()
+
+        self._rows = np.arange(n_envs)[:, None]
+        self.steps = 0
+        self.cleans = np.zeros(n_envs, dtype=np.int64)
+        self.moves = np.zeros(n_envs, dtype=np.int64)
+        self.wasted_moves = np.zeros(n_envs, dtype=np.int64)
+        self.dirty_count = self.dirt.sum(axis=1, dtype=np.int64)
+        self.steps_to_clean = np.where(self.dirty_count == 0, 0, -1)
+        self.cleaned = np.empty(0, dtype=np.int64)
+        self.spawned = np.empty(0, dtype=np.int64)
+
+        self.record_every = record_every
+        self.history = []
+        if record_every:
+            self._record()
+
+        self.policy = policy if policy is not None else ReflexPolicy()
+        self.policy.reset(self)
+        self.profiler = profiler
+
+    @classmethod
+    def from_environment(cls, environment, agent_index=0, width=2):
+        """Build a single-world batch from the dict-of-strings layout used in reflex_agent.py."""
+        dirt = np.array([[state == "Dirty" for state in environment.values()]], dtype=np.uint8)
+        height = dirt.shape[1] // width
+        return cls(n_envs=1, height=height, width=width, dirt=dirt, agent_pos=[agent_index])
+
+    @classmethod
+    def from_configs(cls, configs, record_every=0, policy=None):
+        """Build one batch from configs that share a GridConfig.shape_key.
+
+        Each world's initial dirt comes from its own seed, so a config gives
+        the same starting grid no matter which batch it lands in.
+        """
+        keys = {c.shape_key for c in configs}
+        if len(keys) != 1:
+            raise ValueError(f"Configs must share height, width, n_agents, max_steps and policy, got {sorted(keys)}")
+        first = configs[0]
+        n_cells = first.height * first.width
+        dirt = np.empty((len(configs), n_cells), dtype=np.uint8)
+        for row, config in zip(dirt, configs):
+            row[:] = np.random.default_rng(config.seed).random(n_cells) < config.dirt_prob
+        return cls(
+            n_envs=len(configs), height=first.height, width=first.width,
+            respawn_prob=[c.respawn_prob for c in configs], n_agents=first.n_agents,
+            seed=[c.seed for c in configs], dirt=dirt, record_every=record_every, policy=policy,
+        )
+
+    @property
+    def grid(self):
+        """View of the dirt array shaped (n_envs, height, width)."""
+        return self.dirt.reshape(self.n_envs, self.height, self.width)
+
+    def percepts(self):
+        """What every agent currently sees: 1 if its cell is dirty, else 0."""
+        return self.dirt[self._rows, self.agent_pos]
+
+    def step(self):
+        """Advance every world by one step and return the actions taken."""
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+        cleaning, new_pos = self.policy.act(self)
+        if profiler is not None:
+            profiler.lap("decide")
+        moving = new_pos != self.agent_pos
+
+        self._clean(cleaning)
+        self.wasted_moves += (moving & (self.dirt[self._rows, new_pos] == 0)).sum(axis=1)
+        self.agent_pos = new_pos
+
+        self.cleans += cleaning.sum(axis=1)
+        self.moves += moving.sum(axis=1)
+        self._respawn()
+        self.policy.update(self)
+        self.steps += 1
+
+        finished = (self.dirty_count == 0) & (self.steps_to_clean < 0)
+        self.steps_to_clean[finished] = self.steps
+        if self.record_every and self.steps % self.record_every == 0:
+            self._record()
+        if profiler is not None:
+            profiler.lap("update")
+        return np.where(cleaning, CLEAN, np.where(moving, MOVE, IDLE)).astype(np.uint8)
+
+    def _clean(self, cleaning):
+        """Clear the cells of every cleaning agent and keep dirty_count in sync."""
+        env, agent = np.nonzero(cleaning)
+        if env.size == 0:
+            self.cleaned = np.empty(0, dtype=np.int64)
+            return
+        flat = env * self.n_cells + self.agent_pos[env, agent]
+        if self.n_agents > 1:
+            flat = np.unique(flat)  # two agents cleaning the same cell count once
+        self._flat_dirt[flat] = 0
+        self.dirty_count -= np.bincount(flat // self.n_cells, minlength=self.n_envs)
+        self.cleaned = flat
+
+    def _respawn(self):
+        """Drop new dirt on random cells; only touches the cells that actually change."""
+        if not self.respawn_prob.any():
+            return
+        per_env = self.rng.binomial(self.n_cells, self.respawn_prob)
+        total = int(per_env.sum())
+        if total == 0:
+            self.spawned = np.empty(0, dtype=np.int64)
+            return
+        env = np.repeat(np.arange(self.n_envs), per_env)
+        flat = np.unique(env * self.n_cells + self.rng.integers(0, self.n_cells, total))
+        flat = flat[self._flat_dirt[flat] == 0]
+        self._flat_dirt[flat] = 1
+        self.dirty_count += np.bincount(flat // self.n_cells, minlength=self.n_envs)
+        self.spawned = flat
+
+    def _record(self):
+        self.history.append(1.0 - self.dirty_count / self.n_cells)
+
+    def run(self, steps, until_clean=False):
+        """Run up to `steps` steps and return agent-steps per second.
+
+        With until_clean=True the run stops as soon as every world has been
+        fully clean at least once.
+        """
+        start = time.perf_counter()
+        done = 0
+        for _ in range(steps):
+            if until_clean and (self.steps_to_clean >= 0).all():
+                break
+            self.step()
+            done += 1
+        elapsed = time.perf_counter() - start
+        return done * self.n_envs * self.n_agents / elapsed if elapsed > 0 else float("inf")
+
+    def all_clean(self):
+        """Boolean array: True for every world with no dirt left."""
+        return self.dirty_count == 0
+
+    def cleanliness(self):
+        """Sampled clean fraction over time, shaped (n_envs, n_samples)."""
+        if not self.history:
+            return np.empty((self.n_envs, 0))
+        return np.stack(self.history, axis=1)
+
+    def metrics(self):
+        """Per-world results as columns (one array per metric)."""
+        return {
+            "steps_to_clean": self.steps_to_clean.copy(),
+            "wasted_moves": self.wasted_moves.copy(),
+            "cleans": self.cleans.copy(),
+            "moves": self.moves.copy(),
+            "final_cleanliness": 1.0 - self.dirty_count / self.n_cells,
+        }
+
+
+# Headless run: no Matplotlib, just throughput
+if __name__ == "__main__":
+    world = BatchVacuumWorld(n_envs=10_000, height=8, width=8, seed=0)
+    rate = world.run(100)
+    print(f"✔ {world.n_envs} worlds x {world.steps} steps")
+    print(f"Agent-steps/second: {rate:,.0f}")
+    print(f"Worlds fully clean: {int(world.all_clean().sum())}/{world.n_envs}")
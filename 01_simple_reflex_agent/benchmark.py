@@ -0,0 +1,159 @@
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from batch_engine import BatchVacuumWorld
+from profiling import PhaseTimer
+from smart_agents import POLICIES, DirtIndex
+
+
+def _sizes(text):
+    return [tuple(int(n) for n in size.split("x")) for size in text.split(",")]
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",")]
+
+
+# Build a world while tracing allocations; returns (world, bytes per env)
+def build_world(n_envs, height, width, n_agents, policy, seed=0):
+    tracemalloc.start()
+    try:
+        world = BatchVacuumWorld(n_envs=n_envs, height=height, width=width, n_agents=n_agents,
+                                 dirt_prob=0.25, seed=seed, policy=POLICIES[policy]())
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return world, allocated / n_envs
+
+
+def bench_steps(n_envs, height, width, n_agents, policy, steps):
+    """Time `steps` steps of one batch and split the time into decide/update."""
+    world, bytes_per_env = build_world(n_envs, height, width, n_agents, policy)
+    timer = PhaseTimer()
+    world.profiler = timer
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.step()
+    elapsed = time.perf_counter() - start
+    phases = timer.report()
+    return {
+        "policy": policy,
+        "size": f"{height}x{width}",
+        "envs": n_envs,
+        "agents": n_agents,
+        "steps": steps,
+        "agent_steps_per_s": steps * n_envs * n_agents / elapsed,
+        "bytes_per_env": bytes_per_env,
+        "decide_us": phases["decide"]["mean_us"],
+        "update_us": phases["update"]["mean_us"],
+    }
+
+
+def bench_planning(height, width, density, queries, n_envs=4, seed=0):
+    """Mean microseconds per nearest-dirt lookup (one agent planning) at a given dirt density."""
+    rng = np.random.default_rng(seed)
+    index = DirtIndex((rng.random((n_envs, height, width)) < density).astype(np.uint8))
+    envs = rng.integers(0, n_envs, queries)
+    cells = rng.integers(0, height * width, queries)
+    index.nearest(envs[:100], cells[:100])  # warm-up
+    start = time.perf_counter()
+    for chunk in range(0, queries, 1000):  # a step's worth of agents at a time
+        index.nearest(envs[chunk:chunk + 1000], cells[chunk:chunk + 1000])
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+def bench_render(height, width, frames):
+    """Mean milliseconds to update and draw one off-screen frame of a single world."""
+    from renderer import GridRenderer
+    world = BatchVacuumWorld(n_envs=1, height=height, width=width, seed=0)
+    renderer = GridRenderer(height, width)
+    start = time.perf_counter()
+    for step in range(frames):
+        renderer.update(world.dirt[0], world.agent_pos[0], f"Step {step}")
+        renderer.frame()
+        world.step()
+    return (time.perf_counter() - start) / frames * 1e3
+
+
+# Compare against a saved run and list every case that got slower than allowed
+def find_regressions(results, baseline, tolerance):
+    def key(row):
+        return (row["policy"], row["size"], row["envs"], row["agents"])
+
+    previous = {key(row): row for row in baseline["steps"]}
+    regressions = []
+    for row in results["steps"]:
+        old = previous.get(key(row))
+        if old and row["agent_steps_per_s"] < old["agent_steps_per_s"] * (1 - tolerance):
+            regressions.append((key(row), old["agent_steps_per_s"], row["agent_steps_per_s"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput, memory and render cost of the vacuum simulation")
+    parser.add_argument("--sizes", type=_sizes, default=_sizes("2x2,32x32,256x256,1000x1000"))
+    parser.add_argument("--envs", type=_ints, default=[1, 100, 10_000])
+    parser.add_argument("--agents", type=_ints, default=[1, 4])
+    parser.add_argument("--policies", type=lambda text: text.split(","), default=["reflex"])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--render-frames", type=int, default=50, help="0 skips the render benchmark")
+    parser.add_argument("--plan-sizes", type=_sizes, default=_sizes("32x32,256x256,1000x1000,4000x4000"),
+                        help="grid sizes for the planning-cost benchmark")
+    parser.add_argument("--plan-density", type=float, default=0.01, help="dirt density for the planning benchmark")
+    parser.add_argument("--plan-queries", type=int, default=20_000, help="0 skips the planning benchmark")
+    parser.add_argument("--max-cells", type=int, default=1 << 26,
+                        help="skip cases whose envs x cells exceed this")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown vs. the baseline before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    results = {"python": sys.version.split()[0], "machine": platform.machine(), "steps": [], "planning": [],
+               "render": []}
+
+    build_world(1, 2, 2, 1, "reflex")  # warm-up, so one-time allocations don't count as per-env memory
+    print(f"{'policy':<8}{'size':>11}{'envs':>8}{'agents':>8}{'agent-steps/s':>16}"
+          f"{'bytes/env':>12}{'decide µs':>11}{'update µs':>11}")
+    for policy, (height, width), n_envs, n_agents in itertools.product(
+            args.policies, args.sizes, args.envs, args.agents):
+        if n_envs * height * width > args.max_cells or n_agents > height * width:
+            continue
+        row = bench_steps(n_envs, height, width, n_agents, policy, args.steps)
+        results["steps"].append(row)
+        print(f"{policy:<8}{row['size']:>11}{n_envs:>8}{n_agents:>8}{row['agent_steps_per_s']:>16,.0f}"
+              f"{row['bytes_per_env']:>12,.0f}{row['decide_us']:>11.1f}{row['update_us']:>11.1f}")
+
+    if args.plan_queries:
+        print(f"\n{'plan size':<12}{'density':>9}{'µs/plan':>10}")
+        for height, width in args.plan_sizes:
+            us = bench_planning(height, width, args.plan_density, args.plan_queries)
+            results["planning"].append({"size": f"{height}x{width}", "density": args.plan_density, "us_per_plan": us})
+            print(f"{results['planning'][-1]['size']:<12}{args.plan_density:>9}{us:>10.2f}")
+
+    if args.render_frames:
+        print(f"\n{'render size':<12}{'ms/frame':>10}")
+        for height, width in args.sizes:
+            ms = bench_render(height, width, args.render_frames)
+            results["render"].append({"size": f"{height}x{width}", "ms_per_frame": ms})
+            print(f"{results['render'][-1]['size']:<12}{ms:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for case, old, new in regressions:
+            print(f"❌ Regression {case}: {old:,.0f} -> {new:,.0f} agent-steps/s")
+        if regressions:
+            sys.exit(1)
+        print("✔ No regressions against baseline.")
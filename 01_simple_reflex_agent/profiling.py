@@ -0,0 +1,46 @@
+import time
+from collections import defaultdict
+
+
+class PhaseTimer:
+    """Per-phase wall-clock timings for a simulation run.
+
+    Call start() at the top of a step and lap("phase") after each phase;
+    every lap adds the time since the previous mark to that phase. Anything
+    with start()/lap() can be passed as a profiler, and passing None costs
+    nothing but an `is None` check.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(int)  # nanoseconds
+        self.calls = defaultdict(int)
+        self._mark = 0
+
+    def start(self):
+        self._mark = time.perf_counter_ns()
+
+    def lap(self, phase):
+        now = time.perf_counter_ns()
+        self.totals[phase] += now - self._mark
+        self.calls[phase] += 1
+        self._mark = now
+
+    def report(self):
+        """Dict of phase -> {calls, total_s, mean_us, share} in insertion order."""
+        grand_total = sum(self.totals.values()) or 1
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_s": total / 1e9,
+                "mean_us": total / self.calls[phase] / 1e3,
+                "share": total / grand_total,
+            }
+            for phase, total in self.totals.items()
+        }
+
+    def summary(self):
+        lines = [f"{'phase':<10}{'calls':>10}{'total s':>12}{'mean µs':>12}{'share':>8}"]
+        for phase, row in self.report().items():
+            lines.append(f"{phase:<10}{row['calls']:>10}{row['total_s']:>12.4f}"
+                         f"{row['mean_us']:>12.2f}{row['share']:>8.1%}")
+        return "\n".join(lines)
@@ -1,5 +1,4 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import argparse
 
 # Define the 2x2 environment
 environment = {
@@ -24,8 +23,11 @@ agent_index = 0  # Start in Room1
 def reflex_agent(state):
     return "Clean" if state == "Dirty" else "Move"
 
-# Function to draw the grid
+# Function to draw the grid (interactive window, one new figure per step)
 def draw_grid(env, agent_idx, step):
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
     fig, ax = plt.subplots()
     ax.set_xlim(0, 2)
     ax.set_ylim(0, 2)
@@ -48,27 +50,71 @@ def draw_grid(env, agent_idx, step):
     plt.pause(1)  # Pause to show the plot
     plt.close()
 
+# Dirt flags in the flat row-major cell order used by renderer.py (Room1..Room4)
+def dirt_flags(env):
+    return [env[room] == "Dirty" for room in rooms]
+
 # Run simulation
 if __name__ == "__main__":
-    plt.ion()  # Turn on interactive mode
-    steps = 8
+    parser = argparse.ArgumentParser(description="Reflex vacuum agent in a 2x2 world")
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--render", choices=["window", "record", "none"], default="window",
+                        help="window: live Matplotlib window (1 s per step); "
+                             "record: off-screen frames to --output; none: no rendering")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print time spent deciding, rendering and updating the state")
+    parser.add_argument("--output", default=None,
+                        help="Where to write recorded frames (.gif, .mp4, .png pattern or directory); "
+                             "frames stay in memory if omitted")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        from profiling import PhaseTimer
+        profiler = PhaseTimer()
+
+    recorder = None
+    if args.render == "window":
+        import matplotlib.pyplot as plt
+        plt.ion()  # Turn on interactive mode
+    elif args.render == "record":
+        from renderer import GridRenderer, FrameRecorder
+        recorder = FrameRecorder(GridRenderer(2, 2, labels=rooms), path=args.output)
 
-    for step in range(steps):
+    for step in range(args.steps):
+        if profiler:
+            profiler.start()
         current_room = rooms[agent_index]
         state = environment[current_room]
         action = reflex_agent(state)
+        if profiler:
+            profiler.lap("decide")
 
-        draw_grid(environment, agent_index, step + 1)
+        if args.render == "window":
+            draw_grid(environment, agent_index, step + 1)
+        elif recorder is not None:
+            recorder.capture(dirt_flags(environment), agent_index,
+                             f"Step {step + 1} --> Agent in {current_room}")
+        if profiler:
+            profiler.lap("render")
 
         if action == "Clean":
             environment[current_room] = "Clean"
         else:
             agent_index = (agent_index + 1) % len(rooms)
+        if profiler:
+            profiler.lap("update")
 
-    plt.ioff()
     print("✔ Simulation complete.")
     print("Final Environment State:")
     print(environment)
-    plt.show()
-    # Final plot to show the last state of the environment
+    if profiler:
+        print(profiler.summary())
 
+    if recorder is not None:
+        recorder.close()
+        print(f"🎞️ Recorded {recorder.count} frames to {args.output or 'memory'}")
+    if args.render == "window":
+        plt.ioff()
+        plt.show()
+        # Final plot to show the last state of the environment
@@ -0,0 +1,149 @@
+import os
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
+
+# Same colours as draw_grid(): clean rooms green, dirty rooms red, agent yellow
+CELL_COLORS = ListedColormap(["green", "red"])
+AGENT_COLOR = "yellow"
+
+
+class GridRenderer:
+    """Off-screen renderer that keeps one figure alive for the whole run.
+
+    The figure is drawn with the Agg canvas directly (no pyplot, no GUI
+    backend). Every call to update() only swaps the cell colours, moves the
+    agent markers and changes the title; nothing is rebuilt between frames.
+
+    Cells are flat row-major indices starting at the top-left, the same
+    layout BatchVacuumWorld uses.
+    """
+
+    def __init__(self, height, width, labels=None, size_inches=4, dpi=80):
+        self.height = height
+        self.width = width
+
+        self.fig = Figure(figsize=(size_inches, size_inches), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_axes([0.05, 0.05, 0.9, 0.85])
+        ax.set_xlim(0, width)
+        ax.set_ylim(0, height)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        self.ax = ax
+
+        self.cells = ax.imshow(
+            np.zeros((height, width), dtype=np.uint8),
+            cmap=CELL_COLORS, vmin=0, vmax=1,
+            extent=(0, width, 0, height), interpolation="nearest",
+        )
+
+        # Room borders and labels only make sense on small grids
+        if height * width <= 1024:
+            ax.hlines(range(height + 1), 0, width, colors="black", linewidth=1)
+            ax.vlines(range(width + 1), 0, height, colors="black", linewidth=1)
+        if labels is not None:
+            for cell, label in enumerate(labels):
+                x, y = self.cell_origin(cell)
+                ax.text(x + 0.5, y + 0.5, label, ha="center", va="center", fontsize=12, color="white")
+
+        # Agent marker: a square half the size of a cell, as in draw_grid()
+        cell_points = ax.get_position().width * size_inches * 72 / width
+        self.agents = ax.scatter([], [], marker="s", s=(cell_points / 2) ** 2,
+                                 color=AGENT_COLOR, zorder=3)
+        self.title = ax.set_title("")
+
+    def cell_origin(self, cell):
+        """Bottom-left corner (x, y) of a flat cell index in plot coordinates."""
+        row, col = divmod(cell, self.width)
+        return col, self.height - 1 - row
+
+    def update(self, dirt, agent_cells, title=""):
+        """Point the existing artists at the new state. Does not draw."""
+        self.cells.set_data(np.asarray(dirt, dtype=np.uint8).reshape(self.height, self.width))
+        rows, cols = np.divmod(np.atleast_1d(agent_cells), self.width)
+        self.agents.set_offsets(np.column_stack([cols + 0.5, self.height - rows - 0.5]))
+        self.title.set_text(title)
+
+    def frame(self):
+        """Draw the figure and return the frame as an (h, w, 4) uint8 RGBA array."""
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba()).copy()
+
+
+class FrameRecorder:
+    """Collects frames from a GridRenderer into memory or a file.
+
+    path=None       -- frames are kept in self.frames as RGBA arrays
+    "run.gif"       -- animated GIF (frames are held until close())
+    "run.mp4"       -- MP4 streamed through ffmpeg as frames arrive
+    "frames/%05d.png" or a directory -- one PNG per frame
+
+    every=N records only every N-th captured frame, which keeps long runs cheap.
+    """
+
+    def __init__(self, renderer, path=None, fps=10, every=1):
+        self.renderer = renderer
+        self.path = path
+        self.fps = fps
+        self.every = max(1, every)
+        self.frames = []
+        self.count = 0
+        self._writer = None
+        self._png_pattern = None
+        self._gif_frames = None
+
+        ext = os.path.splitext(path)[1].lower() if path else ""
+        if path is None:
+            pass
+        elif ext == ".gif":
+            self._gif_frames = []
+        elif ext == ".mp4":
+            from matplotlib.animation import FFMpegWriter
+            self._writer = FFMpegWriter(fps=fps)
+            self._writer.setup(renderer.fig, path, dpi=renderer.fig.dpi)
+        elif ext == ".png":
+            self._png_pattern = path
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._png_pattern = os.path.join(path, "frame_%05d.png")
+
+    def capture(self, dirt, agent_cells, title=""):
+        """Update the renderer and record the resulting frame."""
+        index = self.count
+        self.count += 1
+        if index % self.every:
+            return
+        self.renderer.update(dirt, agent_cells, title)
+
+        if self._writer is not None:
+            self._writer.grab_frame()
+            return
+        frame = self.renderer.frame()
+        if self._gif_frames is not None:
+            from PIL import Image
+            self._gif_frames.append(Image.fromarray(frame).convert("P", palette=Image.ADAPTIVE, colors=8))
+        elif self._png_pattern is not None:
+            imsave(self._png_pattern % (index // self.every), frame)
+        else:
+            self.frames.append(frame)
+
+    def close(self):
+        """Finish writing the output file (no-op for in-memory and PNG recording)."""
+        if self._writer is not None:
+            self._writer.finish()
+            self._writer = None
+        if self._gif_frames:
+            first, *rest = self._gif_frames
+            first.save(self.path, save_all=True, append_images=rest,
+                       duration=int(1000 / self.fps), loop=0)
+            self._gif_frames = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
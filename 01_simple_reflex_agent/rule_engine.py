@@ -0,0 +1,379 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from batch_engine import ACTION_NAMES, CLEAN, MOVE
+
+
+class Feature:
+    """One percept feature with a finite set of values.
+
+    Values are coded by their position in `values`. Percept columns always
+    hold values (which may themselves be numbers or booleans); only a raw
+    (n, n_features) array passed to RuleSet.encode() is read as codes.
+    """
+
+    def __init__(self, name, values):
+        self.name = name
+        self.values = tuple(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        if len(self.codes) != len(self.values):
+            raise ValueError(f"Feature {name!r} has duplicate values")
+        # Numeric and boolean domains are looked up with one searchsorted instead of a dict per value
+        self._sorted = None
+        if self.values and all(isinstance(value, (bool, int, float, np.number)) for value in self.values):
+            values = np.asarray(self.values)
+            self._order = np.argsort(values, kind="stable")
+            self._sorted = values[self._order]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"Feature({self.name!r}, {self.values!r})"
+
+    def code(self, value):
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"{value!r} is not a value of feature {self.name!r}") from None
+
+    def encode(self, column):
+        """Codes for a column of values."""
+        column = np.asarray(column)
+        if column.size == 0:
+            return np.empty(column.shape, dtype=np.int64)
+        if self._sorted is not None and column.dtype.kind in "biuf":
+            found = np.minimum(np.searchsorted(self._sorted, column), len(self) - 1)
+            missing = self._sorted[found] != column
+            if missing.any():
+                self.code(column[missing][0].item())  # raises with the offending value
+            return self._order[found].astype(np.int64)
+        return np.vectorize(self.code, otypes=[np.int64])(column)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """IF every condition holds THEN action.
+
+    conditions maps a feature name to one value or a tuple/list/set of
+    accepted values; features that are not mentioned match anything.
+    """
+    conditions: dict
+    action: str
+
+
+class RuleSet:
+    """Condition-action rules over the same features; the first rule that matches wins.
+
+    actions fixes the action codes (e.g. batch_engine.ACTION_NAMES, so
+    they line up with CLEAN/MOVE/IDLE); by default they are numbered in the
+    order they first appear, starting with `default`.
+    """
+
+    def __init__(self, features, rules, default, actions=None):
+        self.features = list(features)
+        self.rules = [rule if isinstance(rule, Rule) else Rule(*rule) for rule in rules]
+        self.default = default
+        if actions is None:
+            actions = list(dict.fromkeys([default] + [rule.action for rule in self.rules]))
+        self.actions = tuple(actions)
+        self._action_codes = {action: code for code, action in enumerate(self.actions)}
+
+        by_name = {feature.name: feature for feature in self.features}
+        # allowed[r][f]: codes of feature f that rule r accepts (None = any)
+        self.allowed = []
+        for rule in self.rules:
+            unknown = rule.conditions.keys() - by_name.keys()
+            if unknown:
+                raise ValueError(f"Rule {rule} uses unknown features {sorted(unknown)}")
+            row = []
+            for feature in self.features:
+                accepted = rule.conditions.get(feature.name)
+                if accepted is None:
+                    row.append(None)
+                    continue
+                if not isinstance(accepted, (tuple, list, set, frozenset)):
+                    accepted = (accepted,)
+                row.append(np.array(sorted({feature.code(value) for value in accepted}), dtype=np.int64))
+            self.allowed.append(row)
+        self.rule_actions = np.array([self.action_code(rule.action) for rule in self.rules]
+                                     + [self.action_code(default)], dtype=np.uint8)
+
+    @classmethod
+    def from_table(cls, features, rows, default, actions=None):
+        """Build from condition -> action rows, e.g. [({"status": "Dirty"}, "Clean")]."""
+        return cls(features, [Rule(dict(conditions), action) for conditions, action in rows], default, actions)
+
+    def action_code(self, action):
+        try:
+            return self._action_codes[action]
+        except KeyError:
+            raise ValueError(f"{action!r} is not one of the actions {self.actions}") from None
+
+    @property
+    def shape(self):
+        return tuple(len(feature) for feature in self.features)
+
+    @property
+    def table_size(self):
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def encode(self, percepts):
+        """(n, n_features) int64 codes for a batch of percepts.
+
+        percepts is a dict of value columns keyed by feature name, a list
+        of percept dicts, or an (n, n_features) integer array of codes.
+        """
+        if isinstance(percepts, dict):
+            columns = [feature.encode(percepts[feature.name]) for feature in self.features]
+            return np.stack(columns, axis=1) if columns else np.empty((0, 0), dtype=np.int64)
+        if isinstance(percepts, (list, tuple)) and (not percepts or isinstance(percepts[0], dict)):
+            return self.encode({feature.name: [p[feature.name] for p in percepts] for feature in self.features})
+        codes = np.asarray(percepts, dtype=np.int64)
+        if codes.ndim != 2 or codes.shape[1] != len(self.features):
+            raise ValueError(f"Expected codes shaped (n, {len(self.features)}), got {codes.shape}")
+        # One pass: negative codes wrap around to huge unsigned values
+        if (codes.view(np.uint64) >= np.array(self.shape, dtype=np.uint64)).any():
+            raise ValueError(f"Codes must be below {self.shape} per feature")
+        return codes
+
+    def decide(self, percept):
+        """Action for one percept dict, checking the rules one by one (the reference semantics)."""
+        for rule in self.rules:
+            if all(percept[name] in (accepted if isinstance(accepted, (tuple, list, set, frozenset))
+                                     else (accepted,))
+                   for name, accepted in rule.conditions.items()):
+                return rule.action
+        return self.default
+
+    def compile(self, max_table_size=1 << 22):
+        """Compile to a DecisionTable, or to a RuleMatrix if the table would be too large."""
+        if self.table_size <= max_table_size:
+            return DecisionTable(self)
+        return RuleMatrix(self)
+
+
+class DecisionTable:
+    """A rule set flattened into one action per combination of feature values.
+
+    The table is indexed by the percept's codes read as a mixed-radix
+    number, so evaluating a batch is one dot product and one gather, no
+    matter how many rules there are. Compiling writes each rule into its
+    sub-block of the table, last rule first, so earlier rules win.
+    """
+    strategy = "table"
+
+    def __init__(self, ruleset):
+        self.ruleset = ruleset
+        self.actions = ruleset.actions
+        shape = ruleset.shape
+        self.strides = np.array([int(np.prod(shape[i + 1:], dtype=np.int64)) for i in range(len(shape))],
+                                dtype=np.int64)
+        table = np.full(shape, ruleset.rule_actions[-1], dtype=np.uint8)
+        for allowed, action in zip(reversed(ruleset.allowed), ruleset.rule_actions[-2::-1]):
+            # Slices for features the rule ignores, an open mesh (like np.ix_) over the others
+            tested = [f for f, codes in enumerate(allowed) if codes is not None]
+            index = [slice(None)] * len(shape)
+            for j, f in enumerate(tested):
+                index[f] = allowed[f].reshape((1,) * j + (-1,) + (1,) * (len(tested) - j - 1))
+            table[tuple(index)] = action
+        self.table = table.reshape(-1)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def index(self, codes):
+        return codes @ self.strides if codes.shape[1] else np.zeros(len(codes), dtype=np.int64)
+
+    def evaluate(self, percepts):
+        """Action codes (uint8) for a batch of percepts (see RuleSet.encode)."""
+        return self.table[self.index(self.ruleset.encode(percepts))]
+
+    def decide(self, percepts):
+        """Action names for a batch of percepts."""
+        return np.asarray(self.actions, dtype=object)[self.evaluate(percepts)]
+
+
+class RuleMatrix:
+    """Fallback for feature domains too large for a DecisionTable.
+
+    Keeps one boolean row per rule for every feature (does rule r accept
+    this value?), so a batch is matched against all rules with one lookup
+    per feature, and the first matching rule is found with argmax. Memory
+    is rules x values instead of the product of all domain sizes.
+    """
+    strategy = "matrix"
+
+    def __init__(self, ruleset, chunk=1 << 22):
+        self.ruleset = ruleset
+        self.actions = ruleset.actions
+        self.chunk = chunk
+        n_rules = len(ruleset.rules) + 1  # the default is a last rule that matches everything
+        self.masks = []
+        for f, feature in enumerate(ruleset.features):
+            mask = np.ones((n_rules, len(feature)), dtype=bool)
+            for r, allowed in enumerate(ruleset.allowed):
+                if allowed[f] is not None:
+                    mask[r] = False
+                    mask[r, allowed[f]] = True
+            self.masks.append(mask)
+
+    @property
+    def nbytes(self):
+        return sum(mask.nbytes for mask in self.masks)
+
+    def evaluate(self, percepts):
+        codes = self.ruleset.encode(percepts)
+        n_rules = len(self.ruleset.rule_actions)
+        out = np.empty(len(codes), dtype=np.uint8)
+        step = max(1, self.chunk // n_rules)  # bound the (rules, batch) match matrix
+        for start in range(0, len(codes), step):
+            block = codes[start:start + step]
+            match = np.ones((n_rules, len(block)), dtype=bool)
+            for f, mask in enumerate(self.masks):
+                match &= mask[:, block[:, f]]
+            out[start:start + step] = self.ruleset.rule_actions[match.argmax(axis=0)]
+        return out
+
+    def decide(self, percepts):
+        return np.asarray(self.actions, dtype=object)[self.evaluate(percepts)]
+
+
+class RuleBank:
+    """Many rule sets over the same features and actions, compiled together.
+
+    Their decision tables are stacked into one (n_rulesets, table_size)
+    array, so a batch where every percept names its own rule set is still
+    one gather: bank.evaluate(percepts, ruleset_ids).
+    """
+
+    def __init__(self, rulesets, max_bytes=1 << 30):
+        self.rulesets = list(rulesets)
+        first = self.rulesets[0]
+        for ruleset in self.rulesets[1:]:
+            if ([(f.name, f.values) for f in ruleset.features] != [(f.name, f.values) for f in first.features]
+                    or ruleset.actions != first.actions):
+                raise ValueError("Rule sets in a bank must share their features and actions")
+        if len(self.rulesets) * first.table_size > max_bytes:
+            raise ValueError(f"{len(self.rulesets)} tables of {first.table_size} entries exceed {max_bytes} bytes")
+        self.ruleset = first
+        self.actions = first.actions
+        tables = [DecisionTable(ruleset) for ruleset in self.rulesets]
+        self.strides = tables[0].strides
+        self.tables = np.stack([table.table for table in tables])
+
+    def __len__(self):
+        return len(self.rulesets)
+
+    @property
+    def nbytes(self):
+        return self.tables.nbytes
+
+    def evaluate(self, percepts, ruleset_ids):
+        """Action codes for a batch; ruleset_ids gives each percept's rule set (or one id for all)."""
+        codes = self.ruleset.encode(percepts)
+        index = codes @ self.strides if codes.shape[1] else np.zeros(len(codes), dtype=np.int64)
+        ids = np.broadcast_to(np.asarray(ruleset_ids, dtype=np.int64), index.shape)
+        return self.tables[ids, index]
+
+
+# The original reflex_agent(): Clean if the room is dirty, otherwise Move.
+# Status codes match BatchVacuumWorld.percepts() (0 = clean, 1 = dirty) and
+# action codes match batch_engine's CLEAN/MOVE/IDLE.
+STATUS = Feature("status", ("Clean", "Dirty"))
+REFLEX_VACUUM_RULES = RuleSet([STATUS], [Rule({"status": "Dirty"}, "Clean")], default="Move",
+                              actions=ACTION_NAMES)
+
+
+class RulePolicy:
+    """Agents driven by condition-action rules instead of hard-coded logic.
+
+    The percept of every agent has a "status" feature (its cell is Clean or
+    Dirty) and a "location" feature (its flat cell index); a rule set may use
+    either. Actions are Clean, Move (to the next room, as in the reflex
+    agent) and Idle. With several rule sets, world i follows rule set
+    assignment[i] (default: i modulo the number of rule sets).
+    """
+    name = "rules"
+
+    def __init__(self, rulesets=REFLEX_VACUUM_RULES, assignment=None):
+        self.rulesets = [rulesets] if isinstance(rulesets, RuleSet) else list(rulesets)
+        self.assignment = assignment
+
+    def reset(self, world):
+        first = self.rulesets[0]
+        if first.actions != ACTION_NAMES:
+            raise ValueError(f"Vacuum rule sets must use actions={ACTION_NAMES}")
+        for feature in first.features:
+            if feature.name == "location" and len(feature) != world.n_cells:
+                raise ValueError(f"Feature 'location' has {len(feature)} values, the world has {world.n_cells} cells")
+            if feature.name not in ("status", "location"):
+                raise ValueError(f"Vacuum percepts have no feature {feature.name!r}")
+        self.bank = RuleBank(self.rulesets)
+        assignment = self.assignment
+        if assignment is None:
+            assignment = np.arange(world.n_envs) % len(self.rulesets)
+        self.ruleset_ids = np.repeat(np.asarray(assignment, dtype=np.int64), world.n_agents)
+
+    def act(self, world):
+        columns = {"status": world.percepts().reshape(-1), "location": world.agent_pos.reshape(-1)}
+        codes = np.stack([columns[feature.name] for feature in self.bank.ruleset.features], axis=1)
+        actions = self.bank.evaluate(codes, self.ruleset_ids).reshape(world.agent_pos.shape)
+        cleaning = actions == CLEAN
+        new_pos = np.where(actions == MOVE, (world.agent_pos + 1) % world.n_cells, world.agent_pos)
+        return cleaning, new_pos
+
+    def update(self, world):
+        pass
+
+
+# Random rule sets over the same features, for benchmarks
+def random_rulesets(n, features, actions, n_rules=8, seed=0):
+    rng = np.random.default_rng(seed)
+    rulesets = []
+    for _ in range(n):
+        rules = []
+        for _ in range(n_rules):
+            conditions = {}
+            for feature in features:
+                if rng.random() < 0.5:  # about half the features are tested by each rule
+                    k = int(rng.integers(1, len(feature) + 1))
+                    conditions[feature.name] = tuple(rng.choice(feature.values, k, replace=False).tolist())
+            rules.append(Rule(conditions, actions[int(rng.integers(len(actions)))]))
+        rulesets.append(RuleSet(features, rules, actions[0], actions))
+    return rulesets
+
+
+# Headless run: compile many rule sets and time batch evaluation against rule-by-rule checks
+if __name__ == "__main__":
+    features = [Feature("status", ("Clean", "Dirty")), Feature("battery", ("low", "mid", "high")),
+                Feature("bump", (False, True)), Feature("zone", tuple(range(16)))]
+    actions = ("Idle", "Clean", "Move", "Left", "Right", "Dock")
+
+    rulesets = random_rulesets(10_000, features, actions)
+    start = time.perf_counter()
+    bank = RuleBank(rulesets)
+    compile_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    n = 1_000_000
+    codes = np.stack([rng.integers(0, len(feature), n) for feature in features], axis=1)
+    ids = rng.integers(0, len(bank), n)
+    start = time.perf_counter()
+    result = bank.evaluate(codes, ids)
+    batch_s = time.perf_counter() - start
+
+    sample = 20_000
+    percepts = [{f.name: f.values[c] for f, c in zip(features, row)} for row in codes[:sample]]
+    start = time.perf_counter()
+    expected = [rulesets[i].decide(p) for i, p in zip(ids[:sample], percepts)]
+    python_s = time.perf_counter() - start
+    assert [actions[a] for a in result[:sample]] == expected
+
+    print(f"✔ {len(bank)} rule sets x {len(rulesets[0].rules)} rules compiled in {compile_s:.2f}s "
+          f"({bank.nbytes / 1e6:.1f} MB of tables)")
+    print(f"Batch evaluation: {n / batch_s:,.0f} percepts/second")
+    print(f"Rule-by-rule Python: {sample / python_s:,.0f} percepts/second")
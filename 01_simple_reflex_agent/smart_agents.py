@@ -0,0 +1,247 @@
+import numpy as np
+
+from batch_engine import ReflexPolicy
+from rule_engine import RulePolicy
+
+
+class DirtIndex:
+    """Nearest-cell lookup over a batch of 0/1 grids, maintained incrementally.
+
+    Every grid is split into fixed-size square tiles and only the number of
+    marked cells per tile is stored. A query searches outwards from its own
+    tile, one ring of tiles at a time, looks inside the non-empty tiles of
+    each ring and stops once the next ring can't hold anything closer. Its
+    cost depends on how far away the nearest marked cell is, not on how big
+    the grid is. add() and remove() are O(1) per cell, so nothing is
+    recomputed when dirt changes. Cells are flat indices over the whole
+    batch (env * height * width + cell), like the world's cleaned/spawned
+    arrays, and nearest() answers all queries of a step at once.
+
+    Distances are Manhattan distances: the grid has no walls, so they equal
+    the BFS distance an agent actually has to walk, and the tile counts
+    stand in for a precomputed distance table or BFS field (a table would
+    need O(cells^2) memory, a field a BFS wave per cleaned cell).
+    """
+
+    def __init__(self, mask, tile=8):
+        self.mask = mask if mask.ndim == 3 else mask[None]  # (n_envs, height, width), shared with the owner
+        self.n_envs, self.height, self.width = self.mask.shape
+        self.n_cells = self.height * self.width
+        self.tile = t = tile
+        self.tiles_y = -(-self.height // t)
+        self.tiles_x = -(-self.width // t)
+        self.n_tiles = self.tiles_y * self.tiles_x
+        self.counts = np.zeros((self.n_envs, self.n_tiles), dtype=np.int64)
+        self.totals = np.zeros(self.n_envs, dtype=np.int64)
+        self.recount(np.arange(self.n_envs))
+
+        tile_row, tile_col = np.divmod(np.arange(self.n_tiles), self.tiles_x)
+        self.top = tile_row * t
+        self.bottom = np.minimum(self.top + t, self.height) - 1
+        self.left = tile_col * t
+        self.right = np.minimum(self.left + t, self.width) - 1
+        self._rings = {}
+
+    def recount(self, envs):
+        """Rebuild the tile counts of `envs` after the owner rewrote their masks."""
+        t = self.tile
+        padded = np.zeros((len(envs), self.tiles_y * t, self.tiles_x * t), dtype=self.mask.dtype)
+        padded[:, :self.height, :self.width] = self.mask[envs]
+        self.counts[envs] = padded.reshape(len(envs), self.tiles_y, t, self.tiles_x, t).sum(
+            axis=(2, 4), dtype=np.int64).reshape(len(envs), -1)
+        self.totals[envs] = self.counts[envs].sum(axis=1)
+
+    def _tile_of(self, cells):
+        envs, cells = np.divmod(cells, self.n_cells)
+        rows, cols = np.divmod(cells, self.width)
+        return envs * self.n_tiles + (rows // self.tile) * self.tiles_x + cols // self.tile
+
+    def add(self, cells):
+        """Mark flat cells and update the tile counts (already-marked cells are ignored)."""
+        cells = np.unique(cells)
+        cells = cells[self.mask.reshape(-1)[cells] == 0]
+        self.mask.reshape(-1)[cells] = 1
+        self.shift(cells, 1)
+
+    def remove(self, cells):
+        """Unmark flat cells and update the tile counts (unmarked cells are ignored)."""
+        cells = np.unique(cells)
+        cells = cells[self.mask.reshape(-1)[cells] != 0]
+        self.mask.reshape(-1)[cells] = 0
+        self.shift(cells, -1)
+
+    def shift(self, cells, delta):
+        """Adjust the counts for cells the owner already flipped in the mask itself."""
+        np.add.at(self.counts.reshape(-1), self._tile_of(cells), delta)
+        np.add.at(self.totals, cells // self.n_cells, delta)
+
+    def remaining(self):
+        """Marked cells per env."""
+        return self.totals
+
+    def __len__(self):
+        return int(self.totals.sum())
+
+    def _ring(self, k):
+        """Tile offsets (dy, dx) at Chebyshev distance k from a tile."""
+        if k not in self._rings:
+            span = np.arange(-k, k + 1)
+            side = span[1:-1]
+            self._rings[k] = (np.concatenate([np.full(span.size, -k), np.full(span.size, k), side, side]),
+                              np.concatenate([span, span, np.full(side.size, -k), np.full(side.size, k)]))
+        return self._rings[k]
+
+    def nearest(self, envs, cells):
+        """Closest marked cell (index within the env's grid) to each `cells[i]` in
+        grid `envs[i]`, or -1 where that grid has none left.
+
+        All queries advance together, ring k for every query still searching.
+        Every cell of ring k is at least (k - 1) * tile + 1 away, so a query
+        drops out once that can't beat what it already found.
+        """
+        envs = np.asarray(envs, dtype=np.int64)
+        cells = np.asarray(cells, dtype=np.int64)
+        t = self.tile
+        best = np.full(envs.size, -1, dtype=np.int64)
+        best_dist = np.full(envs.size, self.height + self.width, dtype=np.int64)  # more than any real distance
+        row, col = np.divmod(cells, self.width)
+        queries = np.flatnonzero(self.totals[envs] > 0)
+
+        span = np.arange(t)
+        for k in range(max(self.tiles_y, self.tiles_x)):
+            if k:
+                queries = queries[best_dist[queries] > (k - 1) * t + 1]
+            if queries.size == 0:
+                break
+            dy, dx = self._ring(k)
+            ty = (row[queries] // t)[:, None] + dy
+            tx = (col[queries] // t)[:, None] + dx
+            inside = (ty >= 0) & (ty < self.tiles_y) & (tx >= 0) & (tx < self.tiles_x)
+            tiles = np.where(inside, ty * self.tiles_x + tx, 0)
+            hit, slot = np.nonzero(inside & (self.counts[envs[queries][:, None], tiles] > 0))
+            if hit.size == 0:
+                continue
+            q = queries[hit]
+            tiles = tiles[hit, slot]
+            # Only tiles that could still hold something closer are opened
+            bound = np.maximum(0, np.maximum(self.top[tiles] - row[q], row[q] - self.bottom[tiles])) + \
+                np.maximum(0, np.maximum(self.left[tiles] - col[q], col[q] - self.right[tiles]))
+            open_ = bound < best_dist[q]
+            q, tiles = q[open_], tiles[open_]
+            if q.size == 0:
+                continue
+
+            ys = self.top[tiles][:, None] + span  # (opened tiles, tile) rows and columns of each tile
+            xs = self.left[tiles][:, None] + span
+            inside = (ys[:, :, None] <= self.bottom[tiles][:, None, None]) & \
+                     (xs[:, None, :] <= self.right[tiles][:, None, None])
+            marked = self.mask[envs[q][:, None, None], np.minimum(ys, self.height - 1)[:, :, None],
+                               np.minimum(xs, self.width - 1)[:, None, :]].astype(bool) & inside
+            row_gap = np.abs(ys - row[q][:, None])[:, :, None]
+            dist = row_gap + np.abs(xs - col[q][:, None])[:, None, :]
+            # Prefer cells on the same row on ties, so sweeps run along rows
+            key = np.where(marked, dist * (self.height + 1) + row_gap, np.iinfo(np.int64).max).reshape(q.size, -1)
+            k_cell = np.argmin(key, axis=1)
+            pick = np.arange(q.size)
+            tile_key = key[pick, k_cell]
+            # Best opened tile per query: sort by (query, key) and keep each query's first
+            order = np.lexsort((tile_key, q))
+            first = order[np.r_[True, q[order][1:] != q[order][:-1]]]
+            found = dist.reshape(q.size, -1)[first, k_cell[first]]
+            better = marked.reshape(q.size, -1)[first, k_cell[first]] & (found < best_dist[q[first]])
+            first = first[better]
+            best_dist[q[first]] = found[better]
+            ky, kx = np.divmod(k_cell[first], t)
+            best[q[first]] = ys[first, ky] * self.width + xs[first, kx]
+        return best
+
+
+# One step along a shortest path: first fix the column, then the row (scalars or arrays)
+def step_toward(cell, target, width):
+    row, col = np.divmod(cell, width)
+    target_row, target_col = np.divmod(target, width)
+    return np.where(col != target_col, cell + np.sign(target_col - col), cell + width * np.sign(target_row - row))
+
+
+class GoalBasedPolicy:
+    """Agents that see the whole grid and always head for the nearest dirty cell.
+
+    One DirtIndex covers the real dirt of every world and is updated from
+    the worlds' cleaned/spawned cells after every step. An agent only plans
+    when it has no target or its target got cleaned, so the planning cost
+    is paid once per dirty cell rather than once per step; every agent that
+    needs a plan in a step gets it from one batched lookup.
+    """
+    name = "goal"
+
+    def reset(self, world):
+        self.index = DirtIndex(world.grid)
+        self.targets = np.full(world.agent_pos.shape, -1, dtype=np.int64)
+        self.plans = 0
+
+    def _is_target(self, world, targets):
+        return world.dirt[world._rows, np.maximum(targets, 0)] != 0
+
+    def _before_plan(self, world, envs):
+        pass
+
+    def act(self, world):
+        cleaning = world.percepts() != 0
+        new_pos = world.agent_pos.copy()
+        moving = ~cleaning
+        targets = self.targets
+        stale = moving & ((targets < 0) | (targets == new_pos) | ~self._is_target(world, targets))
+        envs, agents = np.nonzero(stale)
+        if envs.size:
+            self._before_plan(world, np.unique(envs))
+            self.plans += envs.size
+            targets[envs, agents] = self.index.nearest(envs, new_pos[envs, agents])
+        go = moving & (targets >= 0)
+        new_pos[go] = step_toward(new_pos[go], targets[go], world.width)
+        return cleaning, new_pos
+
+    def update(self, world):
+        self.index.shift(world.cleaned, -1)
+        self.index.shift(world.spawned, 1)
+
+
+class ModelBasedPolicy(GoalBasedPolicy):
+    """Agents that only sense their own cell but remember what they have seen.
+
+    The internal map marks every cell not yet known to be clean. Agents walk
+    to the nearest such cell, clean it if needed and cross it off. When the
+    map runs out and dirt can re-appear, the agent forgets and re-explores.
+    """
+    name = "model"
+
+    def reset(self, world):
+        self.unknown = np.ones((world.n_envs, world.height, world.width), dtype=np.uint8)
+        self.index = DirtIndex(self.unknown)
+        self.targets = np.full(world.agent_pos.shape, -1, dtype=np.int64)
+        self.plans = 0
+
+    def _is_target(self, world, targets):
+        return self.unknown.reshape(world.n_envs, -1)[world._rows, np.maximum(targets, 0)] != 0
+
+    def _before_plan(self, world, envs):
+        # Worlds whose map ran out while dirt can still re-appear start exploring again
+        exhausted = envs[(self.index.remaining()[envs] == 0) & (world.respawn_prob[envs] > 0)]
+        if exhausted.size:
+            self.unknown[exhausted] = 1
+            self.index.recount(exhausted)
+
+    def act(self, world):
+        # Whatever the agents stand on is clean after this step
+        self.index.remove((world._rows * world.n_cells + world.agent_pos).reshape(-1))
+        return super().act(world)
+
+    def update(self, world):
+        pass
+
+
+POLICIES = {
+    "reflex": ReflexPolicy,
+    "model": ModelBasedPolicy,
+    "goal": GoalBasedPolicy,
+    "rules": RulePolicy,  # REFLEX_VACUUM_RULES unless given other rule sets
+}
@@ -0,0 +1,146 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_engine import BatchVacuumWorld, GridConfig
+from smart_agents import POLICIES
+
+CONFIG_COLUMNS = ("policy", "width", "height", "dirt_prob", "respawn_prob", "n_agents", "seed", "max_steps")
+
+
+# Build the cartesian product of parameter lists as GridConfigs
+def grid_configs(widths=(2,), heights=(2,), dirt_probs=(0.25,), respawn_probs=(0.0,),
+                 n_agents=(1,), seeds=(0,), max_steps=(1000,), policies=("reflex",)):
+    return [
+        GridConfig(width=w, height=h, dirt_prob=d, respawn_prob=r, n_agents=a, seed=s,
+                   max_steps=m, policy=p)
+        for p, w, h, d, r, a, s, m in itertools.product(
+            policies, widths, heights, dirt_probs, respawn_probs, n_agents, seeds, max_steps)
+    ]
+
+
+# Split configs into batches that can share one BatchVacuumWorld
+def plan_batches(configs, max_cells_per_batch=1 << 24):
+    """Group config indices by shape and cap each batch's total cell count.
+
+    The cap bounds worker memory: a batch of 1000x1000 worlds holds about
+    1 MB of dirt per world.
+    """
+    groups = defaultdict(list)
+    for index, config in enumerate(configs):
+        groups[config.shape_key].append(index)
+
+    batches = []
+    for (height, width, *_), indices in groups.items():
+        per_batch = max(1, max_cells_per_batch // (height * width))
+        for start in range(0, len(indices), per_batch):
+            batches.append(indices[start:start + per_batch])
+    return batches
+
+
+# Worker: run one batch of same-shaped configs to completion
+def run_batch(configs, record_every=0):
+    policy = POLICIES[configs[0].policy]()
+    world = BatchVacuumWorld.from_configs(configs, record_every=record_every, policy=policy)
+    static = not world.respawn_prob.any()
+    world.run(configs[0].max_steps, until_clean=static)
+    result = world.metrics()
+    result["steps_run"] = np.full(len(configs), world.steps)
+    if record_every:
+        result["cleanliness"] = list(world.cleanliness())
+    return result
+
+
+def run_sweep(configs, processes=None, max_cells_per_batch=1 << 24, record_every=0):
+    """Run every config across a process pool and return a columnar result table.
+
+    The table is a dict of column name -> array, one row per config in the
+    order the configs were given. Config fields are included as columns.
+    With record_every > 0 a "cleanliness" column holds each run's sampled
+    clean fraction over time.
+    """
+    batches = plan_batches(configs, max_cells_per_batch)
+    table = {name: np.array([getattr(c, name) for c in configs]) for name in CONFIG_COLUMNS}
+    columns = {}
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_batch, [configs[i] for i in batch], record_every) for batch in batches]
+        for batch, future in zip(batches, futures):
+            for name, values in future.result().items():
+                if name == "cleanliness":
+                    column = columns.setdefault(name, np.empty(len(configs), dtype=object))
+                    for i, curve in zip(batch, values):
+                        column[i] = curve
+                else:
+                    column = columns.setdefault(name, np.empty(len(configs), dtype=values.dtype))
+                    column[batch] = values
+
+    table.update(columns)
+    return table
+
+
+# Write a result table to .csv, .npz or .parquet (pyarrow required)
+def save_table(table, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        np.savez_compressed(path, **table)
+    elif ext == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table({k: list(v) if v.dtype == object else v for k, v in table.items()}), path)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(table.keys())
+            for row in zip(*table.values()):
+                writer.writerow(
+                    " ".join(f"{x:.4f}" for x in value) if isinstance(value, np.ndarray) else value
+                    for value in row
+                )
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",")]
+
+
+def _floats(text):
+    return [float(x) for x in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seeded parameter sweep for the reflex vacuum agent")
+    parser.add_argument("--widths", type=_ints, default=[32])
+    parser.add_argument("--heights", type=_ints, default=[32])
+    parser.add_argument("--dirt-probs", type=_floats, default=[0.1, 0.25, 0.5])
+    parser.add_argument("--respawn-probs", type=_floats, default=[0.0])
+    parser.add_argument("--agents", type=_ints, default=[1])
+    parser.add_argument("--policies", type=lambda text: text.split(","), default=["reflex"],
+                        help=f"comma-separated, any of: {', '.join(POLICIES)}")
+    parser.add_argument("--seeds", type=int, default=100, help="number of seeds per combination")
+    parser.add_argument("--max-steps", type=int, default=10_000)
+    parser.add_argument("--record-every", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    configs = grid_configs(args.widths, args.heights, args.dirt_probs, args.respawn_probs,
+                           args.agents, range(args.seeds), [args.max_steps], args.policies)
+    start = time.perf_counter()
+    results = run_sweep(configs, processes=args.processes, record_every=args.record_every)
+    elapsed = time.perf_counter() - start
+
+    save_table(results, args.output)
+    print(f"✔ {len(configs)} configurations in {elapsed:.1f}s -> {args.output}")
+    for policy in args.policies:
+        rows = results["policy"] == policy
+        solved = rows & (results["steps_to_clean"] >= 0)
+        print(f"[{policy}] fully cleaned: {int(solved.sum())}/{int(rows.sum())}, "
+              f"mean moves: {results['moves'][rows].mean():.1f}, "
+              f"mean wasted moves: {results['wasted_moves'][rows].mean():.1f}"
+              + (f", mean steps to clean: {results['steps_to_clean'][solved].mean():.1f}" if solved.any() else ""))
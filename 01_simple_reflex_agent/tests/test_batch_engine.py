@@ -0,0 +1,64 @@
+import numpy as np
+
+from batch_engine import CLEAN, IDLE, MOVE, BatchVacuumWorld, reflex_agent_batch
+from reflex_agent import environment, reflex_agent, rooms
+
+
+def test_batch_rule_matches_the_reflex_agent():
+    dirty = np.array([0, 1, 1, 0])
+    expected = [reflex_agent("Dirty" if d else "Clean") for d in dirty]
+    assert [("Clean", "Move")[a] for a in reflex_agent_batch(dirty)] == expected
+
+
+def test_single_world_follows_the_original_loop():
+    env, index = dict(environment), 0
+    world = BatchVacuumWorld.from_environment(environment, agent_index=index)
+    for _ in range(8):
+        action = reflex_agent(env[rooms[index]])
+        if action == "Clean":
+            env[rooms[index]] = "Clean"
+        else:
+            index = (index + 1) % len(rooms)
+        assert world.step().tolist() == [[CLEAN if action == "Clean" else MOVE]]
+        assert world.agent_pos.tolist() == [[index]]
+        assert world.dirt[0].tolist() == [int(env[room] == "Dirty") for room in rooms]
+
+
+def test_counters_stay_in_sync_with_the_grid():
+    world = BatchVacuumWorld(n_envs=50, height=4, width=5, dirt_prob=0.3, respawn_prob=0.02, n_agents=3,
+                             seed=11, record_every=5)
+    world.run(60)
+    assert np.array_equal(world.dirty_count, world.dirt.sum(axis=1))
+    assert world.cleanliness().shape == (50, 13)  # the starting grid plus every 5th step
+    assert np.array_equal(world.metrics()["final_cleanliness"], 1 - world.dirt.mean(axis=1))
+
+
+def test_two_agents_on_one_cell_clean_it_once():
+    world = BatchVacuumWorld(n_envs=1, height=1, width=3, dirt=[[1, 0, 0]], agent_pos=[[0, 0]], n_agents=2)
+    world.step()
+    assert world.dirty_count.tolist() == [0]
+    assert world.cleans.tolist() == [2]
+    assert world.cleaned.tolist() == [0]
+
+
+def test_run_until_clean_records_steps_per_world():
+    world = BatchVacuumWorld(n_envs=3, height=2, width=2, dirt=[[1, 1, 1, 1], [0, 0, 0, 0], [0, 0, 0, 1]])
+    world.run(100, until_clean=True)
+    assert world.all_clean().all()
+    assert world.steps_to_clean.tolist() == [7, 0, 4]
+    assert world.steps == 7
+
+
+def test_idle_agents_are_reported():
+    class Still:
+        def reset(self, world):
+            pass
+
+        def act(self, world):
+            return np.zeros_like(world.agent_pos, dtype=bool), world.agent_pos
+
+        def update(self, world):
+            pass
+
+    world = BatchVacuumWorld(n_envs=2, height=2, width=2, seed=0, policy=Still())
+    assert (world.step() == IDLE).all()
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from batch_engine import ACTION_NAMES, BatchVacuumWorld, CLEAN, MOVE, ReflexPolicy
+from rule_engine import (DecisionTable, Feature, REFLEX_VACUUM_RULES, Rule, RuleBank, RuleMatrix, RulePolicy,
+                         RuleSet, random_rulesets)
+
+FEATURES = [Feature("status", ("Clean", "Dirty")), Feature("battery", ("low", "mid", "high")),
+            Feature("zone", tuple(range(5)))]
+ACTIONS = ("Idle", "Clean", "Move", "Dock")
+
+
+def all_percepts(features):
+    grids = np.meshgrid(*[np.arange(len(feature)) for feature in features], indexing="ij")
+    codes = np.stack([grid.reshape(-1) for grid in grids], axis=1)
+    dicts = [{f.name: f.values[c] for f, c in zip(features, row)} for row in codes]
+    return codes, dicts
+
+
+def test_first_matching_rule_wins():
+    rules = RuleSet(FEATURES, [Rule({"battery": "low"}, "Dock"),
+                               Rule({"status": "Dirty", "zone": (1, 2)}, "Clean"),
+                               Rule({"status": "Dirty"}, "Move")], default="Idle", actions=ACTIONS)
+    assert rules.decide({"status": "Dirty", "battery": "low", "zone": 1}) == "Dock"
+    assert rules.decide({"status": "Dirty", "battery": "mid", "zone": 2}) == "Clean"
+    assert rules.decide({"status": "Dirty", "battery": "high", "zone": 0}) == "Move"
+    assert rules.decide({"status": "Clean", "battery": "high", "zone": 0}) == "Idle"
+
+
+@pytest.mark.parametrize("compiled", [DecisionTable, RuleMatrix])
+def test_compiled_rules_agree_with_rule_by_rule_checks(compiled):
+    codes, dicts = all_percepts(FEATURES)
+    for ruleset in random_rulesets(20, FEATURES, ACTIONS, seed=4):
+        expected = [ruleset.decide(percept) for percept in dicts]
+        assert compiled(ruleset).decide(codes).tolist() == expected
+        assert compiled(ruleset).decide(dicts).tolist() == expected
+
+
+def test_compile_falls_back_to_a_matrix_for_large_domains():
+    assert REFLEX_VACUUM_RULES.compile().strategy == "table"
+    assert RuleSet(FEATURES, [], "Idle").compile(max_table_size=10).strategy == "matrix"
+
+
+def test_bank_evaluates_each_percept_with_its_own_rule_set():
+    rulesets = random_rulesets(6, FEATURES, ACTIONS, seed=1)
+    bank = RuleBank(rulesets)
+    codes, dicts = all_percepts(FEATURES)
+    ids = np.arange(len(codes)) % len(bank)
+    expected = [rulesets[i].decide(percept) for i, percept in zip(ids, dicts)]
+    assert [ACTIONS[a] for a in bank.evaluate(codes, ids)] == expected
+
+
+def test_bank_rejects_rule_sets_with_different_features():
+    other = RuleSet([Feature("status", ("Clean", "Dirty"))], [], "Idle", ACTIONS)
+    with pytest.raises(ValueError, match="share"):
+        RuleBank([RuleSet(FEATURES, [], "Idle", ACTIONS), other])
+
+
+def test_bad_rules_and_percepts_are_reported():
+    with pytest.raises(ValueError, match="unknown features"):
+        RuleSet(FEATURES, [Rule({"colour": "red"}, "Idle")], "Idle")
+    with pytest.raises(ValueError, match="not a value"):
+        RuleSet(FEATURES, [Rule({"battery": "empty"}, "Idle")], "Idle")
+    with pytest.raises(ValueError, match="duplicate"):
+        Feature("status", ("Clean", "Clean"))
+    with pytest.raises(ValueError, match="below"):
+        RuleSet(FEATURES, [], "Idle").encode(np.array([[0, 0, 0], [2, 0, 0]]))
+    with pytest.raises(ValueError, match="not a value"):
+        FEATURES[0].encode(np.array([0, 1]))  # columns hold values, not codes
+
+
+@pytest.mark.parametrize("values, seen, other", [((True, False), True, False), ((10, 20), 10, 20),
+                                                 ((2.5, -1.0, 7.0), 7.0, 2.5)])
+def test_numeric_and_boolean_values_are_not_read_as_codes(values, seen, other):
+    feature = Feature("f", values)
+    rules = RuleSet([feature], [Rule({"f": seen}, "A")], default="B")
+    percepts = [{"f": seen}, {"f": other}]
+    expected = [rules.decide(percept) for percept in percepts]
+    assert expected == ["A", "B"]
+    for compiled in (DecisionTable(rules), RuleMatrix(rules)):
+        assert compiled.decide(percepts).tolist() == expected
+        assert compiled.decide({"f": np.array([seen, other])}).tolist() == expected
+    assert DecisionTable(rules).decide(np.array([[values.index(seen)]])).tolist() == ["A"]  # raw codes
+    with pytest.raises(ValueError, match="not a value"):
+        feature.encode([3])
+
+
+def test_reflex_rules_reproduce_the_reflex_policy():
+    assert REFLEX_VACUUM_RULES.compile().evaluate(np.array([[0], [1]])).tolist() == [MOVE, CLEAN]
+    worlds = [BatchVacuumWorld(n_envs=8, height=3, width=4, dirt_prob=0.4, respawn_prob=0.05, n_agents=2,
+                               seed=7, policy=policy) for policy in (ReflexPolicy(), RulePolicy())]
+    for world in worlds:
+        world.run(50)
+    assert np.array_equal(worlds[0].dirt, worlds[1].dirt)
+    assert np.array_equal(worlds[0].agent_pos, worlds[1].agent_pos)
+    assert np.array_equal(worlds[0].cleans, worlds[1].cleans)
+
+
+def test_worlds_can_follow_different_rule_sets():
+    idle = RuleSet([Feature("status", ("Clean", "Dirty"))], [], "Idle", ACTION_NAMES)
+    world = BatchVacuumWorld(n_envs=2, height=2, width=2, dirt_prob=1.0, seed=0,
+                             policy=RulePolicy([REFLEX_VACUUM_RULES, idle]))
+    world.run(10)
+    assert world.all_clean().tolist() == [True, False]
+    assert world.moves[1] == 0
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from batch_engine import BatchVacuumWorld
+from smart_agents import DirtIndex, GoalBasedPolicy, ModelBasedPolicy, step_toward
+
+
+# Distance to the closest marked cell by scanning the whole grid (-1 if none)
+def scan_distance(grid, cell):
+    rows, cols = np.nonzero(grid)
+    if rows.size == 0:
+        return -1
+    row, col = divmod(cell, grid.shape[1])
+    return int((np.abs(rows - row) + np.abs(cols - col)).min())
+
+
+def distance(cell, other, width):
+    if other < 0:
+        return -1
+    return abs(cell // width - other // width) + abs(cell % width - other % width)
+
+
+@pytest.mark.parametrize("shape", [(3, 7, 5), (2, 30, 41), (1, 1, 9)])
+def test_nearest_matches_full_scan(shape):
+    rng = np.random.default_rng(0)
+    mask = (rng.random(shape) < 0.05).astype(np.uint8)
+    index = DirtIndex(mask, tile=4)
+    envs = rng.integers(0, shape[0], 200)
+    cells = rng.integers(0, shape[1] * shape[2], 200)
+    found = index.nearest(envs, cells)
+    # Equal-distance ties may go either way across tiles, so compare distances
+    assert [distance(cell, other, shape[2]) for cell, other in zip(cells, found)] == \
+        [scan_distance(mask[env], cell) for env, cell in zip(envs, cells)]
+    assert all(other < 0 or mask[env].flat[other] for env, other in zip(envs, found))
+
+
+def test_nearest_prefers_the_same_row_on_ties():
+    mask = np.zeros((1, 5, 5), dtype=np.uint8)
+    mask[0, 1, 2] = mask[0, 2, 1] = 1
+    assert DirtIndex(mask).nearest([0], [2 * 5 + 2]).tolist() == [2 * 5 + 1]
+
+
+def test_far_away_dirt_is_found_through_many_rings():
+    mask = np.zeros((2, 300, 200), dtype=np.uint8)
+    mask[0, 299, 0] = mask[0, 298, 3] = mask[1, 150, 100] = 1
+    index = DirtIndex(mask)
+    envs = np.array([0, 0, 1, 1])
+    cells = np.array([0, 199, 0, 150 * 200 + 100])
+    found = index.nearest(envs, cells)
+    assert [distance(cell, other, 200) for cell, other in zip(cells, found)] == \
+        [scan_distance(mask[env], cell) for env, cell in zip(envs, cells)]
+
+
+def test_add_remove_keep_counts_in_sync():
+    mask = np.zeros((2, 10, 10), dtype=np.uint8)
+    index = DirtIndex(mask, tile=4)
+    index.add([5, 5, 100 + 99])
+    assert len(index) == 2
+    assert index.remaining().tolist() == [1, 1]
+    assert index.nearest([0, 1], [0, 0]).tolist() == [5, 99]
+
+    index.remove([5, 42])  # 42 was never marked
+    assert index.remaining().tolist() == [0, 1]
+    assert index.nearest([0], [0]).tolist() == [-1]
+    fresh = DirtIndex(mask.copy(), tile=4)
+    assert np.array_equal(index.counts, fresh.counts)
+    assert np.array_equal(index.remaining(), fresh.remaining())
+
+
+def test_step_toward_fixes_column_then_row():
+    width = 5
+    cells = np.array([0, 4, 24, 12])
+    targets = np.array([12, 14, 4, 12])
+    assert step_toward(cells, targets, width).tolist() == [1, 9, 19, 12]
+    assert step_toward(0, 12, width) == 1
+
+
+@pytest.mark.parametrize("policy_class", [GoalBasedPolicy, ModelBasedPolicy])
+def test_policies_clean_every_world(policy_class):
+    world = BatchVacuumWorld(n_envs=6, height=9, width=11, dirt_prob=0.2, n_agents=2, seed=3,
+                             policy=policy_class())
+    world.run(400, until_clean=True)
+    assert world.all_clean().all()
+    assert world.policy.plans > 0
+
+
+def test_goal_index_follows_respawned_dirt():
+    world = BatchVacuumWorld(n_envs=4, height=8, width=8, dirt_prob=0.3, respawn_prob=0.01, seed=1,
+                             policy=GoalBasedPolicy())
+    world.run(100)
+    index = world.policy.index
+    assert np.array_equal(index.counts, DirtIndex(world.grid.copy(), tile=index.tile).counts)
+
+
+def test_model_based_forgets_when_map_runs_out():
+    world = BatchVacuumWorld(n_envs=2, height=4, width=4, dirt_prob=0.0, respawn_prob=[0.0, 0.05],
+                             seed=2, policy=ModelBasedPolicy())
+    world.run(200)
+    unknown = world.policy.index.remaining()
+    assert unknown[0] == 0  # nothing can re-appear, so nothing is left to explore
+    assert world.policy.plans > 2 * 16  # the second world went around its map more than once
@@ -1,53 +1,90 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-from typing import cast
 import chainlit as cl
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+import model_registry
+from chat_turn import answer
+from history import ChatHistory
+from instructions import BEAUTY_INSTRUCTIONS
+from instrumentation import serve_prometheus, tracer_from_env
+from response_cache import ResponseCache
 
 # Load environment variables from .env file
 load_dotenv()
 
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
+# "gemini" (default) or "mock": a local stand-in with canned replies, no API key or network needed
+MODEL_BACKEND = os.getenv("BEAUTYBOT_MODEL_BACKEND", "gemini")
+if MODEL_BACKEND not in ("gemini", "mock"):
+    raise ValueError(f"Unknown BEAUTYBOT_MODEL_BACKEND {MODEL_BACKEND!r}; use 'gemini' or 'mock'.")
+
 # Check if the API key is present; raise an error if not
-if not gemini_api_key:
+if MODEL_BACKEND == "gemini" and not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
-@cl.on_chat_start
-async def start():
-    # Initialize the external client for Gemini API
-    external_client = AsyncOpenAI(
-        api_key=gemini_api_key,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-    )
+# Limit how many agent runs this process works on at once; extra messages wait their turn
+MAX_CONCURRENT_RUNS = int(os.getenv("BEAUTYBOT_MAX_CONCURRENT_RUNS", "32"))
+run_slots = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+
+# Per-session history budget: older turns beyond it are summarised and dropped
+HISTORY_TOKEN_BUDGET = int(os.getenv("BEAUTYBOT_HISTORY_TOKENS", "3000"))
+HISTORY_KEEP_TURNS = int(os.getenv("BEAUTYBOT_HISTORY_KEEP_TURNS", "4"))
 
-    model = OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=external_client
+# Optional in-process cache for repeated questions that don't depend on earlier turns
+response_cache = None
+if os.getenv("BEAUTYBOT_RESPONSE_CACHE", "0") == "1":
+    response_cache = ResponseCache(
+        max_entries=int(os.getenv("BEAUTYBOT_CACHE_SIZE", "5000")),
+        ttl=float(os.getenv("BEAUTYBOT_CACHE_TTL", "3600")),
+        threshold=float(os.getenv("BEAUTYBOT_CACHE_THRESHOLD", "0.9")),
     )
 
-    config = RunConfig(
+# Per-turn spans and latency histograms; sampled traces (and every slow or failed turn) go to BEAUTYBOT_TRACE_FILE
+tracer = tracer_from_env()
+metrics_server = None
+
+@cl.on_app_startup
+async def startup():
+    model = None
+    if MODEL_BACKEND == "mock":
+        from mock_model import MockModel
+        model = MockModel(latency=float(os.getenv("BEAUTYBOT_MOCK_LATENCY", "0.5")),
+                          tokens_per_s=float(os.getenv("BEAUTYBOT_MOCK_TOKENS_PER_S", "80")))
+
+    # One Gemini client, model and agent for the whole process, with a bounded keep-alive pool
+    registry = model_registry.configure(
+        gemini_api_key,
+        BEAUTY_INSTRUCTIONS,
+        max_connections=int(os.getenv("BEAUTYBOT_MAX_CONNECTIONS", "100")),
+        max_keepalive=int(os.getenv("BEAUTYBOT_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("BEAUTYBOT_KEEPALIVE_EXPIRY", "30")),
         model=model,
-        model_provider=external_client,
-        tracing_disabled=True
+        tracer=tracer,
     )
+    print(f"[MODEL_REGISTRY] ready ({MODEL_BACKEND} backend) with connection limits {registry.limits}")
 
-    # Define beauty-specific instructions for the agent
-    beauty_instructions = """
-    You are a Beauty Expert Assistant specializing in natural remedies and beauty tips. 
-    Provide only advice related to natural skincare, haircare, and wellness remedies using ingredients like aloe vera, honey, turmeric, coconut oil, etc. 
-    If the user asks about non-beauty topics, politely redirect them with: 
-    'Sorry, I'm here to help with natural beauty remedies! Try asking about skincare, haircare, or wellness tips.' 
-    Use a friendly and engaging tone, and include emojis like 💆‍♀️, 🌿, or ✨ to make responses appealing.
-    """
+    # Prometheus-style /metrics on its own port
+    global metrics_server
+    if os.getenv("BEAUTYBOT_METRICS_PORT"):
+        metrics_server = serve_prometheus(tracer.metrics, int(os.getenv("BEAUTYBOT_METRICS_PORT")))
+        print(f"[METRICS] serving /metrics on port {os.getenv('BEAUTYBOT_METRICS_PORT')}")
 
-    # Initialize an empty chat history in the session
-    cl.user_session.set("chat_history", [])
+@cl.on_app_shutdown
+async def shutdown():
+    registry = model_registry.get_registry()
+    print("[MODEL_REGISTRY] pool stats:", registry.stats())
+    if response_cache is not None:
+        print("[RESPONSE_CACHE] stats:", response_cache.stats.as_dict())
+    print("[METRICS]", tracer.metrics.summary())
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    await registry.aclose()
 
-    cl.user_session.set("config", config)
-    agent = Agent(name="BeautyBot", instructions=beauty_instructions, model=model)
-    cl.user_session.set("agent", agent)
+@cl.on_chat_start
+async def start():
+    # Initialize an empty, token-budgeted chat history in the session
+    cl.user_session.set("chat_history", ChatHistory(HISTORY_TOKEN_BUDGET, HISTORY_KEEP_TURNS))
 
     # Send a beauty-themed welcome message
     await cl.Message(content="Welcome to BeautyBot! 💖 I'm here to share natural remedies for glowing skin, healthy hair, and wellness. 🌿 Ask me about DIY masks, hair treatments, or beauty tips! ✨").send()
@@ -59,37 +96,26 @@ async def main(message: cl.Message):
     msg = cl.Message(content="Mixing up some natural beauty magic... 🌸")
     await msg.send()
 
-    agent = cast(Agent, cl.user_session.get("agent"))
-    config = cast(RunConfig, cl.user_session.get("config"))
-
-    # Retrieve the chat history from the session
-    history = cl.user_session.get("chat_history") or []
-    
-    # Append the user's message to the history
-    history.append({"role": "user", "content": message.content})
+    async def stream(delta, first):
+        # The first token replaces the thinking message, the rest are appended
+        await msg.stream_token(delta, is_sequence=first)
 
     try:
-        print("\n[CALLING_BEAUTY_AGENT_WITH_CONTEXT]\n", history, "\n")
-        result = Runner.run_sync(
-            starting_agent=agent,
-            input=history,
-            run_config=config
-        )
-        
-        response_content = result.final_output
-        
-        # Update the thinking message with the actual response
-        msg.content = response_content
+        # The same turn loadtest.py runs: cache, token-budgeted history, streamed run under the slot limit
+        result = await answer(message.content, cl.user_session.get("chat_history"), model_registry.get_registry(),
+                              run_slots, tracer, cache=response_cache, on_token=stream,
+                              session=cl.context.session.id)
+
+        # Close the stream with the complete response
+        msg.content = result.reply
         await msg.update()
-    
-        # Update the session with the new history
-        cl.user_session.set("chat_history", result.to_input_list())
-        
+
         # Log the interaction for debugging
-        print(f"User: {message.content}")
-        print(f"BeautyBot: {response_content}")      
+        if not result.cached:
+            print(f"User: {message.content}")
+            print(f"BeautyBot: {result.reply}")
     except Exception as e:
         # Provide a user-friendly error message with a beauty twist
         msg.content = f"Oops, something went wrong while brewing your beauty remedy! 💔 Please try again or ask about a natural beauty tip. Error: {str(e)}"
         await msg.update()
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        print(f"Error: {str(e)}")
@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass
+
+from response_cache import is_context_free
+
+
+@dataclass
+class TurnResult:
+    reply: str
+    cached: bool
+    first_token_seconds: float  # until the first streamed token (or the cached reply)
+    seconds: float
+
+
+async def answer(question, history, registry, run_slots, tracer, cache=None, on_token=None, **attributes):
+    """One BeautyBot turn, as the app and the load test both run it.
+
+    Adds the question to the token-budgeted `history`, answers from the
+    response `cache` when the question stands on its own, and otherwise
+    streams the agent under the `run_slots` concurrency limit, calling
+    `await on_token(delta, first)` for every text delta. The turn is one
+    tracer span (`attributes` go on it); errors propagate to the caller.
+    """
+    # Imported by model_registry at startup, so this costs nothing on a turn
+    from agents import Runner
+    from instrumentation import tool_hooks
+    from openai.types.responses import ResponseTextDeltaEvent
+
+    started = time.perf_counter()
+    history.add_user_message(question)
+    input_items = history.to_input()
+
+    # One span per turn: model calls and tools inside it become child spans
+    with tracer.span("turn", {"path": "model"}, history_items=len(input_items),
+                     history_tokens=history.total_tokens, **attributes) as turn:
+        # Answer straight from the cache when the question stands on its own
+        cacheable = cache is not None and (len(history.items) == 1 or is_context_free(question))
+        cached = cache.get(question) if cacheable else None
+        if cacheable:
+            tracer.metrics.inc("response_cache_total", labels={"result": "miss" if cached is None else "hit"})
+        if cached is not None:
+            turn.labels["path"] = "cache"
+            history.add_items([{"role": "assistant", "content": cached}])
+            elapsed = time.perf_counter() - started
+            return TurnResult(cached, True, elapsed, elapsed)
+
+        first_token = None
+        with tracer.span("run_slot_wait"):
+            await run_slots.acquire()
+        try:
+            result = Runner.run_streamed(
+                starting_agent=registry.agent,
+                input=input_items,
+                run_config=registry.config,
+                hooks=tool_hooks(tracer),
+            )
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    first = first_token is None
+                    if first:  # what the user waits for, queueing included
+                        first_token = time.perf_counter() - started
+                        tracer.metrics.observe("turn_ttft_seconds", turn.duration)
+                    if on_token is not None:
+                        await on_token(event.data.delta, first)
+        finally:
+            run_slots.release()
+
+        # Keep only what the agent added this turn; earlier items are already stored
+        history.add_items(result.to_input_list()[len(input_items):])
+        if cacheable:
+            cache.put(question, result.final_output)
+        elapsed = time.perf_counter() - started
+        return TurnResult(result.final_output, False, elapsed if first_token is None else first_token, elapsed)
@@ -0,0 +1,101 @@
+import json
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:  # tiktoken missing or its encoding can't be loaded offline
+    _encoding = None
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+
+def item_text(item):
+    """Plain text of one agent input item (user/assistant message or tool item)."""
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return json.dumps(item, ensure_ascii=False)
+
+
+def count_tokens(text):
+    """Token count with tiktoken when available, otherwise ~4 characters per token."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+# Default summariser: no model call, just remember what the user asked about
+def topic_summary(previous, dropped_items, max_chars=600):
+    topics = [item_text(item)[:80] for item in dropped_items if item.get("role") == "user"]
+    summary = "; ".join(filter(None, [previous, *topics]))
+    return summary[-max_chars:]
+
+
+class ChatHistory:
+    """Conversation history for one chat session, kept under a token budget.
+
+    The last `keep_turns` turns (a user message plus everything the agent
+    produced for it) are always sent verbatim. Older turns are dropped from
+    the front once the budget is exceeded and folded into a short running
+    summary by `summarizer(previous_summary, dropped_items)`. Token counts
+    are computed once per item and cached, so checking the budget never
+    re-tokenises the whole history.
+    """
+
+    def __init__(self, token_budget=3000, keep_turns=4, summarizer=topic_summary):
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.summarizer = summarizer
+        self.items = []
+        self.item_tokens = []
+        self.total_tokens = 0
+        self.summary = ""
+        self.summary_tokens = 0
+
+    def add_items(self, items):
+        for item in items:
+            tokens = count_tokens(item_text(item))
+            self.items.append(item)
+            self.item_tokens.append(tokens)
+            self.total_tokens += tokens
+        self._compact()
+
+    def add_user_message(self, text):
+        self.add_items([{"role": "user", "content": text}])
+
+    def to_input(self):
+        """Items to send to the agent: the running summary (if any) plus the kept turns."""
+        if not self.summary:
+            return list(self.items)
+        return [{"role": "system", "content": f"{SUMMARY_PREFIX} {self.summary}"}, *self.items]
+
+    def _turn_starts(self):
+        return [i for i, item in enumerate(self.items) if item.get("role") == "user"]
+
+    def _compact(self):
+        if self.total_tokens + self.summary_tokens <= self.token_budget:
+            return
+        starts = self._turn_starts()
+        droppable = len(starts) - self.keep_turns
+        if droppable <= 0:
+            return
+
+        # Drop whole turns from the front until we fit (or only kept turns remain)
+        cut, dropped_tokens = 0, 0
+        for turn in range(droppable):
+            end = starts[turn + 1]
+            dropped_tokens += sum(self.item_tokens[cut:end])
+            cut = end
+            if self.total_tokens - dropped_tokens + self.summary_tokens <= self.token_budget:
+                break
+
+        dropped = self.items[:cut]
+        del self.items[:cut]
+        del self.item_tokens[:cut]
+        self.total_tokens -= dropped_tokens
+
+        if self.summarizer is not None:
+            self.summary = self.summarizer(self.summary, dropped)
+            self.summary_tokens = count_tokens(self.summary) if self.summary else 0
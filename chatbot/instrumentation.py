@@ -0,0 +1,375 @@
+# Tracing and latency metrics for BeautyBot turns: spans, histograms, Prometheus output and
+# sampled JSONL traces, plus the Agent SDK adapters used by model_registry.py and chat_turn.py
+import atexit
+import bisect
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds (upper bounds, Prometheus style; +Inf is implied): 1-2-3-5-7.5 steps
+# from 1 ms to 2 minutes, so a quantile estimate is off by at most one step
+DEFAULT_BUCKETS = tuple(round(m * 10.0 ** e, 4) for e in range(-3, 2) for m in (1, 2, 3, 5, 7.5)) + (100.0, 120.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram: observing is one bisect and a few additions."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimate of the q-quantile (0..1), interpolated inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                if i == len(self.buckets):  # above the last bucket: the max is the best guess
+                    return self.max
+                # Interpolate inside the bucket, narrowed to the values actually seen
+                low = max(self.buckets[i - 1] if i else 0.0, self.min)
+                high = min(self.buckets[i], self.max)
+                return low + (high - low) * (rank - seen) / n
+            seen += n
+        return self.max
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """In-process counters and latency histograms, keyed by name and labels."""
+
+    def __init__(self, namespace="beautybot", buckets=DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, labels=None):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, labels=None):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def summary(self):
+        """Counters, and count/mean/p50/p90/p99/max (in ms) of every histogram."""
+        with self._lock:
+            result = {f"{name}{_format_labels(labels)}": value for (name, labels), value in self.counters.items()}
+            for (name, labels), h in self.histograms.items():
+                result[f"{name}{_format_labels(labels)}"] = {
+                    "count": h.count,
+                    "mean_ms": round(h.sum / h.count * 1000, 1) if h.count else 0.0,
+                    **{f"p{q}_ms": round(h.quantile(q / 100) * 1000, 1) for q in (50, 90, 99)},
+                    "max_ms": round(h.max * 1000, 1),
+                }
+        return result
+
+    def prometheus(self):
+        """Prometheus text exposition format."""
+        prefix = f"{self.namespace}_" if self.namespace else ""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} counter")
+                    typed.add(name)
+                lines.append(f"{prefix}{name}{_format_labels(labels)} {value}")
+            for (name, labels), h in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, n in zip((*h.buckets, "+Inf"), h.counts):
+                    cumulative += n
+                    lines.append(f"{prefix}{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{_format_labels(labels)} {h.sum}")
+                lines.append(f"{prefix}{name}_count{_format_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write the metrics to `path` atomically (e.g. for node_exporter's textfile collector)."""
+        import tempfile
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+
+
+class Span:
+    """One timed step of a turn; `labels` go to the metrics, `attributes` only to exported traces."""
+
+    __slots__ = ("name", "labels", "attributes", "start", "end", "children")
+
+    def __init__(self, name, labels, attributes, start=None):
+        self.name = name
+        self.labels = labels
+        self.attributes = attributes
+        self.start = time.perf_counter() if start is None else start
+        self.end = None
+        self.children = []
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self, origin=None):
+        origin = self.start if origin is None else origin
+        data = {"name": self.name, "start_ms": round((self.start - origin) * 1000, 2),
+                "duration_ms": round(self.duration * 1000, 2)}
+        if self.labels:
+            data["labels"] = self.labels
+        if self.attributes:
+            data["attributes"] = self.attributes
+        if self.children:
+            data["children"] = [child.to_dict(origin) for child in self.children]
+        return data
+
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class JsonlExporter:
+    """Appends finished traces to a JSONL file from a background thread, so the turn never waits on disk."""
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, trace):
+        self._queue.put(trace)
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while (trace := self._queue.get()) is not None:
+                f.write(json.dumps(trace, ensure_ascii=False, default=str) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class Tracer:
+    """Times every turn and the steps inside it.
+
+    Every span feeds the histograms (cheap and always on). Whole traces,
+    with attributes, are only exported for a `sample_rate` share of turns,
+    plus every turn slower than `slow_seconds` or ending in an error, so
+    outliers are always kept.
+    """
+
+    def __init__(self, metrics=None, sample_rate=0.01, slow_seconds=None, exporter=None, rng=random.random):
+        self.metrics = metrics or Metrics()
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.exporter = exporter
+        self.rng = rng
+
+    @contextmanager
+    def span(self, name, labels=None, **attributes):
+        """Time a block; nested spans become children of the enclosing one (per asyncio task / thread)."""
+        span = Span(name, dict(labels) if labels else {}, attributes)
+        parent = _current_span.get()
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span, parent)
+
+    def record(self, name, seconds, labels=None, **attributes):
+        """Add a step that was timed elsewhere (e.g. between two callbacks) to the current span."""
+        span = Span(name, dict(labels) if labels else {}, attributes, start=time.perf_counter() - seconds)
+        self._finish(span, _current_span.get())
+
+    def current(self):
+        return _current_span.get()
+
+    def _finish(self, span, parent):
+        span.end = time.perf_counter()
+        self.metrics.observe(f"{span.name}_seconds", span.end - span.start, span.labels)
+        if "error" in span.attributes:
+            self.metrics.inc("errors_total", labels={"span": span.name})
+        if parent is not None:
+            parent.children.append(span)
+        elif self.exporter is not None and self._keep(span):
+            self.metrics.inc("traces_exported_total")
+            self.exporter.export({"ts": time.time(), **span.to_dict()})
+
+    def _keep(self, span):
+        return (self.rng() < self.sample_rate
+                or (self.slow_seconds is not None and span.duration >= self.slow_seconds)
+                or "error" in span.attributes
+                or any("error" in child.attributes for child in span.children))
+
+
+def serve_prometheus(metrics, port, host="127.0.0.1"):
+    """Serve GET /metrics in a background thread; returns the server (call .shutdown() to stop)."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # only needed with a metrics port
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # keep scrapes out of the console
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def tracer_from_env(prefix="BEAUTYBOT_", namespace="beautybot"):
+    """Tracer configured by <prefix>TRACE_SAMPLE_RATE, TRACE_SLOW_MS and TRACE_FILE."""
+    trace_file = os.getenv(f"{prefix}TRACE_FILE")
+    slow_ms = os.getenv(f"{prefix}TRACE_SLOW_MS", "5000")
+    return Tracer(
+        Metrics(namespace),
+        sample_rate=float(os.getenv(f"{prefix}TRACE_SAMPLE_RATE", "0.01")),
+        slow_seconds=float(slow_ms) / 1000 if slow_ms else None,
+        exporter=JsonlExporter(trace_file) if trace_file else None,
+    )
+
+
+#? Agent SDK adapters. The classes are defined on first use: importing the SDK takes ~1s.
+
+def instrument_model(model, tracer):
+    """Wrap an Agent SDK model so each call records latency, time to first token and tokens in/out."""
+    return _instrumented_model_class()(model, tracer)
+
+
+def tool_hooks(tracer):
+    """RunHooks that time every tool call (pass as `hooks=` to Runner.run / run_streamed)."""
+    return _tool_hooks_class()(tracer)
+
+
+@functools.lru_cache(maxsize=None)
+def _instrumented_model_class():
+    from agents import Model
+
+    class InstrumentedModel(Model):
+        def __init__(self, model, tracer):
+            self.model = model
+            self.tracer = tracer
+
+        def _count_tokens(self, attributes, usage):
+            if usage is None:
+                return
+            tokens_in, tokens_out = getattr(usage, "input_tokens", 0) or 0, getattr(usage, "output_tokens", 0) or 0
+            attributes.update(tokens_in=tokens_in, tokens_out=tokens_out)
+            self.tracer.metrics.inc("tokens_in_total", tokens_in)
+            self.tracer.metrics.inc("tokens_out_total", tokens_out)
+
+        async def get_response(self, *args, **kwargs):
+            with self.tracer.span("model_call", {"mode": "response"}) as span:
+                response = await self.model.get_response(*args, **kwargs)
+                self._count_tokens(span.attributes, response.usage)
+                return response
+
+        async def stream_response(self, *args, **kwargs):
+            # Timed by hand rather than with tracer.span(): a context variable set inside an
+            # async generator would leak into the consumer between events
+            started = time.perf_counter()
+            attributes = {}
+            try:
+                async for event in self.model.stream_response(*args, **kwargs):
+                    event_type = getattr(event, "type", "")
+                    if event_type == "response.output_text.delta" and "ttft_ms" not in attributes:
+                        ttft = time.perf_counter() - started
+                        attributes["ttft_ms"] = round(ttft * 1000, 1)
+                        self.tracer.metrics.observe("model_ttft_seconds", ttft)
+                    elif event_type == "response.completed":
+                        self._count_tokens(attributes, getattr(event.response, "usage", None))
+                    yield event
+            except BaseException as e:
+                attributes["error"] = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self.tracer.record("model_call", time.perf_counter() - started, {"mode": "stream"}, **attributes)
+
+    return InstrumentedModel
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_hooks_class():
+    from agents import RunHooks
+
+    class ToolTimingHooks(RunHooks):
+        def __init__(self, tracer):
+            self.tracer = tracer
+            self._started = {}
+
+        async def on_tool_start(self, context, agent, tool):
+            self._started.setdefault((id(context), tool.name), []).append(time.perf_counter())
+
+        async def on_tool_end(self, context, agent, tool, result):
+            starts = self._started.get((id(context), tool.name))
+            if starts:
+                started = starts.pop(0)
+                if not starts:
+                    del self._started[(id(context), tool.name)]
+                self.tracer.record("tool", time.perf_counter() - started, {"tool": tool.name})
+
+    return ToolTimingHooks
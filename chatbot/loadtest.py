@@ -0,0 +1,135 @@
+# Drive simulated BeautyBot users through the agent and report latency and throughput.
+# Runs the same turn as beauty_bot.py (chat_turn.answer: token-budgeted history,
+# optional response cache, streamed run under the concurrency limit) without the Chainlit UI. Uses
+# the mock model by default, so no API key is needed:
+#
+#     uv run python loadtest.py --users 100 --turns 5 --cache
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+
+import model_registry
+from chat_turn import answer
+from history import ChatHistory
+from instructions import BEAUTY_INSTRUCTIONS
+from instrumentation import JsonlExporter, Metrics, Tracer
+from response_cache import ResponseCache
+
+QUESTIONS = (
+    "What's a good face mask for dry skin?",
+    "How can I reduce acne naturally?",
+    "Any hair oil recommendations?",
+    "How do I get rid of puffy eyes?",
+    "Can you make it stronger?",
+    "What about for oily skin?",
+    "What's the weather like tomorrow?",
+)
+
+
+def user_questions(user, turns):
+    """What simulated user `user` asks, one question per turn (users overlap, so the cache gets hits)."""
+    return [QUESTIONS[(user + turn) % len(QUESTIONS)] for turn in range(turns)]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def simulate(args, registry, cache, tracer):
+    run_slots = asyncio.Semaphore(args.max_concurrent_runs)
+    first_tokens, latencies = [], []
+    counts = {"cache_hits": 0, "errors": 0}
+
+    async def user(n):
+        history = ChatHistory(args.history_tokens, args.keep_turns)
+        for question in user_questions(n, args.turns):
+            try:
+                result = await answer(question, history, registry, run_slots, tracer, cache=cache, user=n)
+            except Exception as e:
+                counts["errors"] += 1
+                print(f"Error: {e}")
+                continue
+            first_tokens.append(result.first_token_seconds)
+            latencies.append(result.seconds)
+            counts["cache_hits"] += result.cached
+            if args.think:
+                await asyncio.sleep(args.think)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(args.users)))
+    elapsed = time.perf_counter() - started
+
+    def ms(values):
+        return {f"p{q}": round(percentile(values, q) * 1000, 1) for q in (50, 90, 99)} | \
+               {"max": round(max(values, default=0) * 1000, 1)}
+
+    return {
+        "users": args.users,
+        "turns": len(latencies),
+        "seconds": round(elapsed, 3),
+        "turns_per_s": round(len(latencies) / elapsed, 2),
+        "first_token_ms": ms(first_tokens),
+        "latency_ms": ms(latencies),
+        **counts,
+        "pool": registry.stats(),
+        "metrics": tracer.metrics.summary(),
+    }
+
+
+async def main(args):
+    model = None
+    if args.backend == "mock":
+        from mock_model import MockModel
+        model = MockModel(latency=args.mock_latency, tokens_per_s=args.mock_tokens_per_s)
+    tracer = Tracer(Metrics(), sample_rate=args.trace_sample_rate,
+                    exporter=JsonlExporter(args.trace_file) if args.trace_file else None)
+    registry = model_registry.ModelRegistry(os.getenv("GEMINI_API_KEY"), BEAUTY_INSTRUCTIONS, model=model,
+                                            tracer=tracer)
+    cache = ResponseCache() if args.cache else None
+    try:
+        result = await simulate(args, registry, cache, tracer)
+    finally:
+        await registry.aclose()
+    result["model_calls"] = getattr(model, "calls", None)
+    if cache is not None:
+        result["cache"] = cache.stats.as_dict()
+    return result
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Drive simulated users through BeautyBot")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=4, help="questions per user")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds a user waits between questions")
+    parser.add_argument("--backend", choices=["gemini", "mock"], default="mock")
+    parser.add_argument("--mock-latency", type=float, default=0.5, help="mock backend: seconds to the first token")
+    parser.add_argument("--mock-tokens-per-s", type=float, default=80.0, help="mock backend: output token rate")
+    parser.add_argument("--max-concurrent-runs", type=int, default=32, help="like BEAUTYBOT_MAX_CONCURRENT_RUNS")
+    parser.add_argument("--history-tokens", type=int, default=3000)
+    parser.add_argument("--keep-turns", type=int, default=4)
+    parser.add_argument("--cache", action="store_true", help="use the response cache")
+    parser.add_argument("--trace-file", help="write sampled turn traces (JSONL) to this file")
+    parser.add_argument("--trace-sample-rate", type=float, default=0.01, help="share of turns traced")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    if args.backend == "gemini" and not os.getenv("GEMINI_API_KEY"):
+        parser.error("GEMINI_API_KEY is not set")
+
+    result = asyncio.run(main(args))
+    first, latency = result["first_token_ms"], result["latency_ms"]
+    print(f"{result['turns']} turns in {result['seconds']}s = {result['turns_per_s']} turns/s | "
+          f"first token p50 {first['p50']}ms p90 {first['p90']}ms p99 {first['p99']}ms | "
+          f"latency p50 {latency['p50']}ms p90 {latency['p90']}ms p99 {latency['p99']}ms | "
+          f"model calls {result['model_calls']}, cache hits {result['cache_hits']}, errors {result['errors']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=4)
@@ -0,0 +1,88 @@
+import asyncio
+import re
+import time
+import zlib
+
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+
+# Canned answers in BeautyBot's voice; the same question always gets the same one
+REPLIES = (
+    "🌿 For dry skin, try a mask of 1 tbsp honey and 1 tsp aloe vera gel. Leave it on for 15 minutes, "
+    "then rinse with lukewarm water. Your skin will feel soft and hydrated! ✨",
+    "💆‍♀️ Warm 2 tbsp of coconut oil and massage it into your scalp for 10 minutes. Leave it on for an hour "
+    "(or overnight) before washing for shinier, stronger hair. 🥥",
+    "🌼 Mix a pinch of turmeric with a spoon of plain yogurt and apply it to blemishes for 10 minutes. "
+    "Turmeric calms inflammation and yogurt gently exfoliates. ✨",
+    "🍵 Chilled green tea bags on your eyes for 10 minutes help with puffiness, and drinking plenty of water "
+    "keeps your skin glowing from the inside. 💧",
+    "Sorry, I'm here to help with natural beauty remedies! Try asking about skincare, haircare, or wellness tips. 🌿",
+)
+
+
+def _last_user_text(input):
+    if isinstance(input, str):
+        return input
+    for item in reversed(list(input)):
+        if item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, list):
+                return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return str(content)
+    return ""
+
+
+def _tokens(text):
+    # Roughly one token per word, keeping the spaces so the pieces join back up
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+class MockModel(Model):
+    """Deterministic local stand-in for Gemini, for load tests and offline runs.
+
+    Replies with a canned beauty tip picked from the last user message, after
+    `latency` seconds for the first token and then `tokens_per_s` tokens a
+    second, streamed like the real model.
+    """
+
+    def __init__(self, latency=0.5, tokens_per_s=80.0, replies=REPLIES):
+        self.latency = latency
+        self.tokens_per_s = tokens_per_s
+        self.replies = replies
+        self.calls = 0
+
+    def _reply(self, input):
+        self.calls += 1
+        text = self.replies[zlib.crc32(_last_user_text(input).strip().lower().encode()) % len(self.replies)]
+        message = ResponseOutputMessage(id=f"msg_{self.calls}", type="message", role="assistant", status="completed",
+                                        content=[ResponseOutputText(type="output_text", text=text, annotations=[])])
+        return message, _tokens(text)
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                           tracing, *, previous_response_id=None):
+        message, pieces = self._reply(input)
+        await asyncio.sleep(self.latency + (len(pieces) / self.tokens_per_s if self.tokens_per_s else 0))
+        return ModelResponse(output=[message], usage=Usage(requests=1, output_tokens=len(pieces),
+                                                           total_tokens=len(pieces)), response_id=None)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                              tracing, *, previous_response_id=None):
+        message, pieces = self._reply(input)
+        await asyncio.sleep(self.latency)
+        for piece in pieces:
+            if self.tokens_per_s:
+                await asyncio.sleep(1 / self.tokens_per_s)
+            yield ResponseTextDeltaEvent.model_construct(type="response.output_text.delta", item_id=message.id,
+                                                         output_index=0, content_index=0, delta=piece)
+        # model_construct: the runner only reads output, usage and id from the final event
+        response = Response.model_construct(
+            id=None, object="response", created_at=time.time(), model="mock", status="completed", output=[message],
+            usage=ResponseUsage.model_construct(input_tokens=0, output_tokens=len(pieces), total_tokens=len(pieces)))
+        yield ResponseCompletedEvent.model_construct(type="response.completed", response=response)
@@ -0,0 +1,151 @@
+import time
+
+import httpx
+
+from instrumentation import instrument_model
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+GEMINI_MODEL = "gemini-2.0-flash"
+
+
+class PoolStats:
+    """Counters for requests going through the shared HTTP client."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def request_started(self):
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self, error=False):
+        self.in_flight -= 1
+        if error:
+            self.errors += 1
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that reports back once it has been fully read or closed."""
+
+    def __init__(self, stream, stats):
+        self._stream = stream
+        self._stats = stats
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self._stats.request_finished()
+        await self._stream.aclose()
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport to count in-flight requests (streams included)."""
+
+    def __init__(self, transport, stats):
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request):
+        self._stats.request_started()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._stats.request_finished(error=True)
+            raise
+        response.stream = _TrackedStream(response.stream, self._stats)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ModelRegistry:
+    """One Gemini client, model, run config and agent shared by every chat session.
+
+    The client keeps a bounded pool of keep-alive connections, so sessions
+    reuse open TLS connections instead of each paying for a new handshake.
+    Pass `model` (e.g. mock_model.MockModel) to run without Gemini; no HTTP
+    client is created then. With a `tracer` (instrumentation.Tracer) every
+    model call is timed.
+    """
+
+    def __init__(self, api_key, instructions, max_connections=100, max_keepalive=20,
+                 keepalive_expiry=30.0, model=None, tracer=None):
+        # Imported here, not at module level: the SDK takes ~1s to import and is only needed once the app starts
+        from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel
+        from agents.run import RunConfig
+        from openai import DefaultAsyncHttpxClient
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.pool_stats = PoolStats()
+        self._transport = None
+        self.client = None
+
+        if model is not None:
+            self.model = instrument_model(model, tracer) if tracer else model
+            self.config = RunConfig(model=self.model, tracing_disabled=True)
+            self.agent = Agent(name="BeautyBot", instructions=instructions, model=self.model)
+            return
+
+        self._transport = httpx.AsyncHTTPTransport(limits=self.limits)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=GEMINI_BASE_URL,
+            http_client=DefaultAsyncHttpxClient(transport=_CountingTransport(self._transport, self.pool_stats)),
+        )
+        self.model = OpenAIChatCompletionsModel(model=GEMINI_MODEL, openai_client=self.client)
+        if tracer:
+            self.model = instrument_model(self.model, tracer)
+        self.config = RunConfig(model=self.model, model_provider=self.client, tracing_disabled=True)
+        self.agent = Agent(name="BeautyBot", instructions=instructions, model=self.model)
+
+    def stats(self):
+        """Pool utilisation snapshot: request counters plus open/idle connections."""
+        connections = getattr(getattr(self._transport, "_pool", None), "connections", [])
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "uptime_s": round(time.monotonic() - self.pool_stats.started_at, 1),
+            "requests": self.pool_stats.requests,
+            "errors": self.pool_stats.errors,
+            "in_flight": self.pool_stats.in_flight,
+            "peak_in_flight": self.pool_stats.peak_in_flight,
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "max_connections": self.limits.max_connections,
+            "utilisation": round((len(connections) - idle) / self.limits.max_connections, 3),
+        }
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.close()
+
+
+_registry = None
+
+
+# Build the process-wide registry once (called from the Chainlit startup hook)
+def configure(api_key, instructions, **pool_options):
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry(api_key, instructions, **pool_options)
+    return _registry
+
+
+def get_registry():
+    if _registry is None:
+        raise RuntimeError("Model registry is not configured; call model_registry.configure() at startup.")
+    return _registry
@@ -0,0 +1,175 @@
+import math
+import re
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+# Words that usually point back at earlier turns ("what about that one?")
+REFERRING_WORDS = {"it", "this", "that", "these", "those", "them", "they", "its", "above",
+                   "previous", "earlier", "more", "again", "also", "another", "else", "instead"}
+
+# Words that don't change what is being asked; every other word has to match a cached question's
+STOP_WORDS = {"a", "an", "the", "and", "or", "for", "to", "of", "in", "on", "with", "is", "are",
+              "what", "how", "can", "could", "should", "do", "does", "i", "my", "me", "you", "your",
+              "any", "some", "s", "please",
+              # Heads of "isn't", "don't", ...: their "t" is kept as a negation
+              "isn", "aren", "don", "doesn", "didn", "wasn", "won", "shouldn", "wouldn", "couldn", "hasn", "haven"}
+
+# Negations all count as the same content word, so "is it safe" never answers "is it not safe"
+NEGATIONS = {"not", "no", "never", "without", "nor", "t", "cannot", "dont", "doesnt", "isnt", "cant", "wont"}
+
+
+def normalize(text):
+    """Lowercase, strip accents/punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _stem(word):
+    # Only plurals: "masks" and "mask" ask the same thing, "oily" and "oil" may not
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def content_words(normalized):
+    """The words that decide what a question asks: everything but stop words, plurals folded."""
+    return frozenset("not" if word in NEGATIONS else _stem(word)
+                     for word in normalized.split() if word not in STOP_WORDS)
+
+
+def _feature(token):
+    return zlib.crc32(token.encode())
+
+
+def embed(normalized):
+    """Sparse unit vector (feature id -> weight) of hashed word and character-trigram counts."""
+    counts = defaultdict(float)
+    for word in normalized.split():
+        counts[_feature("w:" + word)] += 1.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[_feature("c:" + padded[i:i + 3])] += 0.5
+    norm = math.sqrt(sum(w * w for w in counts.values())) or 1.0
+    return {f: w / norm for f, w in counts.items()}
+
+
+def is_context_free(text):
+    """True if the question doesn't seem to lean on earlier turns."""
+    return not REFERRING_WORDS.intersection(normalize(text).split())
+
+
+@dataclass
+class CacheEntry:
+    response: str
+    vector: dict
+    content: frozenset
+    expires_at: float
+    hits: int = 0
+
+
+@dataclass
+class CacheStats:
+    exact_hits: int = 0
+    semantic_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ResponseCache:
+    """In-process cache of answers keyed on normalised question text.
+
+    A lookup first tries the exact normalised text. Otherwise only entries
+    with exactly the same content words (see content_words(): stop words
+    and word order may differ, any other word, including a negation, may
+    not) are candidates, and the closest one by cosine similarity of hashed
+    word/trigram vectors is returned if it reaches `threshold`. Entries
+    expire after `ttl` seconds and the least recently used ones are evicted
+    beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries=5000, ttl=3600.0, threshold=0.9, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.postings = defaultdict(set)
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, text):
+        key = normalize(text)
+        now = self.clock()
+        entry = self.entries.get(key)
+        if entry is not None and self._fresh(key, entry, now):
+            self.stats.exact_hits += 1
+            return self._hit(key, entry)
+
+        vector = embed(key)
+        # Copied: expired candidates are removed from the postings while we rank
+        candidates = list(self.postings.get(content_words(key), ()))
+
+        # Expired entries are dropped before ranking, so one can't hide a fresh runner-up
+        best_key, best_score = None, self.threshold
+        for candidate in candidates:
+            other = self.entries[candidate]
+            if not self._fresh(candidate, other, now):
+                continue
+            score = sum(weight * other.vector.get(f, 0.0) for f, weight in vector.items())
+            if score >= best_score:
+                best_key, best_score = candidate, score
+        if best_key is not None:
+            self.stats.semantic_hits += 1
+            return self._hit(best_key, self.entries[best_key])
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, text, response):
+        key = normalize(text)
+        if not key:
+            return
+        if key in self.entries:
+            self._remove(key)
+        content = content_words(key)
+        self.entries[key] = CacheEntry(response, embed(key), content, self.clock() + self.ttl)
+        self.postings[content].add(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+            self.stats.evictions += 1
+
+    def _hit(self, key, entry):
+        entry.hits += 1
+        self.entries.move_to_end(key)
+        return entry.response
+
+    def _fresh(self, key, entry, now):
+        if entry.expires_at > now:
+            return True
+        self._remove(key)
+        self.stats.expirations += 1
+        return False
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        keys = self.postings[entry.content]
+        keys.discard(key)
+        if not keys:
+            del self.postings[entry.content]
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("agents")
+
+import model_registry
+from chat_turn import answer
+from history import ChatHistory
+from instructions import BEAUTY_INSTRUCTIONS
+from instrumentation import Metrics, Tracer
+from mock_model import MockModel
+from response_cache import ResponseCache
+
+
+def run_turns(questions, cache):
+    async def go():
+        registry = model_registry.ModelRegistry(None, BEAUTY_INSTRUCTIONS, model=MockModel(latency=0, tokens_per_s=0))
+        tracer = Tracer(Metrics("test"))
+        history, tokens, results = ChatHistory(3000, 4), [], []
+        try:
+            for question in questions:
+                results.append(await answer(question, history, registry, asyncio.Semaphore(1), tracer, cache=cache,
+                                            on_token=lambda delta, first: _collect(tokens, delta, first)))
+        finally:
+            await registry.aclose()
+        return results, tokens, tracer.metrics
+
+    return asyncio.run(go())
+
+
+async def _collect(tokens, delta, first):
+    tokens.append((delta, first))
+
+
+def test_streamed_turn_reports_tokens_and_updates_history():
+    (result,), tokens, metrics = run_turns(["What's a good face mask for dry skin?"], cache=None)
+    assert not result.cached and result.reply
+    assert "".join(delta for delta, _ in tokens) == result.reply
+    assert [first for _, first in tokens].count(True) == 1
+    assert metrics.summary()['turn_seconds{path="model"}']["count"] == 1
+
+
+def test_repeated_question_is_answered_from_the_cache():
+    question = "How can I reduce acne naturally?"
+    (first, second), _, metrics = run_turns([question, question], cache=ResponseCache())
+    assert (first.cached, second.cached) == (False, True)
+    assert second.reply == first.reply
+    assert metrics.counters[("response_cache_total", (("result", "hit"),))] == 1
+
+
+def test_a_new_users_near_miss_goes_to_the_model():
+    cache = ResponseCache()
+    (first,), _, _ = run_turns(["What is the best natural oil for frizzy hair?"], cache)
+    (other,), _, _ = run_turns(["What is the best natural oil for thin hair?"], cache)  # another user's first turn
+    (same,), _, _ = run_turns(["what's the best natural oil for frizzy hair"], cache)
+    assert (first.cached, other.cached, same.cached) == (False, False, True)
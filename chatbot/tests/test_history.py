@@ -0,0 +1,40 @@
+from history import SUMMARY_PREFIX, ChatHistory, count_tokens, item_text
+
+
+def turn(history, question, reply):
+    history.add_user_message(question)
+    history.add_items([{"role": "assistant", "content": reply}])
+
+
+def test_short_chats_are_sent_verbatim():
+    history = ChatHistory(token_budget=1000, keep_turns=2)
+    turn(history, "Hi", "Hello!")
+    assert history.to_input() == [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}]
+    assert history.total_tokens == count_tokens("Hi") + count_tokens("Hello!")
+
+
+def test_old_turns_are_folded_into_a_summary():
+    history = ChatHistory(token_budget=60, keep_turns=2)
+    for n in range(6):
+        turn(history, f"question {n} about serums", "a fairly long answer " * 10)
+
+    items = history.to_input()
+    assert items[0]["role"] == "system" and items[0]["content"].startswith(SUMMARY_PREFIX)
+    assert "question 0 about serums" in history.summary
+    assert [item["content"] for item in history.items if item["role"] == "user"][-2:] == \
+        ["question 4 about serums", "question 5 about serums"]
+    assert history.items[0]["role"] == "user"  # only whole turns are dropped
+    assert history.total_tokens == sum(count_tokens(item_text(item)) for item in history.items)
+
+
+def test_kept_turns_stay_even_over_budget():
+    history = ChatHistory(token_budget=5, keep_turns=2)
+    turn(history, "one", "x " * 50)
+    turn(history, "two", "y " * 50)
+    assert len(history.items) == 4
+    assert history.summary == ""
+
+
+def test_item_text_reads_multipart_and_tool_items():
+    assert item_text({"type": "function_call", "name": "lookup"}) == '{"type": "function_call", "name": "lookup"}'
+    assert item_text({"role": "assistant", "content": [{"type": "output_text", "text": "Hi"}, "skip"]}) == "Hi"
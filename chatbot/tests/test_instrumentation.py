@@ -0,0 +1,35 @@
+import pytest
+
+import instrumentation
+from instrumentation import Histogram, Metrics, Tracer
+
+
+def test_metrics_use_the_beautybot_namespace_by_default(monkeypatch):
+    monkeypatch.setenv("BEAUTYBOT_TRACE_SAMPLE_RATE", "0.5")
+    tracer = instrumentation.tracer_from_env()
+    with tracer.span("turn", {"path": "cache"}):
+        pass
+    assert tracer.sample_rate == 0.5
+    assert 'beautybot_turn_seconds_count{path="cache"} 1' in tracer.metrics.prometheus()
+
+
+def test_histogram_quantiles_stay_within_the_seen_values():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    assert 0.040 <= histogram.quantile(0.5) <= 0.060
+    assert histogram.quantile(1.0) == pytest.approx(0.1)
+
+
+def test_slow_and_failed_turns_are_always_exported():
+    kept = []
+    exporter = type("Exporter", (), {"export": lambda self, trace: kept.append(trace)})()
+    tracer = Tracer(Metrics(), sample_rate=0.0, slow_seconds=10.0, exporter=exporter)
+    with tracer.span("turn", {"path": "model"}):
+        tracer.record("model_call", 0.1, {"mode": "stream"})
+    tracer.record("turn", 12.0, {"path": "model"})
+    with pytest.raises(ValueError):
+        with tracer.span("turn"):
+            raise ValueError("boom")
+    assert len(kept) == 2 and kept[1]["attributes"]["error"] == "ValueError: boom"
+    assert tracer.metrics.summary()['model_call_seconds{mode="stream"}']["count"] == 1
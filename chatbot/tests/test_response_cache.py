@@ -0,0 +1,71 @@
+import pytest
+
+from response_cache import ResponseCache, content_words, is_context_free, normalize
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_and_similar_questions_hit():
+    cache = ResponseCache(threshold=0.8)
+    cache.put("What's a good face mask for dry skin?", "Honey and oats.")
+    assert cache.get("WHAT'S a good face mask for dry skin!") == "Honey and oats."
+    assert cache.get("What is a good face mask for dry skin?") == "Honey and oats."
+    assert cache.get("How do I grow my hair faster?") is None
+    assert (cache.stats.exact_hits, cache.stats.semantic_hits, cache.stats.misses) == (1, 1, 1)
+
+
+def test_an_expired_best_match_does_not_hide_a_fresh_one():
+    clock = Clock()
+    cache = ResponseCache(ttl=10, threshold=0.7, clock=clock)
+    cache.put("good face mask for dry skin", "old answer")
+    clock.now = 5
+    cache.put("what is a good face mask for my dry skin", "fresh answer")
+    clock.now = 12  # the first entry, the closer match, has expired
+    assert cache.get("a good face mask for my dry skin?") == "fresh answer"
+    assert cache.stats.expirations == 1 and len(cache) == 1
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("I have dry skin and get flaky patches around my nose every winter, what home remedy can I use "
+     "overnight to calm the redness and keep it moisturised?",
+     "I have oily skin and get flaky patches around my nose every winter, what home remedy can I use "
+     "overnight to calm the redness and keep it moisturised?"),
+    ("What is the best natural oil for frizzy hair?", "What is the best natural oil for thin hair?"),
+    ("Is it safe to use lemon juice on my face?", "Is it not safe to use lemon juice on my face?"),
+    ("Is it safe to use lemon juice on my face?", "Isn't it safe to use lemon juice on my face?"),
+    ("Can I use coconut oil on my face?", "Can I use coconut oil on my face at night?"),
+])
+def test_near_miss_questions_do_not_hit(cached, asked):
+    cache = ResponseCache(threshold=0.0)  # even with no similarity bar, the content words must match
+    cache.put(cached, "answer")
+    assert cache.get(asked) is None
+    assert cache.get(cached) == "answer"
+
+
+def test_negations_and_plurals_are_normalised():
+    assert content_words(normalize("Isn't it safe?")) == content_words(normalize("is it not safe")) == {"it", "safe", "not"}
+    assert content_words(normalize("face masks")) == content_words(normalize("a face mask"))
+    assert content_words(normalize("oily skin")) != content_words(normalize("oil skin"))
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("first question", "1")
+    cache.put("second question", "2")
+    cache.get("first question")
+    cache.put("third question", "3")
+    assert cache.get("second question") is None
+    assert cache.get("first question") == "1"
+    assert cache.stats.evictions == 1
+
+
+def test_follow_up_questions_are_not_context_free():
+    assert is_context_free("How can I reduce acne naturally?")
+    assert not is_context_free("Can you make it stronger?")
+    assert normalize("  Crème  BRÛLÉE! ") == "creme brulee"
@@ -1,100 +1,87 @@
 import streamlit as st
-from langchain_google_genai import GoogleGenerativeAI
-from langchain.agents import initialize_agent, Tool, AgentType
-from langchain.memory import ConversationBufferMemory
 from dotenv import load_dotenv
+import json
 import os
-import re
-import fitz  # PyMuPDF
+import uuid
+
+import agent_factory
+from agent_factory import LazyLangChainAgent, make_langchain_llm, status_message
+from chat_history import ChatTranscript
+from extraction import CV_EXTRACTOR
+from instrumentation import serve_prometheus, tracer_from_env
+from resume_cache import ResumeCache
+from router import FastPathRouter
+from persistence import open_log
+from session_store import current_session, open_store
 
 #? 🎯 Load environment variables
 load_dotenv()
 
-#? 🤖 Initialize LLM and memory
-llm = GoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    google_api_key=os.environ["GEMINI_API_KEY"]
-)
-memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-
-#? 📋 Global storage for application info
-application_info = {"name": None, "email": None, "skills": None}
-
-#? 📝 Extract info from plain text (chat or resume)
-def extract_application_info(text: str) -> str:
-    """Extract name, email, and skills from user input."""
-    name_match = re.search(r"(?:my name is|i am)\s+([A-Za-z]+(?:['-][A-Za-z]+)*(?:\s+[A-Za-z]+(?:['-][A-Za-z]+)*)*)", text, re.IGNORECASE)
-    email_match = re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", text)
-    skills_match = re.search(r"(?:skills\s*:?\s*|i know|i can use)\s+(.+)", text, re.IGNORECASE)
-
-    if name_match:
-        application_info["name"] = name_match.group(1).title()
-    if email_match:
-        application_info["email"] = email_match.group(0)
-    if skills_match:
-        application_info["skills"] = skills_match.group(1).strip()
-
-    return "✅ Got it! Let me check what else I need."
-
-#? 📄 Extract text from uploaded PDF CV
-def extract_text_from_pdf(uploaded_file):
-    """Extract text from an uploaded PDF file."""
-    doc = fitz.open(stream=uploaded_file.read(), filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    doc.close()
-    return text
+#? 🤖 One LLM client for the whole process (Gemini, or the local stand-in with MODEL_BACKEND=mock),
+#? created by the first message that needs it
+@st.cache_resource
+def get_llm():
+    return make_langchain_llm()
+
+#? 📋 Application info per user session ("memory" or "sqlite:///sessions.db")
+@st.cache_resource
+def get_session_store():
+    return open_store(
+        os.getenv("SESSION_STORE"),
+        idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "3600")),
+    )
+
+#? 🧾 Append-only log of every session's updates, flushed in batches in the background
+@st.cache_resource
+def get_application_log():
+    return open_log(
+        os.getenv("APPLICATION_LOG"),
+        flush_interval=float(os.getenv("APPLICATION_LOG_FLUSH_INTERVAL", "1.0")),
+    )
+
+#? ⏱️ Turn, model and tool latencies for every session; Prometheus metrics on METRICS_PORT if set
+@st.cache_resource
+def get_tracer():
+    tracer = tracer_from_env()
+    if os.getenv("METRICS_PORT"):
+        serve_prometheus(tracer.metrics, int(os.getenv("METRICS_PORT")))
+    return tracer
+
+#? 🛠️ The tools and the agent come from agent_factory.py (shared by v1, v2 and v3) and use these stores
+agent_factory.configure(store=get_session_store(), log=get_application_log())
 
 #? 🔍 Extract info from CV text
 def extract_info_from_cv(text: str):
-    """Extract name, email, and skills from CV text."""
-    extracted_info = {"name": None, "email": None, "skills": None}
-    name_match = re.search(r"(?:Full Name:|Name:|- Name:)\s*([A-Za-z]+(?:['-][A-Za-z]+)*(?:\s+[A-Za-z]+(?:['-][A-Za-z]+)*)*)", text, re.IGNORECASE)
-    email_match = re.search(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", text)
-    skills_match = re.search(r"(?:- Skills:|- Skills\s*:|Skills\s*:)\s*(.+)", text, re.IGNORECASE)
-
-    if name_match:
-        extracted_info["name"] = name_match.group(1).strip()
-    if email_match:
-        extracted_info["email"] = email_match.group(0).strip()
-    if skills_match:
-        skills = skills_match.group(1).replace("\n", ", ").strip()
-        extracted_info["skills"] = re.sub(r"\s+", " ", skills)
-
-    return extracted_info
-
-#? 🏁 Goal checker
-def check_application_goal(_: str) -> str:
-    """Check if all application info is collected."""
-    if all(application_info.values()):
-        return f"🎉 You're ready! Name: {application_info['name']}, Email: {application_info['email']}, Skills: {application_info['skills']}."
-    else:
-        missing = [k for k, v in application_info.items() if not v]
-        return f"⏳ Still need: {', '.join(missing)}"
-
-#? 🛠️ Define tools for LangChain agent
-tools = [
-    Tool(
-        name="extract_application_info",
-        func=extract_application_info,
-        description="Extracts name, email, and skills from user input."
-    ),
-    Tool(
-        name="check_application_goal",
-        func=check_application_goal,
-        description="Checks if all required application info is collected."
+    """Extract name, email, skills, phone and LinkedIn from CV text."""
+    return CV_EXTRACTOR.extract(text)
+
+#? 🗃️ Parsed resumes, shared by every session and rerun (keyed by file hash)
+@st.cache_resource
+def get_resume_cache():
+    return ResumeCache(
+        max_entries=int(os.getenv("RESUME_CACHE_SIZE", "128")),
+        directory=os.getenv("RESUME_CACHE_DIR") or None,
+        extract=extract_info_from_cv,
     )
-]
 
-#? 🤖 Initialize LangChain agent
-agent = initialize_agent(
-    tools=tools,
-    llm=llm,
-    memory=memory,
-    agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
-    verbose=False
-)
+#? ⚡ Fast-path router, shared by every session so its counters cover the whole process
+@st.cache_resource
+def get_router():
+    return FastPathRouter()
+
+#? 🪪 Session id: made on the server and kept only in this browser session's state. It is never
+#? read from the URL: anyone holding a shared link could otherwise load the user's saved details.
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "sid" in st.query_params:  # links from older versions carried the id
+    del st.query_params["sid"]
+current_session.set(st.session_state.session_id)
+
+#? 🤖 Agent and memory per session (the tools find the session through current_session).
+#? LangChain is only imported and the agent built when a message first needs the LLM.
+if "agent" not in st.session_state:
+    st.session_state.agent = LazyLangChainAgent(make_llm=get_llm, tracer=get_tracer(), return_status=False)
+agent = st.session_state.agent
 
 # ?🎨 Streamlit UI Configuration
 st.set_page_config(page_title="🎯 Job Application Assistant", layout="centered")
@@ -106,8 +93,16 @@ st.markdown("""
 """)
 
 # 📦 Session state initialization
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+#? 💬 Only the last CHAT_WINDOW messages are rendered as chat widgets; older ones are kept
+#? compressed (up to CHAT_MAX_PAGES pages of CHAT_PAGE_SIZE) and shown a page at a time on request
+if "transcript" not in st.session_state:
+    st.session_state.transcript = ChatTranscript(
+        window=int(os.getenv("CHAT_WINDOW", "30")),
+        page_size=int(os.getenv("CHAT_PAGE_SIZE", "50")),
+        max_pages=int(os.getenv("CHAT_MAX_PAGES", "100")) or None,
+    )
+if "status_key" not in st.session_state:
+    st.session_state.status_key = None  # application info the last status block was computed for
 if "goal_complete" not in st.session_state:
     st.session_state.goal_complete = False
 if "download_ready" not in st.session_state:
@@ -122,11 +117,14 @@ with st.sidebar:
 
     if resume:
         st.success("✅ Resume uploaded successfully!")
-        text = extract_text_from_pdf(resume)
-        extracted = extract_info_from_cv(text)
-        for key in application_info:
-            if extracted[key]:
-                application_info[key] = extracted[key]
+        extracted = get_resume_cache().get(resume.getvalue()).fields
+        with get_session_store().session(current_session.get()) as application_info:
+            before = dict(application_info)
+            for key in application_info:
+                if extracted[key]:
+                    application_info[key] = extracted[key]
+        if application_info != before:  # reruns with the same resume change nothing
+            agent_factory.record_application(current_session.get(), application_info)
         st.info("🔍 Extracted Info from Resume:")
         for key, value in extracted.items():
             st.markdown(f"**{key.capitalize()}:** {value or 'Not found'}")
@@ -144,27 +142,40 @@ with st.sidebar:
                 mime="text/plain"
             )
 
+    st.caption(get_router().summary())
+
     #? 🔄 Reset chat button
     if st.button("🔄 Reset Chat"):
-        st.session_state.chat_history.clear()
+        st.session_state.transcript.clear()
+        st.session_state.status_key = None
         st.session_state.goal_complete = False
         st.session_state.download_ready = False
         st.session_state.application_summary = ""
-        for key in application_info:
-            application_info[key] = None
+        agent.clear()
+        get_session_store().delete(current_session.get())
         st.rerun()
 
 #? 💬 Chat input
 user_input = st.chat_input("Type your message here... 💬")
 
+transcript = st.session_state.transcript
+
 if user_input:
-    st.session_state.chat_history.append(("user", user_input))
-    extract_application_info(user_input)
-    response = agent.invoke({"input": user_input})
-    bot_reply = response["output"]
-    st.session_state.chat_history.append(("bot", bot_reply))
-    goal_status = check_application_goal("check")
-    st.session_state.chat_history.append(("status", goal_status))
+    transcript.append("user", user_input)
+    with get_tracer().span("turn", {"path": "llm"}, session=current_session.get()) as turn:
+        #? ⚡ Turns the regex tools can answer on their own skip the LLM (the same turn loadtest.py runs)
+        bot_reply = agent.answer(user_input, get_router(), turn)
+    transcript.append("bot", bot_reply)
+
+    #? 📊 A new status block only when the application info changed since the last one
+    application_info = get_session_store().load(current_session.get())
+    status_key = json.dumps(application_info, sort_keys=True)
+    if status_key != st.session_state.status_key:
+        st.session_state.status_key = status_key
+        goal_status = status_message()
+        transcript.append("status", goal_status)
+    else:
+        goal_status = ""
 
     if "you're ready" in goal_status.lower():
         st.session_state.goal_complete = True
@@ -176,8 +187,19 @@ if user_input:
         st.session_state.application_summary = summary
         st.session_state.download_ready = True
 
-# 🖥️ Chat UI with avatars
-for sender, message in st.session_state.chat_history:
+#? 🕰️ Earlier messages: one compact markdown block per page, only rendered when asked for
+if transcript.older_count:
+    if st.toggle("🕰️ Show earlier messages", key="show_earlier"):
+        page = st.number_input(f"Page of {transcript.older_pages} (1 = most recent, {transcript.older_count} messages)",
+                               min_value=1, max_value=transcript.older_pages, value=1)
+        icons = {"user": "🧑", "bot": "🤖", "status": "📊"}
+        st.markdown("\n\n".join(f"{icons.get(sender, '💬')} {message}"
+                                  for sender, message in transcript.older(page - 1)))
+    if transcript.dropped:
+        st.caption(f"{transcript.dropped} oldest messages are no longer kept.")
+
+# 🖥️ Chat UI with avatars (the most recent messages only)
+for sender, message in transcript.recent():
     if sender == "user":
         with st.chat_message("🧑"):
             st.markdown(message)
@@ -0,0 +1,439 @@
+#? 🏭 One place that builds the job assistant for every version (v1/v2 LangChain, v3/runtime Agent SDK).
+#? Importing this module is cheap: LangChain, the Agent SDK and model clients are only
+#? imported when an agent or model is first built (see coldstart.py).
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from extraction import CHAT_EXTRACTOR
+from persistence import ApplicationLog, atomic_write_json, open_log
+from session_store import SessionStore, current_session, open_store
+
+GEMINI_MODEL = "gemini/gemini-1.5-flash"
+LANGCHAIN_GEMINI_MODEL = "gemini-2.0-flash"
+
+INSTRUCTIONS = """You are a helpful job application assistant.
+Your goal is to collect the user's name, email, and skills.
+Use the tools provided to extract this information and check whether all required data is collected.
+When you need several tools, call them together in one step rather than one after another.
+Once everything is collected, save the info to a JSON file in the project root and inform the user that the application info is complete and stop.
+"""
+
+#? 🗄️ Where the tools keep their state. Every tool call works on the session
+#? in session_store.current_session, so one agent can serve many users.
+_store: Optional[SessionStore] = None
+_log: Optional[ApplicationLog] = None
+_snapshot_path: Optional[str] = None
+_skill_index = None
+
+
+def configure(store: Optional[SessionStore] = None, log: Optional[ApplicationLog] = None,
+              snapshot_path: Optional[str] = None, skill_index=None) -> None:
+    """Override the defaults (stores from SESSION_STORE / APPLICATION_LOG).
+
+    Only the arguments given change; the rest keep their current values.
+    With `snapshot_path`, a completed application is also written there as
+    JSON, which is what a single-user CLI wants; servers leave it unset and
+    rely on the log. A `skill_index` (skills_index.SkillIndex) is kept up to
+    date with every saved application.
+    """
+    global _store, _log, _snapshot_path, _skill_index
+    if store is not None:
+        _store = store
+    if log is not None:
+        _log = log
+    if snapshot_path is not None:
+        _snapshot_path = snapshot_path
+    if skill_index is not None:
+        _skill_index = skill_index
+
+
+def get_store() -> SessionStore:
+    global _store
+    if _store is None:
+        _store = open_store(os.getenv("SESSION_STORE"), idle_ttl=float(os.getenv("SESSION_IDLE_TTL", "3600")))
+    return _store
+
+
+def get_log() -> ApplicationLog:
+    global _log
+    if _log is None:
+        _log = open_log(os.getenv("APPLICATION_LOG"),
+                        flush_interval=float(os.getenv("APPLICATION_LOG_FLUSH_INTERVAL", "1.0")))
+    return _log
+
+
+def get_skill_index():
+    """The skill index, if configured or enabled with SKILL_INDEX=1 (then built from the log)."""
+    global _skill_index
+    if _skill_index is None and os.getenv("SKILL_INDEX", "0") == "1":
+        from skills_index import SkillIndex, load_taxonomy
+        _skill_index = SkillIndex.from_records(get_log().records().items(),
+                                               load_taxonomy(os.getenv("SKILL_TAXONOMY")))
+    return _skill_index
+
+
+def record_application(session_id: str, application_info: dict) -> None:
+    """Save an update: queue it for the log and reindex the candidate's skills."""
+    get_log().append(session_id, application_info)
+    index = get_skill_index()
+    if index is not None:
+        index.add(session_id, application_info.get("skills"))
+
+
+FIELD_LABELS = (("name", "Name"), ("email", "Email"), ("skills", "Skills"))
+
+
+# Extract name, email, and skills from text into the current session; the labels saved
+def _save_found(text: str) -> List[str]:
+    found = CHAT_EXTRACTOR.extract(text)
+    session_id = current_session.get()
+
+    saved = []
+    with get_store().session(session_id) as application_info:
+        for key, label in FIELD_LABELS:
+            if found[key]:
+                application_info[key] = found[key]
+                saved.append(label)
+
+    if saved:
+        record_application(session_id, application_info)
+    return saved
+
+
+def save_application_info(text: str) -> str:
+    saved = _save_found(text)
+    if not saved:
+        return "❓ I couldn't extract any info. Could you please provide your name, email, or skills?"
+    return " ".join(f"✅ {label} saved." for label in saved) + " Let me check what else I need."
+
+
+# Where the current session stands: (application info, missing fields, note on the JSON snapshot)
+def _check_application() -> Tuple[dict, List[str], str]:
+    application_info = get_store().load(current_session.get())
+    missing = [k for k, v in application_info.items() if not v]
+    saved = ""
+    if not missing and _snapshot_path:
+        try:
+            atomic_write_json(_snapshot_path, application_info)
+            saved = f" ✅ Application info saved to {_snapshot_path}"
+        except Exception as e:
+            saved = f" ❌ Error saving to JSON: {e}"
+    return application_info, missing, saved
+
+
+def _status_for_model(application_info: dict, missing: List[str], saved: str) -> str:
+    if not missing:
+        return _ready(application_info, saved)
+    return f"⏳ Still need: {', '.join(missing)}. Please ask the user to provide this."
+
+
+def _status_for_user(application_info: dict, missing: List[str], saved: str) -> str:
+    if not missing:
+        return _ready(application_info, saved)
+    needed = " and ".join(filter(None, [", ".join(missing[:-1]), missing[-1]]))
+    return f"📝 Could you also share your {needed}?"
+
+
+def _ready(application_info: dict, saved: str) -> str:
+    return (f"✅ You're ready! Name: {application_info['name']}, Email: {application_info['email']}, "
+            f"Skills: {application_info['skills']}.{saved}")
+
+
+# Check if all required information is collected for the current session (worded for the model)
+def application_status() -> str:
+    return _status_for_model(*_check_application())
+
+
+# The same check, worded for the user (fast-path replies and status blocks)
+def status_message() -> str:
+    return _status_for_user(*_check_application())
+
+
+@dataclass(frozen=True)
+class ApplicationUpdate:
+    """What one extract-and-check step did: `model` is the tool result the
+    model reads (also what str() gives), `reply` the same news for the user."""
+    model: str
+    reply: str
+
+    def __str__(self) -> str:
+        return self.model
+
+
+# Both steps at once: what the agent needs after every user message
+def extract_and_check_application(text: str) -> ApplicationUpdate:
+    saved = _save_found(text)
+    check = _check_application()
+    if not saved:
+        return ApplicationUpdate(
+            "❓ I couldn't extract any info. Could you please provide your name, email, or skills? "
+            + _status_for_model(*check),
+            "❓ I couldn't find a name, email or skills in that. " + _status_for_user(*check))
+    done = " ".join(f"✅ {label} saved." for label in saved)
+    return ApplicationUpdate(done + " Let me check what else I need. " + _status_for_model(*check),
+                             done + " " + _status_for_user(*check))
+
+
+# The whole reply to a turn the router sends down the fast path (`status=False` when the
+# UI shows the status on its own, as agent-v2 does)
+def fast_reply(text: str, status: bool = True) -> str:
+    if status:
+        return extract_and_check_application(text).reply
+    saved = _save_found(text)
+    if not saved:
+        return "❓ I couldn't find a name, email or skills in that. Could you share them?"
+    return " ".join(f"✅ {label} saved." for label in saved)
+
+
+# Tools exposed to the Agent SDK agent (built on first use: importing agents takes ~1s)
+_sdk_tools = None
+
+
+def sdk_tools() -> dict:
+    global _sdk_tools
+    if _sdk_tools is None:
+        from agents import function_tool
+
+        @function_tool
+        def extract_application_info(text: str) -> str:
+            return save_application_info(text)
+
+        @function_tool
+        def check_application_goal(dummy: str) -> str:
+            return application_status()
+
+        @function_tool(name_override="extract_and_check_application")
+        def extract_and_check(text: str) -> ApplicationUpdate:
+            """Save the name, email and skills found in the user's message and report what is still missing."""
+            return extract_and_check_application(text)
+
+        _sdk_tools = {tool.name: tool for tool in (extract_application_info, check_application_goal,
+                                                   extract_and_check)}
+    return _sdk_tools
+
+
+#? 🔌 Model backends: MODEL_BACKEND=gemini (default) or mock (mock_llm.py, no API key or network)
+def model_backend(backend: Optional[str] = None) -> str:
+    backend = backend or os.getenv("MODEL_BACKEND", "gemini")
+    if backend not in ("gemini", "mock"):
+        raise ValueError(f"Unknown MODEL_BACKEND {backend!r}; use 'gemini' or 'mock'")
+    return backend
+
+
+def _mock_options(latency: Optional[float], tokens_per_s: Optional[float]) -> dict:
+    return {"latency": float(os.getenv("MOCK_LATENCY", "0.5")) if latency is None else latency,
+            "tokens_per_s": float(os.getenv("MOCK_TOKENS_PER_S", "80")) if tokens_per_s is None else tokens_per_s}
+
+
+def gemini_model(api_key: Optional[str] = None):
+    from agents.extensions.models.litellm_model import LitellmModel  # pulls in litellm, only needed for Gemini
+
+    api_key = api_key or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not found in environment variables.")
+    return LitellmModel(model=GEMINI_MODEL, api_key=api_key)
+
+
+def make_model(backend: Optional[str] = None, latency: Optional[float] = None,
+               tokens_per_s: Optional[float] = None):
+    """Agent SDK model for the selected backend (latency/tokens_per_s only apply to the mock)."""
+    if model_backend(backend) == "mock":
+        from mock_llm import ScriptedModel
+        return ScriptedModel(**_mock_options(latency, tokens_per_s))
+    return gemini_model()
+
+
+def make_langchain_llm(backend: Optional[str] = None, latency: Optional[float] = None,
+                       tokens_per_s: Optional[float] = None):
+    """LangChain LLM for the selected backend (agent-v1/v2)."""
+    if model_backend(backend) == "mock":
+        from mock_llm import ScriptedLLM
+        return ScriptedLLM(**_mock_options(latency, tokens_per_s))
+    from langchain_google_genai import GoogleGenerativeAI
+    return GoogleGenerativeAI(model=LANGCHAIN_GEMINI_MODEL, google_api_key=os.environ["GEMINI_API_KEY"])
+
+
+#? 🔧 AGENT_TOOLS=combined (default): one extract-and-check tool whose output is the reply,
+#? so a turn is a single model call on any provider. separate: the two original tools,
+#? which the model may call in the same step (parallel tool calls, where the provider
+#? accepts them) before it writes the reply.
+def agent_tools(mode: Optional[str] = None) -> str:
+    mode = mode or os.getenv("AGENT_TOOLS", "combined")
+    if mode not in ("combined", "separate"):
+        raise ValueError(f"Unknown AGENT_TOOLS {mode!r}; use 'combined' or 'separate'")
+    return mode
+
+
+def reply_from_update(context, tool_results):
+    """Agent SDK tool_use_behavior: end the turn once the combined tool ran, answering the
+    user with its `reply` (the model-facing text never reaches the user)."""
+    from agents import ToolsToFinalOutputResult
+
+    for result in tool_results:
+        if isinstance(result.output, ApplicationUpdate):
+            return ToolsToFinalOutputResult(is_final_output=True, final_output=result.output.reply)
+    return ToolsToFinalOutputResult(is_final_output=False)
+
+
+def supports_parallel_tool_calls(model) -> bool:
+    """Whether `parallel_tool_calls` can be sent to this model: OpenAI models and
+    ones that say so (the mock). LitellmModel forwards it to providers such as
+    Gemini that may reject it or ignore it, so it is left unset there."""
+    from agents import Model, OpenAIChatCompletionsModel, OpenAIResponsesModel
+
+    while isinstance(getattr(model, "model", None), Model):  # instrumentation.instrument_model wrappers
+        model = model.model
+    return (isinstance(model, (OpenAIChatCompletionsModel, OpenAIResponsesModel))
+            or getattr(model, "supports_parallel_tool_calls", False))
+
+
+def build_agent(model=None, model_settings=None, tools: Optional[str] = None):
+    """The job application agent; `model` defaults to the MODEL_BACKEND model."""
+    from agents import Agent, ModelSettings
+
+    model = model or make_model()
+    if agent_tools(tools) == "combined":
+        selected = [sdk_tools()["extract_and_check_application"]]
+        behavior = reply_from_update
+        parallel = None  # one tool: nothing to run in parallel
+    else:
+        selected = [sdk_tools()["extract_application_info"], sdk_tools()["check_application_goal"]]
+        behavior = "run_llm_again"
+        parallel = True if supports_parallel_tool_calls(model) else None
+    return Agent(
+        name="Helpful job application assistant",
+        instructions=INSTRUCTIONS,
+        model=model,
+        model_settings=model_settings or ModelSettings(parallel_tool_calls=parallel),
+        tools=selected,
+        tool_use_behavior=behavior,
+    )
+
+
+def build_langchain_agent(llm=None, memory=None, verbose: bool = False, return_status: bool = True):
+    """Conversational ReAct agent with the same session-aware tools (agent-v1/v2 style).
+
+    With `return_status`, the status check ends the turn and is the reply;
+    agent-v2 shows the status itself, so it lets the agent answer instead.
+    """
+    from langchain.agents import AgentType, Tool, initialize_agent
+    from langchain.memory import ConversationBufferMemory
+
+    tools = [
+        Tool(
+            name="extract_application_info",
+            func=save_application_info,
+            description="Use this to extract name, email, and skills from the user's message."
+        ),
+        Tool(
+            name="check_application_goal",
+            # Returned as the reply when `return_status`, so then it is worded for the user
+            func=lambda _: status_message() if return_status else application_status(),
+            description="Check if name, email, and skills are provided. If not, tell the user what is missing.",
+            return_direct=return_status
+        ),
+    ]
+    return initialize_agent(
+        tools=tools,
+        llm=llm or make_langchain_llm(),
+        memory=memory or ConversationBufferMemory(memory_key="chat_history", return_messages=True),
+        agent=AgentType.CHAT_CONVERSATIONAL_REACT_DESCRIPTION,
+        verbose=verbose,
+        agent_kwargs={"system_message": INSTRUCTIONS},
+    )
+
+
+class LazyLangChainAgent:
+    """A LangChain agent that is only built for the first turn that needs the LLM.
+
+    Turns answered without it (the fast path) are kept and written into the
+    agent's memory once it exists, so it still sees the whole conversation.
+    With a `tracer` (instrumentation.Tracer), model and tool calls are timed;
+    `callbacks` are extra LangChain handlers for every call.
+
+    `answer()` / `aanswer()` run one whole turn the way agent-v1/v2 (and
+    loadtest.py) do; `invoke()` / `ainvoke()` always ask the agent.
+    """
+
+    def __init__(self, make_llm: Callable = make_langchain_llm, tracer=None, callbacks=(), **options):
+        self.make_llm = make_llm
+        self.tracer = tracer
+        self.callbacks = list(callbacks)
+        self.options = options
+        self._agent = None
+        self._config: dict = {}
+        self._pending: List[Tuple[str, str]] = []
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            callbacks = list(self.callbacks)
+            if self.tracer is not None:
+                from instrumentation import langchain_callbacks
+                callbacks.append(langchain_callbacks(self.tracer))
+            if callbacks:  # per call, not on the agent: constructor callbacks don't reach the tools
+                self._config = {"callbacks": callbacks}
+            self._agent = build_langchain_agent(self.make_llm(), **self.options)
+            for user_input, output in self._pending:
+                self._agent.memory.save_context({"input": user_input}, {"output": output})
+            self._pending.clear()
+        return self._agent
+
+    def invoke(self, user_input: str, **kwargs) -> str:
+        agent = self.agent
+        return agent.invoke({"input": user_input}, **{"config": self._config, **kwargs})["output"]
+
+    async def ainvoke(self, user_input: str, **kwargs) -> str:
+        agent = self.agent
+        return (await agent.ainvoke({"input": user_input}, **{"config": self._config, **kwargs}))["output"]
+
+    def answer(self, user_input: str, router=None, span=None) -> str:
+        """One turn: answered locally when `router` (router.FastPathRouter) allows, else by the agent.
+
+        The path taken goes into `span.labels["path"]` ("fast" or "llm").
+        """
+        if self._fast(user_input, router, span):
+            return self._answer_locally(user_input)
+        if not self._status_is_reply:
+            save_application_info(user_input)  # the agent answers; the UI shows the status itself
+        return self.invoke(user_input)
+
+    async def aanswer(self, user_input: str, router=None, span=None, limit: Optional[Callable] = None) -> str:
+        """`answer()` for asyncio; `limit()` (an async context manager) wraps the agent call."""
+        if self._fast(user_input, router, span):
+            return self._answer_locally(user_input)
+        if not self._status_is_reply:
+            save_application_info(user_input)
+        if limit is None:
+            return await self.ainvoke(user_input)
+        async with limit():
+            return await self.ainvoke(user_input)
+
+    @property
+    def _status_is_reply(self) -> bool:
+        return self.options.get("return_status", True)
+
+    @staticmethod
+    def _fast(user_input: str, router, span) -> bool:
+        fast = router is not None and router.route(user_input).fast
+        if span is not None:
+            span.labels["path"] = "fast" if fast else "llm"
+        return fast
+
+    def _answer_locally(self, user_input: str) -> str:
+        reply = fast_reply(user_input, status=self._status_is_reply)
+        self.save_context(user_input, reply)  # 🧠 keep the agent's memory complete
+        return reply
+
+    def save_context(self, user_input: str, output: str) -> None:
+        """Record a turn answered without the agent."""
+        if self._agent is None:
+            self._pending.append((user_input, output))
+        else:
+            self._agent.memory.save_context({"input": user_input}, {"output": output})
+
+    def clear(self) -> None:
+        self._pending.clear()
+        if self._agent is not None:
+            self._agent.memory.clear()
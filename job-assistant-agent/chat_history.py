@@ -0,0 +1,87 @@
+import json
+import zlib
+from typing import List, Optional, Tuple
+
+Message = Tuple[str, str]  # (sender, text): "user", "bot" or "status"
+
+
+class ChatTranscript:
+    """The chat of one session, with bounded memory.
+
+    The newest messages stay in a plain list; every `page_size` messages
+    that fall out of it are packed into one zlib-compressed JSON page, and
+    pages beyond `max_pages` are dropped (oldest first). Only `window`
+    messages are meant to be rendered as live widgets on each rerun; older
+    ones are read back a page at a time with `older()`.
+    """
+
+    def __init__(self, window: int = 30, page_size: int = 50, max_pages: Optional[int] = 100):
+        self.window = window
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._recent: List[Message] = []
+        self._pages: List[bytes] = []
+        self._dropped = 0  # messages in pages that were dropped
+        self._cached_page: Tuple[int, List[Message]] = (-1, [])
+
+    def __len__(self) -> int:
+        """Messages still kept (live and paged)."""
+        return self._paged + len(self._recent)
+
+    @property
+    def _paged(self) -> int:
+        return len(self._pages) * self.page_size
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def append(self, sender: str, text: str) -> None:
+        self._recent.append((sender, text))
+        # Keep at least `window` messages live so rendering never needs a page
+        if len(self._recent) >= self.window + self.page_size:
+            page, self._recent = self._recent[:self.page_size], self._recent[self.page_size:]
+            self._pages.append(zlib.compress(json.dumps(page).encode()))
+            if self.max_pages is not None and len(self._pages) > self.max_pages:
+                del self._pages[0]
+                self._dropped += self.page_size
+                self._cached_page = (-1, [])
+
+    def recent(self) -> List[Message]:
+        """The last `window` messages, oldest first."""
+        return self._recent[-self.window:]
+
+    @property
+    def older_count(self) -> int:
+        """Messages kept but outside the rendered window."""
+        return max(0, len(self) - self.window)
+
+    @property
+    def older_pages(self) -> int:
+        return -(-self.older_count // self.page_size)
+
+    def older(self, page: int = 0) -> List[Message]:
+        """Page `page` of the messages before the window, counted back from the newest (0)."""
+        stop = self.older_count - page * self.page_size
+        return self._slice(max(0, stop - self.page_size), max(0, stop))
+
+    def _slice(self, start: int, stop: int) -> List[Message]:
+        messages: List[Message] = []
+        for index in range(start // self.page_size, min(len(self._pages), -(-stop // self.page_size))):
+            offset = index * self.page_size
+            messages.extend(self._page(index)[max(0, start - offset):stop - offset])
+        live_start = max(start, self._paged) - self._paged
+        if stop > self._paged:
+            messages.extend(self._recent[live_start:stop - self._paged])
+        return messages
+
+    def _page(self, index: int) -> List[Message]:
+        if self._cached_page[0] != index:  # paging back and forth decompresses each page once
+            self._cached_page = (index, [tuple(m) for m in json.loads(zlib.decompress(self._pages[index]))])
+        return self._cached_page[1]
+
+    def clear(self) -> None:
+        self._recent.clear()
+        self._pages.clear()
+        self._dropped = 0
+        self._cached_page = (-1, [])
@@ -0,0 +1,107 @@
+#? ⏱️ Cold-start report: how long each entry point takes to import, and which packages that time goes to.
+#? Every target runs in a fresh interpreter with `python -X importtime`. Scripts are run with
+#? __name__ != "__main__", so their chat loops don't start and only the startup work is measured.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TARGETS = ["agent-v1.py", "agent-v3.py", "runtime.py"]
+
+_RUN_SCRIPT = "import runpy, sys; sys.path.insert(0, {dir!r}); runpy.run_path({path!r}, run_name='__coldstart__')"
+_RUN_MODULE = "import importlib; importlib.import_module({name!r})"
+
+
+@dataclass
+class ImportProfile:
+    target: str
+    wall_s: float
+    import_ms: float  # sum of the cumulative time of top-level imports
+    packages: Dict[str, float] = field(default_factory=dict)  # self time per top-level package, in ms
+    modules: int = 0
+    error: Optional[str] = None
+
+    def top(self, n: int) -> List[tuple]:
+        return Counter(self.packages).most_common(n)
+
+
+def parse_importtime(stderr: str) -> tuple:
+    """(total ms, self ms per top-level package, module count) from -X importtime output."""
+    total_us, modules = 0, 0
+    packages: Counter = Counter()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules += 1
+        packages[name.strip().split(".")[0]] += int(self_us)
+        if not name[1:].startswith(" "):  # not nested under another import
+            total_us += int(cumulative_us)
+    return total_us / 1000, {name: us / 1000 for name, us in packages.items()}, modules
+
+
+def profile(target: str, python: str = sys.executable, env: Optional[dict] = None) -> ImportProfile:
+    """Import `target` (a script path or a module name) in a fresh interpreter and profile it."""
+    if target.endswith(".py"):
+        path = os.path.abspath(os.path.join(HERE, target))
+        code, cwd = _RUN_SCRIPT.format(dir=os.path.dirname(path), path=path), os.path.dirname(path)
+    else:
+        code, cwd = _RUN_MODULE.format(name=target), HERE
+
+    started = time.perf_counter()
+    proc = subprocess.run([python, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                          stdin=subprocess.DEVNULL, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    total, packages, modules = parse_importtime(proc.stderr)
+    error = None
+    if proc.returncode:
+        errors = [line for line in (proc.stdout + proc.stderr).splitlines()
+                  if line.strip() and not line.startswith("import time:")]
+        error = errors[-1] if errors else f"exit code {proc.returncode}"
+    return ImportProfile(target, round(wall, 3), round(total, 1),
+                         {name: round(ms, 1) for name, ms in packages.items()}, modules, error)
+
+
+def best_of(target: str, repeat: int = 3, **kwargs) -> ImportProfile:
+    """Fastest of `repeat` runs (the first one also warms the OS file cache)."""
+    return min((profile(target, **kwargs) for _ in range(repeat)), key=lambda p: p.import_ms)
+
+
+def report(profiles: List[ImportProfile], top: int) -> str:
+    lines = []
+    for p in profiles:
+        status = f" ❌ {p.error}" if p.error else ""
+        lines.append(f"{p.target}: {p.import_ms:.0f} ms importing {p.modules} modules, "
+                     f"{p.wall_s:.2f} s wall{status}")
+        for name, ms in p.top(top):
+            lines.append(f"    {name:<28} {ms:8.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the import (cold start) cost of the entry points")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS,
+                        help="scripts (relative to this folder) or module names; "
+                             "e.g. agent-v2.py (needs streamlit) or ../chatbot/beauty_bot.py")
+    parser.add_argument("--top", type=int, default=8, help="packages to list per target")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target; the fastest is reported")
+    parser.add_argument("--mock", action="store_true",
+                        help="use the mock model backends, so no GEMINI_API_KEY is needed")
+    parser.add_argument("--json", help="write the profiles to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.mock:
+        env.update(MODEL_BACKEND="mock", BEAUTYBOT_MODEL_BACKEND="mock")
+    profiles = [best_of(target, args.repeat, env=env) for target in args.targets]
+    print(report(profiles, args.top))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([vars(p) for p in profiles], f, indent=4)
+    sys.exit(1 if any(p.error for p in profiles) else 0)
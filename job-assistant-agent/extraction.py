@@ -0,0 +1,148 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+#? 🧩 Building blocks shared by the patterns below
+_WORD = r"[A-Za-z]+(?:['-][A-Za-z]+)*"
+# Words that end a name in chat ("my name is Ali and my email is ...")
+_NOT_NAME = r"(?!(?:and|my|i|im|am|email|e-mail|skills?|phone|with|from|is|here)\b)"
+# Words that can't start one ("call me back", "my name is not important")
+_NOT_FIRST_NAME = r"(?!(?:a|an|the|not|back|later|now|soon|tomorrow|anytime|at|on|if|when|after|before)\b)"
+_EMAIL_LOCAL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+# The whole local part, from the first character that can belong to it ("_test@ex.com" stays as is)
+EMAIL_PATTERN = r"(?<![A-Za-z0-9._%+-])(?P<value>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b"
+
+
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+def _title(value: str) -> str:
+    return value.strip().title()
+
+
+def _squash_spaces(value: str) -> str:
+    return re.sub(r"\s+", " ", value).strip()
+
+
+@dataclass(frozen=True)
+class Field:
+    """One field to extract.
+
+    triggers     -- lowercase literals that must appear where the field starts
+    pattern      -- regex matched at a trigger, with the value in (?P<value>...)
+    extend_back  -- characters to walk back over from the trigger before
+                    matching (an email's local part sits before its "@")
+    """
+    name: str
+    triggers: Tuple[str, ...]
+    pattern: str
+    clean: Callable[[str], str] = _strip
+    extend_back: frozenset = frozenset()
+
+
+class Extractor:
+    """Pulls several fields out of a text in a single scan.
+
+    Every field has a few literal triggers ("my name is", "@", "skills").
+    All triggers are compiled into one regex that walks the text once; the
+    full field pattern is only tried, anchored, where a trigger appears.
+    That keeps the expensive case-insensitive patterns off most of the
+    text, which a single big alternation of the patterns would not. The
+    first match of every field wins, like a separate re.search per field,
+    and the scan stops once every field has been found.
+    """
+
+    def __init__(self, fields: Iterable[Field]):
+        self.fields = tuple(fields)
+        self._patterns = {f.name: re.compile(f.pattern, re.IGNORECASE) for f in self.fields}
+        self._by_trigger: Dict[str, list] = {}
+        for f in self.fields:
+            for trigger in f.triggers:
+                self._by_trigger.setdefault(trigger, []).append(f)
+        # Longest first, so "full name" wins over "name" at the same spot. No
+        # capturing groups: they stop re from using its fast literal search.
+        triggers = "|".join(re.escape(t) for t in sorted(self._by_trigger, key=len, reverse=True))
+        self._triggers = re.compile(triggers)
+        self._triggers_anycase = re.compile(triggers, re.IGNORECASE)
+
+    def scan(self, text: str) -> Dict[str, Tuple[str, int, int]]:
+        """Map each found field to (cleaned value, start, end) of its raw value in `text`."""
+        found: Dict[str, Tuple[str, int, int]] = {}
+        wanted = len(self.fields)
+        # Scanning a lowercased copy for literals is several times faster than an
+        # IGNORECASE scan, as long as lowercasing keeps every offset in place
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            hits = self._triggers.finditer(lowered)
+        else:
+            hits = self._triggers_anycase.finditer(text)
+        for hit in hits:
+            for field in self._fields_for(hit.group()):
+                if field.name in found:
+                    continue
+                start = hit.start()
+                while start > 0 and text[start - 1] in field.extend_back:
+                    start -= 1
+                match = self._patterns[field.name].match(text, start)
+                if match:
+                    found[field.name] = (field.clean(match.group("value")),
+                                         match.start("value"), match.end("value"))
+            if len(found) == wanted:
+                break
+        return found
+
+    def _fields_for(self, trigger: str) -> list:
+        fields = self._by_trigger.get(trigger)
+        if fields is None:  # matched case-insensitively, e.g. "İ am"
+            fields = next(v for k, v in self._by_trigger.items()
+                          if re.fullmatch(re.escape(k), trigger, re.IGNORECASE))
+        return fields
+
+    def extract(self, text: str) -> Dict[str, Optional[str]]:
+        """Map every field name to its value, or None when it isn't in the text."""
+        found = self.scan(text)
+        return {f.name: found[f.name][0] if f.name in found else None for f in self.fields}
+
+    def extract_many(self, texts: Iterable[str], workers: Optional[int] = None,
+                     chunksize: int = 256) -> Iterator[Dict[str, Optional[str]]]:
+        """Extract from a list or stream of texts, in order.
+
+        With `workers` the texts are spread over a process pool in chunks;
+        otherwise they are processed lazily in this process.
+        """
+        if not workers:
+            for text in texts:
+                yield self.extract(text)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(self.extract, texts, chunksize=chunksize)
+
+
+EMAIL_FIELD = Field("email", ("@",), EMAIL_PATTERN, extend_back=_EMAIL_LOCAL_CHARS)
+
+#? 💬 Fields people type in chat ("my name is ...", "i know ...")
+#? "I am ..." is a guess ("I am bored"): the LLM tools take it, FastPathRouter leaves it to the model
+CHAT_FIELDS = (
+    Field("name", ("my name is", "call me", "i am", "i'm"),
+          rf"\b(?:my name is|call me|i am|i'm)\s+{_NOT_FIRST_NAME}(?P<value>{_WORD}(?:\s+{_NOT_NAME}{_WORD}){{0,3}})",
+          _title),
+    EMAIL_FIELD,
+    Field("skills", ("skills", "i know", "i can use"),
+          r"\b(?:skills(?:\s+are|\s+include)?\s*:?|i know|i can use)\s+(?P<value>.+)"),
+)
+
+#? 📄 Fields found in CV text ("Name: ...", "Skills: ...")
+CV_FIELDS = (
+    Field("name", ("full name", "name"),
+          rf"\b(?:full name|name)\s*:\s*(?P<value>{_WORD}(?:[^\S\n]+{_WORD})*)"),
+    EMAIL_FIELD,
+    Field("skills", ("skills",), r"\bskills\s*:\s*(?P<value>.+)", _squash_spaces),
+    Field("phone", ("phone", "mobile", "tel"),
+          r"\b(?:phone|mobile|tel)[^\S\n]*:?[^\S\n]*(?P<value>\+?\d[\d ()-]{6,}\d)"),
+    Field("linkedin", ("linkedin.com/in/",), r"(?P<value>linkedin\.com/in/[\w-]+)"),
+)
+
+CHAT_EXTRACTOR = Extractor(CHAT_FIELDS)
+CV_EXTRACTOR = Extractor(CV_FIELDS)
@@ -0,0 +1,334 @@
+import argparse
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from extraction import CV_EXTRACTOR
+
+#? 📦 A job is (source id, kind, locator): kind "file" -> path on disk,
+#? "zip" -> (archive path, member name), "bytes" -> PDF bytes read in the parent
+Job = Tuple[str, str, object]
+#? ✂️ A task is the part of a job one worker parses: (job, first page, stop page, chunk, chunk count).
+#? Small PDFs are one task; large ones are split into page ranges so they don't run serially.
+Task = Tuple[Job, int, Optional[int], int, int]
+
+PAGES_PER_CHUNK = 16
+MIN_SPLIT_BYTES = 1 << 20  # smaller files are not worth opening in the parent to count pages
+
+
+def _open_pdf(pdf: Union[str, bytes]):
+    import fitz  # PyMuPDF, only needed once a PDF is actually read
+
+    return fitz.open(pdf) if isinstance(pdf, str) else fitz.open(stream=pdf, filetype="pdf")
+
+
+def pdf_text(pdf: Union[str, bytes], start: int = 0, stop: Optional[int] = None) -> Tuple[str, int]:
+    """Text of pages [start, stop) of a PDF given as a path or raw bytes, plus its page count.
+
+    Pages are collected and joined once, instead of growing one string
+    page by page (which copies the text again for every page).
+    """
+    doc = _open_pdf(pdf)
+    try:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        return "".join([doc[number].get_text() for number in range(start, stop)]), doc.page_count
+    finally:
+        doc.close()
+
+
+#? 🗂️ Find every PDF under a directory or inside a .zip / .tar(.gz) archive
+def iter_jobs(source: str) -> Iterator[Job]:
+    path = Path(source)
+    if path.is_dir():
+        for pdf in sorted(path.rglob("*")):
+            if pdf.suffix.lower() == ".pdf" and pdf.is_file():
+                yield pdf.relative_to(path).as_posix(), "file", str(pdf)
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.namelist():
+                if member.lower().endswith(".pdf"):
+                    yield f"{path.name}::{member}", "zip", (str(path), member)
+    elif tarfile.is_tarfile(path):
+        # Compressed tars can't be read out of order, so members are read here
+        # one after another and their bytes are handed to the workers
+        with tarfile.open(path, "r:*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield f"{path.name}::{member.name}", "bytes", archive.extractfile(member).read()
+    elif path.suffix.lower() == ".pdf":
+        yield path.name, "file", str(path)
+    else:
+        raise ValueError(f"{source} is not a directory, a .zip/.tar archive or a PDF")
+
+
+_open_archives: Dict[str, zipfile.ZipFile] = {}
+
+
+def _open_archive(archive_path: str) -> zipfile.ZipFile:
+    # Each process opens an archive once and keeps it for all its members
+    archive = _open_archives.get(archive_path)
+    if archive is None:
+        archive = _open_archives[archive_path] = zipfile.ZipFile(archive_path)
+    return archive
+
+
+def _read_zip_member(archive_path: str, member: str) -> bytes:
+    return _open_archive(archive_path).read(member)
+
+
+def _record(source: str, text: Optional[str] = None, pages: Optional[int] = None,
+            error: Optional[str] = None) -> Dict[str, Optional[object]]:
+    record: Dict[str, Optional[object]] = {"source": source}
+    if error is None:
+        record.update(CV_EXTRACTOR.extract(text))
+        record.update(pages=pages, chars=len(text), error=None)
+    else:
+        record.update({field.name: None for field in CV_EXTRACTOR.fields})
+        record.update(pages=None, chars=None, error=error)
+    return record
+
+
+def parse_job(job: Job) -> Dict[str, Optional[object]]:
+    """Worker: PDF -> text -> CV fields. Failures become a record with an error."""
+    return parse_task((job, 0, None, 0, 1))
+
+
+def parse_task(task: Task) -> Dict[str, Optional[object]]:
+    """Worker: a whole PDF becomes a record; a page range becomes a chunk of text for the parent to join."""
+    (source, kind, locator), start, stop, chunk, chunks = task
+    try:
+        if kind == "zip":
+            locator = _read_zip_member(*locator)
+        text, pages = pdf_text(locator, start, stop)
+        error = None
+    except Exception as e:
+        text, pages, error = None, None, f"{type(e).__name__}: {e}"
+    if chunks == 1:
+        return _record(source, text, pages, error)
+    return {"source": source, "chunk": chunk, "chunks": chunks, "text": text, "pages": pages, "error": error}
+
+
+def split_job(job: Job, pages_per_chunk: int = PAGES_PER_CHUNK,
+              min_split_bytes: int = MIN_SPLIT_BYTES) -> List[Task]:
+    """One task for a small PDF, one per `pages_per_chunk` pages for a large one."""
+    source, kind, locator = job
+    whole = [(job, 0, None, 0, 1)]
+    try:
+        if kind == "file":
+            size = os.path.getsize(locator)
+        elif kind == "zip":
+            size = _open_archive(locator[0]).getinfo(locator[1]).file_size
+        else:
+            size = len(locator)
+        if pages_per_chunk <= 0 or size < min_split_bytes:
+            return whole
+        doc = _open_pdf(_read_zip_member(*locator) if kind == "zip" else locator)  # reads no page text
+        pages = doc.page_count
+        doc.close()
+    except Exception:
+        return whole  # the worker reports the error
+    starts = range(0, pages, pages_per_chunk)
+    if len(starts) < 2:
+        return whole
+    return [(job, start, start + pages_per_chunk, chunk, len(starts)) for chunk, start in enumerate(starts)]
+
+
+def _join_chunks(chunks: List[dict]) -> Dict[str, Optional[object]]:
+    error = next((chunk["error"] for chunk in chunks if chunk["error"]), None)
+    if error:
+        return _record(chunks[0]["source"], error=error)
+    return _record(chunks[0]["source"], "".join(chunk["text"] for chunk in chunks), chunks[0]["pages"])
+
+
+#? 🔁 Like pool.map, but keeps only a bounded window of tasks in flight and
+#? yields records as soon as they finish (a slow PDF doesn't hold the rest up)
+def parse_parallel(jobs: Iterable[Job], workers: Optional[int] = None, window: Optional[int] = None,
+                   pages_per_chunk: int = PAGES_PER_CHUNK,
+                   min_split_bytes: int = MIN_SPLIT_BYTES) -> Iterator[Dict[str, Optional[object]]]:
+    workers = workers or os.cpu_count() or 1
+    window = window or workers * 4
+    partial: Dict[str, List[Optional[dict]]] = {}  # chunks of split PDFs, until all have arrived
+
+    def finished(result):
+        if "chunk" not in result:
+            return result
+        chunks = partial.setdefault(result["source"], [None] * result["chunks"])
+        chunks[result["chunk"]] = result
+        if any(chunk is None for chunk in chunks):
+            return None
+        del partial[result["source"]]
+        return _join_chunks(chunks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for job in jobs:
+            for task in split_job(job, pages_per_chunk, min_split_bytes):
+                pending.add(pool.submit(parse_task, task))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record = finished(future.result())
+                        if record is not None:
+                            yield record
+        for future in pending:
+            record = finished(future.result())
+            if record is not None:
+                yield record
+
+
+class JsonlSink:
+    """Appends records to a JSON Lines file."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records):
+        self._file.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def record_schema():
+    """Arrow schema of a record, so every part file has the same column types.
+
+    Inferring it per batch would type a column that is None throughout one
+    batch as `null`, and the parts could then not be read back together.
+    """
+    import pyarrow as pa
+
+    return pa.schema([("source", pa.string())]
+                     + [(field.name, pa.string()) for field in CV_EXTRACTOR.fields]
+                     + [("pages", pa.int64()), ("chars", pa.int64()), ("error", pa.string())])
+
+
+class ParquetSink:
+    """Writes each batch as a new part file in a Parquet dataset directory.
+
+    Finished part files are never reopened, so a crashed or interrupted run
+    leaves readable output behind and a resumed run just adds parts
+    (`pandas.read_parquet(directory)` reads them all).
+    """
+
+    def __init__(self, path: Path):
+        self.schema = record_schema()  # also fails early if pyarrow is missing
+        self._dir = path
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._next_part = len(list(self._dir.glob("part-*.parquet")))
+
+    def write(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part = self._dir / f"part-{self._next_part:05d}.parquet"
+        tmp = part.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_pylist(records, schema=self.schema), tmp)
+        os.replace(tmp, part)
+        self._next_part += 1
+
+    def close(self):
+        pass
+
+
+def progress_path(output: Path) -> Path:
+    return output.with_name(output.name + ".progress")
+
+
+def load_progress(output: Path) -> Set[str]:
+    path = progress_path(output)
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def errors_path(output: Path) -> Path:
+    return output.with_name(output.name + ".errors")
+
+
+def ingest(source: str, output: str, workers: Optional[int] = None, batch_size: int = 200,
+           report_every: float = 5.0, pages_per_chunk: int = PAGES_PER_CHUNK,
+           min_split_bytes: int = MIN_SPLIT_BYTES) -> Dict[str, float]:
+    """Parse every PDF in `source` and append its CV fields to `output`.
+
+    Records are written in batches. After every batch the sources it
+    covered are appended to `<output>.progress`, and a re-run skips them,
+    so an interrupted ingestion resumes where it stopped. A batch that was
+    written but not yet marked done is parsed again on resume, so a crash
+    can repeat a record but never loses one. PDFs that fail are not marked
+    done: they are listed in `<output>.errors` and retried by the next run.
+    """
+    output_path = Path(output)
+    sink = ParquetSink(output_path) if output_path.suffix == ".parquet" else JsonlSink(output_path)
+    done = load_progress(output_path)
+    stats = {"skipped": 0, "parsed": 0, "errors": 0, "pages": 0}
+
+    def todo():
+        for job in iter_jobs(source):
+            if job[0] in done:
+                stats["skipped"] += 1
+            else:
+                yield job
+
+    started = last_report = time.perf_counter()
+    batch = []
+    with open(progress_path(output_path), "a", encoding="utf-8") as progress, \
+            open(errors_path(output_path), "w", encoding="utf-8") as errors:
+        def flush():
+            sink.write(batch)
+            progress.writelines(record["source"] + "\n" for record in batch)
+            progress.flush()
+            batch.clear()
+
+        try:
+            for record in parse_parallel(todo(), workers, pages_per_chunk=pages_per_chunk,
+                                         min_split_bytes=min_split_bytes):
+                if record["error"] is not None:
+                    stats["errors"] += 1
+                    errors.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    errors.flush()
+                else:
+                    batch.append(record)
+                    stats["parsed"] += 1
+                    stats["pages"] += record["pages"]
+                if len(batch) >= batch_size:
+                    flush()
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    last_report = now
+                    print(f"📄 {stats['parsed']} CVs ({stats['parsed'] / (now - started):.1f}/s), "
+                          f"{stats['errors']} errors", file=sys.stderr)
+        finally:
+            if batch:
+                flush()
+            sink.close()
+
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-extract CV fields from a directory or archive of PDFs")
+    parser.add_argument("source", help="directory, .zip/.tar(.gz) archive or single PDF")
+    parser.add_argument("-o", "--output", default="cv_records.jsonl",
+                        help="records file: .jsonl, or .parquet for a Parquet dataset directory")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--batch-size", type=int, default=200, help="records written per batch")
+    parser.add_argument("--pages-per-chunk", type=int, default=PAGES_PER_CHUNK,
+                        help="split PDFs over 1 MB into page ranges of this size (0 = never split)")
+    args = parser.parse_args()
+
+    result = ingest(args.source, args.output, args.workers, args.batch_size,
+                    pages_per_chunk=args.pages_per_chunk)
+    print(f"✅ Parsed {result['parsed']} CVs ({result['pages']} pages, {result['errors']} errors) "
+          f"in {result['seconds']}s; skipped {result['skipped']} already done.")
+    if result["errors"]:
+        print(f"❌ Failed PDFs are listed in {errors_path(Path(args.output))} and retried on the next run.")
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import agent_factory
+from instrumentation import tracer_from_env
+from persistence import open_log
+from router import FastPathRouter
+from runtime import AgentRuntime, LimitedModel, TokenBucket, add_runtime_arguments, build_runtime
+from session_store import MemorySessionStore, current_session
+
+Turn = Callable[[str, str], Awaitable[str]]
+Target = Tuple[Turn, Callable[[], Dict]]
+
+
+def _letters(n: int) -> str:
+    # 0 -> "A", 25 -> "Z", 26 -> "Ab": names the extractor accepts as names
+    text = ""
+    while True:
+        n, r = divmod(n, 26)
+        text += chr(ord("a") + r)
+        if not n:
+            return text.capitalize()
+
+
+def user_script(user: int) -> List[str]:
+    """What simulated user `user` types, one message per turn."""
+    return [
+        "Hi, I would like some help with my job application",
+        f"My name is User {_letters(user)}",
+        f"my email is user{user}@example.com",
+        "I know python, sql and docker",
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+#? 🤖 OpenAI Agent SDK target (agent-v3 / runtime.py)
+def sdk_target(args) -> Target:
+    runtime: AgentRuntime = build_runtime(args)
+    model: LimitedModel = runtime.agent.model
+
+    def stats():
+        per_turn = runtime.stats["turn_model_calls"] / runtime.stats["llm_turns"] if runtime.stats["llm_turns"] else 0
+        return {**runtime.stats, "model_calls": model.stats["calls"], "model_calls_per_llm_turn": round(per_turn, 2),
+                "peak_in_flight": model.stats["peak_in_flight"], "rate_wait_ms": model.stats["rate_wait_ms"],
+                "metrics": runtime.tracer.metrics.summary()}
+
+    return runtime.handle, stats
+
+
+#? 🦜 LangChain target (agent-v1 / agent-v2 style ReAct agent, one agent and memory per user)
+def langchain_target(args) -> Target:
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class ToolCounter(BaseCallbackHandler):
+        def __init__(self, counts: Counter):
+            self.counts = counts
+
+        def on_tool_start(self, serialized, input_str, **kwargs):
+            self.counts["tool_calls"] += 1
+
+    llm = agent_factory.make_langchain_llm(args.backend, args.mock_latency, args.mock_tokens_per_s)
+    counts: Counter = Counter()
+    tracer = tracer_from_env()
+    agents: Dict[str, agent_factory.LazyLangChainAgent] = {}
+    slots = asyncio.Semaphore(args.max_concurrent)
+    bucket = TokenBucket(args.rate, args.burst) if args.rate else None
+    router = None if args.no_fast_path else FastPathRouter()
+
+    # LangChain calls the model inside the agent loop, so the limits apply per turn here
+    @contextlib.asynccontextmanager
+    async def model_slot():
+        async with slots:
+            if bucket:
+                await bucket.acquire()
+            yield
+
+    async def turn(session_id: str, message: str) -> str:
+        current_session.set(session_id)
+        started = time.perf_counter()
+        with tracer.span("turn", {"path": "llm"}, session=session_id) as span:
+            try:
+                if session_id not in agents:  # one agent and memory per user, like a v1/v2 session
+                    agents[session_id] = agent_factory.LazyLangChainAgent(lambda: llm, tracer=tracer,
+                                                                          callbacks=[ToolCounter(counts)])
+                # The same turn agent-v1 runs
+                reply = await agents[session_id].aanswer(message, router, span, limit=model_slot)
+                counts["fast_turns" if span.labels["path"] == "fast" else "llm_turns"] += 1
+                return reply
+            except Exception as e:
+                span.set(error=f"{type(e).__name__}: {e}")
+                counts["errors"] += 1
+                return f"❌ Error running agent: {e}"
+            finally:
+                counts["turn_ms"] += round((time.perf_counter() - started) * 1000)
+
+    def stats():
+        return {**counts, "model_calls": getattr(llm, "calls", None), "metrics": tracer.metrics.summary()}
+
+    return turn, stats
+
+
+async def simulate(turn: Turn, users: int, think: float) -> Dict:
+    latencies: List[float] = []
+    completed = 0
+
+    async def user(n: int):
+        nonlocal completed
+        for message in user_script(n):
+            started = time.perf_counter()
+            reply = await turn(f"user-{n}", message)
+            latencies.append(time.perf_counter() - started)
+            if "you're ready" in reply.lower():
+                completed += 1
+            if think:
+                await asyncio.sleep(think)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(users)))
+    elapsed = time.perf_counter() - started
+    return {
+        "users": users,
+        "turns": len(latencies),
+        "completed_applications": completed,
+        "seconds": round(elapsed, 3),
+        "turns_per_s": round(len(latencies) / elapsed, 2),
+        "latency_ms": {f"p{q}": round(percentile(latencies, q) * 1000, 1) for q in (50, 90, 99)} |
+                      {"max": round(max(latencies) * 1000, 1)},
+    }
+
+
+TARGETS = {"sdk": sdk_target, "langchain": langchain_target}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive simulated users through the job assistant agents")
+    parser.add_argument("--agent", choices=list(TARGETS), nargs="+", default=["sdk"],
+                        help="sdk = agent-v3/runtime.py, langchain = agent-v1/v2")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--think", type=float, default=0.0, help="seconds a user waits between messages")
+    parser.add_argument("--json", help="write the results to this file")
+    add_runtime_arguments(parser)
+    parser.set_defaults(backend="mock")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.agent:
+            # Fresh sessions and a throwaway application log for every target
+            agent_factory.configure(store=MemorySessionStore(),
+                                    log=open_log(str(Path(tmp) / f"{name}.jsonl")))
+            turn, stats = TARGETS[name](args)
+            result = asyncio.run(simulate(turn, args.users, args.think))
+            result.update(stats())
+            results[name] = result
+            latency = result["latency_ms"]
+            print(f"{name:<10} {result['turns']} turns in {result['seconds']}s = {result['turns_per_s']} turns/s | "
+                  f"p50 {latency['p50']}ms p90 {latency['p90']}ms p99 {latency['p99']}ms | "
+                  f"model calls {result['model_calls']}"
+                  f"{' (%s per LLM turn)' % result['model_calls_per_llm_turn'] if 'model_calls_per_llm_turn' in result else ''}, "
+                  f"tool calls {result.get('tool_calls', 0)}, "
+                  f"fast turns {result.get('fast_turns', 0)}, errors {result.get('errors', 0)}, "
+                  f"completed {result['completed_applications']}/{args.users}")
+            agent_factory.get_log().close()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+    sys.exit(1 if any(r.get("errors") for r in results.values()) else 0)
@@ -0,0 +1,184 @@
+#? 🧪 Deterministic local stand-ins for Gemini, for load tests and offline runs.
+#? ScriptedModel plugs into the OpenAI Agent SDK (agent-v3, runtime.py) and
+#? ScriptedLLM into LangChain (agent-v1/v2). Both answer every user turn by
+#? calling the tools in `script` in order, passing each the user's message, and
+#? then reply with the last tool output, like the real agents usually do.
+#? With parallel tool calls enabled, ScriptedModel makes all its calls in one step.
+#? Latency = a fixed delay per call + output length / token rate.
+import asyncio
+import itertools
+import json
+import re
+import time
+from typing import Any, List, Optional, Sequence
+
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+
+DEFAULT_SCRIPT = ("extract_application_info", "check_application_goal")
+# Agent SDK script: tools the agent doesn't have are skipped, so this drives both AGENT_TOOLS modes
+SDK_SCRIPT = ("extract_and_check_application",) + DEFAULT_SCRIPT
+FALLBACK_REPLY = "Thanks! Please tell me your name, email, and skills."
+
+
+def _tokens(text: str) -> List[str]:
+    # Roughly one token per word, keeping the spaces so the pieces join back up
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+def simulated_seconds(latency: float, tokens_per_s: float, output: str) -> float:
+    return latency + (len(_tokens(output)) / tokens_per_s if tokens_per_s else 0.0)
+
+
+#? 🤖 OpenAI Agent SDK ---------------------------------------------------------
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _tool_arguments(tool, message: str) -> str:
+    """Every string parameter of the tool gets the user's message."""
+    properties = getattr(tool, "params_json_schema", {}).get("properties", {})
+    return json.dumps({name: message for name, spec in properties.items() if spec.get("type", "string") == "string"})
+
+
+class ScriptedModel(Model):
+    """Agent SDK model that calls the `script` tools the agent has, then answers."""
+
+    supports_parallel_tool_calls = True  # see agent_factory.supports_parallel_tool_calls
+
+    def __init__(self, script: Sequence[str] = SDK_SCRIPT, latency: float = 0.5,
+                 tokens_per_s: float = 80.0, final_reply: Optional[str] = None):
+        self.script = tuple(script)
+        self.latency = latency
+        self.tokens_per_s = tokens_per_s
+        self.final_reply = final_reply
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    def _next_output(self, input, tools, parallel: bool = False) -> list:
+        """Decide the next step from the conversation so far."""
+        items = [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+        last_user = max((i for i, item in enumerate(items) if item.get("role") == "user"), default=-1)
+        message = _text(items[last_user]["content"]) if last_user >= 0 else ""
+        outputs = [item.get("output", "") for item in items[last_user + 1:]
+                   if item.get("type") == "function_call_output"]
+
+        available = {tool.name: tool for tool in tools}
+        pending = [name for name in self.script if name in available][len(outputs):]
+        if pending:
+            calls = []
+            for name in pending if parallel else pending[:1]:
+                call_id = f"call_{next(self._ids)}"
+                calls.append(ResponseFunctionToolCall(
+                    type="function_call", id=call_id, call_id=call_id, name=name,
+                    arguments=_tool_arguments(available[name], message), status="completed"))
+            return calls
+        text = self.final_reply or (str(outputs[-1]) if outputs else FALLBACK_REPLY)
+        return [ResponseOutputMessage(id=f"msg_{next(self._ids)}", type="message", role="assistant",
+                                      status="completed",
+                                      content=[ResponseOutputText(type="output_text", text=text, annotations=[])])]
+
+    @staticmethod
+    def _output_text(items) -> str:
+        return " ".join(item.arguments if isinstance(item, ResponseFunctionToolCall) else item.content[0].text
+                        for item in items)
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                           tracing, *, previous_response_id=None):
+        self.calls += 1
+        items = self._next_output(input, tools, bool(model_settings.parallel_tool_calls))
+        text = self._output_text(items)
+        await asyncio.sleep(simulated_seconds(self.latency, self.tokens_per_s, text))
+        tokens = len(_tokens(text))
+        return ModelResponse(output=items, usage=Usage(requests=1, output_tokens=tokens, total_tokens=tokens),
+                             response_id=None)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                              tracing, *, previous_response_id=None):
+        self.calls += 1
+        items = self._next_output(input, tools, bool(model_settings.parallel_tool_calls))
+        text = self._output_text(items)
+        pieces = _tokens(text)
+        await asyncio.sleep(self.latency)
+        item = items[0]
+        if isinstance(item, ResponseOutputMessage):
+            for piece in pieces:
+                if self.tokens_per_s:
+                    await asyncio.sleep(1 / self.tokens_per_s)
+                yield ResponseTextDeltaEvent.model_construct(type="response.output_text.delta", item_id=item.id,
+                                                             output_index=0, content_index=0, delta=piece)
+        elif self.tokens_per_s:
+            await asyncio.sleep(len(pieces) / self.tokens_per_s)
+        # model_construct: the runner only reads output, usage and id from the final event
+        response = Response.model_construct(
+            id=None, object="response", created_at=time.time(), model="mock", status="completed", output=items,
+            usage=ResponseUsage.model_construct(input_tokens=0, output_tokens=len(pieces), total_tokens=len(pieces)))
+        yield ResponseCompletedEvent.model_construct(type="response.completed", response=response)
+
+
+#? 🦜 LangChain ----------------------------------------------------------------
+
+try:
+    from langchain_core.language_models.llms import LLM
+except ImportError:  # LangChain isn't needed for the Agent SDK side
+    LLM = None
+
+# Markers of the CHAT_CONVERSATIONAL_REACT_DESCRIPTION prompt
+_INPUT_MARKER = "NOTHING else):"
+_TOOL_RESPONSE = re.compile(r"TOOL RESPONSE:\s*-+\s*(.*?)\s*USER'S INPUT", re.S)
+
+
+if LLM is not None:
+    class ScriptedLLM(LLM):
+        """LangChain LLM that drives a conversational ReAct agent through `script`.
+
+        It reads the user's input and the tool responses so far from the
+        agent's prompt and answers with the JSON action blob that agent
+        type expects: the next tool in the script, then a Final Answer
+        with the last tool response.
+        """
+
+        script: Sequence[str] = DEFAULT_SCRIPT
+        latency: float = 0.5
+        tokens_per_s: float = 80.0
+        calls: int = 0
+
+        @property
+        def _llm_type(self) -> str:
+            return "scripted-mock"
+
+        def _next_action(self, prompt: str) -> dict:
+            start = prompt.rfind(_INPUT_MARKER)
+            if start < 0:
+                return {"action": "Final Answer", "action_input": FALLBACK_REPLY}
+            turn = prompt[start + len(_INPUT_MARKER):]
+            message = re.split(r"\n(?:AI|Human|System):", turn, maxsplit=1)[0].strip()
+            observations = _TOOL_RESPONSE.findall(turn)
+            if len(observations) < len(self.script):
+                return {"action": self.script[len(observations)], "action_input": message}
+            return {"action": "Final Answer", "action_input": observations[-1] if observations else FALLBACK_REPLY}
+
+        def _call(self, prompt: str, stop=None, run_manager=None, **kwargs) -> str:
+            self.calls += 1
+            output = "```json\n" + json.dumps(self._next_action(prompt)) + "\n```"
+            time.sleep(simulated_seconds(self.latency, self.tokens_per_s, output))
+            return output
+
+        async def _acall(self, prompt: str, stop=None, run_manager=None, **kwargs) -> str:
+            self.calls += 1
+            output = "```json\n" + json.dumps(self._next_action(prompt)) + "\n```"
+            await asyncio.sleep(simulated_seconds(self.latency, self.tokens_per_s, output))
+            return output
@@ -0,0 +1,238 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def atomic_write_json(path: str, data) -> None:
+    """Write JSON so that `path` always holds either the old or the new file.
+
+    The data goes to a temporary file in the same directory, is fsynced,
+    and then renamed over `path` (a rename is atomic on POSIX and Windows).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ApplicationLog(ABC):
+    """Write-behind, append-only log of application_info updates.
+
+    `append()` only puts the record on a queue and returns; a background
+    thread writes everything queued as one batch every `flush_interval`
+    seconds (or as soon as `max_batch` records are waiting), with a single
+    fsync per batch. Nothing is rewritten, so sessions never overwrite each
+    other: the newest record per session wins when reading back, and
+    `snapshot()` writes that view atomically to a JSON file.
+
+    A batch that fails to write is logged and tried again with the next
+    one, up to `max_retries` times; after that it is dropped (counted in
+    `stats["failed"]`) so the flusher keeps going.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_batch: int = 1000, max_retries: int = 3):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.latest: Dict[str, dict] = self._load_latest()
+        self.stats = {"appended": 0, "written": 0, "batches": 0, "failed": 0, "errors": 0}
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._flushed = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="application-log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, session_id: str, info: dict) -> None:
+        record = {"session": session_id, "ts": time.time(), **info}
+        with self._flushed:
+            self.latest[session_id] = record
+            self.stats["appended"] += 1
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Wait (at most `timeout` seconds; None: no limit) until everything appended
+        so far was written or given up on; True if it all reached the disk."""
+        with self._flushed:
+            target, failed = self.stats["appended"], self.stats["failed"]
+            done = self._flushed.wait_for(
+                lambda: self.stats["written"] + self.stats["failed"] >= target, timeout)
+            return done and self.stats["failed"] == failed
+
+    def records(self) -> Dict[str, dict]:
+        """The latest record of every session, including ones not yet written."""
+        with self._flushed:
+            return dict(self.latest)
+
+    def snapshot(self, path: str) -> None:
+        """Atomically write the latest record of every session to `path`."""
+        atomic_write_json(path, self.records())
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            self._open_storage()
+        except Exception:  # every write fails and is logged below; the thread must stay up for flush()
+            logger.exception("application log: could not open the storage")
+        stop = False
+        retry: List[dict] = []
+        attempts = 0
+        while not stop:
+            batch: List[dict] = retry
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            if not batch:
+                continue
+            try:
+                self._write_batch(batch)
+            except Exception:
+                attempts += 1
+                logger.exception("application log: writing %d records failed (attempt %d of %d)",
+                                 len(batch), attempts, self.max_retries + 1)
+                with self._flushed:
+                    self.stats["errors"] += 1
+                    if attempts <= self.max_retries and not stop:
+                        retry = batch
+                        continue
+                    self.stats["failed"] += len(batch)
+                    self._flushed.notify_all()
+            else:
+                with self._flushed:
+                    self.stats["written"] += len(batch)
+                    self.stats["batches"] += 1
+                    self._flushed.notify_all()
+            retry, attempts = [], 0
+        try:
+            self._close_storage()
+        except Exception:
+            logger.exception("application log: could not close the storage")
+
+    #? Storage hooks, implemented by the backends below
+    def _load_latest(self) -> Dict[str, dict]:
+        return {}
+
+    def _open_storage(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write_batch(self, batch: List[dict]) -> None:
+        """Append `batch` durably; raising means nothing of it may count as written."""
+
+    def _close_storage(self) -> None:
+        pass
+
+
+class JsonlApplicationLog(ApplicationLog):
+    """One JSON object per line, appended to `path`."""
+
+    def __init__(self, path: str = "application_log.jsonl", **options):
+        self.path = path
+        super().__init__(**options)
+
+    def _load_latest(self) -> Dict[str, dict]:
+        latest = {}
+        if not os.path.exists(self.path):
+            return latest
+        complete = 0  # bytes up to the end of the last whole line
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                complete += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:  # garbage from a crash in the middle of the file
+                    continue
+                latest[record["session"]] = record
+        if complete < os.path.getsize(self.path):
+            # A write cut short by a crash: cut it off, or the next record would be appended to it
+            logger.warning("application log: dropping a partial last line in %s", self.path)
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        return latest
+
+    def _open_storage(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close_storage(self) -> None:
+        self._file.close()
+
+
+class SQLiteApplicationLog(ApplicationLog):
+    """Rows in a SQLite database in WAL mode; one transaction per batch."""
+
+    def __init__(self, path: str = "applications.db", **options):
+        self.path = path
+        super().__init__(**options)
+
+    def _load_latest(self) -> Dict[str, dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT data FROM application_log WHERE id IN "
+                                "(SELECT MAX(id) FROM application_log GROUP BY session)").fetchall()
+        finally:
+            conn.close()
+        return {record["session"]: record for record in (json.loads(row[0]) for row in rows)}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS application_log ("
+                     "id INTEGER PRIMARY KEY AUTOINCREMENT, session TEXT NOT NULL, ts REAL NOT NULL, data TEXT NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS application_log_session ON application_log (session)")
+        return conn
+
+    def _open_storage(self) -> None:
+        self._conn = self._connect()  # used only by the flusher thread
+
+    def _write_batch(self, batch: List[dict]) -> None:
+        with self._conn:
+            self._conn.executemany("INSERT INTO application_log (session, ts, data) VALUES (?, ?, ?)",
+                                   [(r["session"], r["ts"], json.dumps(r, ensure_ascii=False)) for r in batch])
+
+    def _close_storage(self) -> None:
+        self._conn.close()
+
+
+def open_log(url: Optional[str] = None, **options) -> ApplicationLog:
+    """"path/to/log.jsonl" (default application_log.jsonl) or "sqlite:///path/to/applications.db"."""
+    if url and url.startswith("sqlite:///"):
+        return SQLiteApplicationLog(url[len("sqlite:///"):], **options)
+    return JsonlApplicationLog(url or "application_log.jsonl", **options)
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from extraction import CV_EXTRACTOR
+from ingest import pdf_text
+
+
+@dataclass(frozen=True)
+class ParsedResume:
+    digest: str
+    text: str
+    pages: int
+    fields: Dict[str, Optional[str]]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResumeCache:
+    """Parsed resumes keyed by the SHA-256 of the PDF bytes.
+
+    The same file uploaded again, by any session, on any rerun, is parsed
+    only once per process. Entries live in an in-memory LRU of
+    `max_entries`; with `directory` set they are also stored there as JSON,
+    so they survive restarts. Safe to share between Streamlit's session
+    threads: a file that two sessions upload at the same time is still
+    parsed only once.
+    """
+
+    def __init__(self, max_entries: int = 128, directory: Optional[str] = None,
+                 parse: Callable[[bytes], Tuple[str, int]] = pdf_text,
+                 extract: Callable[[str], Dict[str, Optional[str]]] = CV_EXTRACTOR.extract):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.parse = parse
+        self.extract = extract
+        self._entries: "OrderedDict[str, ParsedResume]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._parsing: Dict[str, threading.Lock] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "parsed": 0}
+
+    def get(self, data: bytes) -> ParsedResume:
+        digest = content_hash(data)
+        with self._lock:
+            entry = self._lookup(digest)
+            if entry:
+                return entry
+            key_lock = self._parsing.setdefault(digest, threading.Lock())
+
+        try:
+            with key_lock:
+                with self._lock:  # another thread may have parsed it meanwhile
+                    entry = self._lookup(digest)
+                if entry is None:
+                    entry = self._load(digest)
+                    if entry:
+                        self.stats["disk_hits"] += 1
+                    else:
+                        text, pages = self.parse(data)
+                        entry = ParsedResume(digest, text, pages, self.extract(text))
+                        self.stats["parsed"] += 1
+                        self._store(entry)
+                    with self._lock:
+                        self._remember(entry)
+        finally:
+            with self._lock:
+                self._parsing.pop(digest, None)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, digest: str) -> Optional[ParsedResume]:
+        entry = self._entries.get(digest)
+        if entry:
+            self._entries.move_to_end(digest)
+            self.stats["memory_hits"] += 1
+        return entry
+
+    def _remember(self, entry: ParsedResume) -> None:
+        self._entries[entry.digest] = entry
+        self._entries.move_to_end(entry.digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.json"
+
+    def _load(self, digest: str) -> Optional[ParsedResume]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(digest), encoding="utf-8") as f:
+                return ParsedResume(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _store(self, entry: ParsedResume) -> None:
+        if not self.directory:
+            return
+        # Write to a temp file and rename, so readers never see half a file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(tmp, self._path(entry.digest))
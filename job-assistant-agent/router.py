@@ -0,0 +1,99 @@
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from extraction import CHAT_EXTRACTOR, Extractor
+
+# Words that carry no meaning of their own once the fields are taken out
+# ("hi, my email is ..."); anything else left over means the user said more
+FILLER_WORDS = {
+    "hi", "hello", "hey", "ok", "okay", "sure", "yes", "thanks", "thank", "you", "please", "so",
+    "my", "name", "is", "it's", "its", "i", "am", "i'm", "im", "and", "also", "email", "e-mail",
+    "mail", "address", "contact", "me", "at", "skills", "skill", "are", "include", "know", "can",
+    "use", "here", "the", "a", "an", "of", "as", "with", "full", "called",
+}
+
+# Asking or requesting something ("what's the deadline", "can you ...", "tell me ..."):
+# the model has to answer that, whatever fields came with it
+REQUEST = re.compile(
+    r"\b(?:what|what's|whats|when|where|why|how|who|which)\b"
+    r"|\b(?:can|could|would|will|do|does|did|should|shall) (?:you|i|we)\b"
+    r"|\b(?:tell|show|give|send|remind|help) (?:me|us)\b|\b(?:help|explain)\b",
+    re.IGNORECASE)
+
+# A name after "I am" may not be one ("I am bored"); only the model can tell
+IMPLICIT_NAME_CUE = re.compile(r"\b(?:i am|i'm)\s+$", re.IGNORECASE)
+
+_WORDS = re.compile(r"[a-z][a-z'-]*")
+
+
+@dataclass(frozen=True)
+class Route:
+    fast: bool
+    reason: str
+    fields: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+class FastPathRouter:
+    """Decides whether a chat turn needs the LLM at all.
+
+    The local extractor runs first. When it found at least one field, the
+    message neither asks nor requests anything, a name (if any) came after
+    an explicit cue like "my name is", nothing meaningful follows
+    the last extracted value, and at most `max_leftover_words` meaningful
+    words remain once the extracted values and filler words ("my", "email",
+    "is", ...) are removed, the turn is answered deterministically.
+    Otherwise it goes to the model. `stats` counts how
+    often each path (and each reason) was taken.
+    """
+
+    def __init__(self, extractor: Extractor = CHAT_EXTRACTOR, max_leftover_words: int = 2):
+        self.extractor = extractor
+        self.max_leftover_words = max_leftover_words
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def route(self, text: str) -> Route:
+        route = self._decide(text)
+        with self._lock:
+            self.stats["fast" if route.fast else "llm"] += 1
+            self.stats[f"reason:{route.reason}"] += 1
+        return route
+
+    def _decide(self, text: str) -> Route:
+        found = self.extractor.scan(text)
+        if not found:
+            return Route(False, "no_fields")
+        # An email's local part can hold any word ("what.ever@..."), so leave it out
+        emails = {name: hit for name, hit in found.items() if name == "email"}
+        if "?" in text or REQUEST.search(_without_spans(text, emails)):
+            return Route(False, "question")
+        if "name" in found and IMPLICIT_NAME_CUE.search(text, 0, found["name"][1]):
+            return Route(False, "implicit_name")
+        tail = text[max(end for _, _, end in found.values()):]
+        if self._meaningful(tail):
+            return Route(False, "trailing_text")
+        if len(self._meaningful(_without_spans(text, found))) > self.max_leftover_words:
+            return Route(False, "free_form")
+        return Route(True, "extracted", {name: value for name, (value, _, _) in found.items()})
+
+    @staticmethod
+    def _meaningful(text: str) -> list:
+        return [w for w in _WORDS.findall(text.lower()) if w not in FILLER_WORDS]
+
+    def summary(self) -> str:
+        total = self.stats["fast"] + self.stats["llm"]
+        share = self.stats["fast"] / total if total else 0.0
+        return f"⚡ {self.stats['fast']} fast-path / 🤖 {self.stats['llm']} LLM turns ({share:.0%} skipped the model)"
+
+
+def _without_spans(text: str, found: Dict[str, Tuple[str, int, int]]) -> str:
+    parts, pos = [], 0
+    for _, start, end in sorted(found.values(), key=lambda hit: hit[1]):
+        if start >= pos:
+            parts.append(text[pos:start])
+            pos = end
+    parts.append(text[pos:])
+    return " ".join(parts)
@@ -0,0 +1,296 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import sys
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from agents import Model, Runner, ToolCallItem
+from agents.run import RunConfig
+from dotenv import load_dotenv
+
+import agent_factory
+from agent_factory import build_agent, fast_reply
+from instrumentation import Tracer, instrument_model, serve_prometheus, tool_hooks, tracer_from_env
+from router import FastPathRouter
+from session_store import current_session
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited."""
+        waited = 0.0
+        async with self._lock:  # first come, first served
+            while True:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class LimitedModel(Model):
+    """Wraps a model so every call (not every turn: one turn can make several)
+    holds one of `max_concurrent` slots and one token of the rate limit."""
+
+    def __init__(self, model: Model, max_concurrent: int = 8, bucket: Optional[TokenBucket] = None,
+                 tracer: Optional[Tracer] = None):
+        self.model = model
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.bucket = bucket
+        self.tracer = tracer
+        self.stats: Counter = Counter()
+        self.in_flight = 0
+
+    async def _enter(self):
+        started = time.perf_counter()
+        await self.slots.acquire()
+        if self.bucket:
+            self.stats["rate_wait_ms"] += round(await self.bucket.acquire() * 1000)
+        if self.tracer:
+            self.tracer.record("model_slot_wait", time.perf_counter() - started)
+        self.stats["calls"] += 1
+        self.in_flight += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+
+    def _exit(self):
+        self.in_flight -= 1
+        self.slots.release()
+
+    async def get_response(self, *args, **kwargs):
+        await self._enter()
+        try:
+            return await self.model.get_response(*args, **kwargs)
+        finally:
+            self._exit()
+
+    async def stream_response(self, *args, **kwargs):
+        await self._enter()
+        try:
+            async for event in self.model.stream_response(*args, **kwargs):
+                yield event
+        finally:
+            self._exit()
+
+
+class AgentRuntime:
+    """Serves many chat sessions at once on one event loop.
+
+    Turns of different sessions run concurrently with the async runner;
+    turns of the same session run one after another, in order. The model
+    calls are capped and rate limited by the LimitedModel the agent uses.
+    """
+
+    def __init__(self, agent, router: Optional[FastPathRouter] = None, max_turns: int = 10,
+                 tracer: Optional[Tracer] = None):
+        self.agent = agent
+        self.router = router
+        self.max_turns = max_turns
+        self.tracer = tracer or Tracer()
+        self.hooks = tool_hooks(self.tracer)
+        self.run_config = RunConfig(tracing_disabled=True)
+        self.stats: Counter = Counter()
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_users: Counter = Counter()
+
+    async def handle(self, session_id: str, message: str) -> str:
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        self._session_users[session_id] += 1
+        async with lock:
+            current_session.set(session_id)  # this task's context only
+            started = time.perf_counter()
+            try:
+                with self.tracer.span("turn", {"path": "llm"}, session=session_id) as turn:
+                    return await self._turn(turn, message)
+            except Exception as e:
+                self.stats["errors"] += 1
+                return f"❌ Error running agent: {e}"
+            finally:
+                self.stats["turn_ms"] += round((time.perf_counter() - started) * 1000)
+                self._session_users[session_id] -= 1
+                if not self._session_users[session_id]:  # nobody else queued: drop the lock
+                    del self._session_users[session_id]
+                    del self._session_locks[session_id]
+
+    async def _turn(self, turn, message: str) -> str:
+        if self.router and self.router.route(message).fast:
+            turn.labels["path"] = "fast"
+            self.stats["fast_turns"] += 1
+            return fast_reply(message)
+        result = await Runner.run(self.agent, message, max_turns=self.max_turns,
+                                  run_config=self.run_config, hooks=self.hooks)
+        turn.set(model_calls=len(result.raw_responses))  # one per sequential model round trip
+        self.stats["llm_turns"] += 1
+        self.stats["turn_model_calls"] += len(result.raw_responses)
+        self.stats["tool_calls"] += sum(isinstance(item, ToolCallItem) for item in result.new_items)
+        return result.final_output
+
+
+def _one_line(text: str) -> str:
+    return " ".join(str(text).splitlines())
+
+
+#? 🔌 Socket mode: one session per connection, one message per line
+MAX_LINE_BYTES = 64 * 1024
+GREETING = "Hi! I'm your job application assistant. Please tell me your name, email, and skills."
+#? 🔑 Socket sessions are named by an unguessable token: knowing it is what lets a client resume one
+SOCKET_SESSION = re.compile(r"sock-[A-Za-z0-9_-]{22}")
+
+
+def new_socket_session() -> str:
+    return f"sock-{secrets.token_urlsafe(16)}"
+
+
+def socket_client(runtime: AgentRuntime):
+    """The connection handler for asyncio.start_server(..., limit=MAX_LINE_BYTES).
+
+    Only whole lines are messages: a line cut off by the client hanging up
+    is dropped, and one longer than MAX_LINE_BYTES ends the connection with
+    an error. A client that disconnects, even in the middle of a turn, only
+    ends its own connection; the turn still finishes and is saved.
+
+    Every connection starts a new session whose token is sent with the
+    greeting; "/session <token>" switches to an earlier socket session.
+    Only tokens of that form are accepted, so a client can't pick another
+    client's session, or one from stdin mode, by name.
+    """
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session_id = new_socket_session()
+        try:
+            writer.write(f"{GREETING} 🔑 To continue later, reconnect and send: /session {session_id}\n".encode())
+            await writer.drain()
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:  # EOF, possibly in the middle of a line
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(f"❌ Message longer than {MAX_LINE_BYTES} bytes; closing.\n".encode())
+                    await writer.drain()
+                    break
+                message = line.decode(errors="replace").strip()
+                if message.startswith("/session "):  # resume an earlier session
+                    token = message.split(maxsplit=1)[1]
+                    if SOCKET_SESSION.fullmatch(token):
+                        session_id = token
+                        reply = "✅ Session resumed."
+                    else:
+                        reply = "❌ Unknown session token."
+                    writer.write((reply + "\n").encode())
+                    await writer.drain()
+                    continue
+                if message:
+                    writer.write((_one_line(await runtime.handle(session_id, message)) + "\n").encode())
+                    await writer.drain()
+        except ConnectionError:  # reset or broken pipe: the client is gone
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    return client
+
+
+async def serve_socket(runtime: AgentRuntime, host: str, port: int):
+    server = await asyncio.start_server(socket_client(runtime), host, port, limit=MAX_LINE_BYTES)
+    print(f"🔌 Listening on {host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+#? 🧪 Stdin mode: "session<TAB>message" lines in, "session<TAB>reply" lines out.
+#? Every line becomes its own task, so many sessions run at once.
+async def serve_stdin(runtime: AgentRuntime):
+    loop = asyncio.get_running_loop()
+    tasks = set()
+
+    async def answer(session_id: str, message: str):
+        reply = await runtime.handle(session_id, message)
+        sys.stdout.write(f"{session_id}\t{_one_line(reply)}\n")
+        sys.stdout.flush()
+
+    while line := await loop.run_in_executor(None, sys.stdin.readline):
+        session_id, _, message = line.rstrip("\n").partition("\t")
+        if message:
+            task = asyncio.create_task(answer(session_id, message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+
+
+def build_runtime(args, model: Optional[Model] = None, tracer: Optional[Tracer] = None) -> AgentRuntime:
+    bucket = TokenBucket(args.rate, args.burst) if args.rate else None
+    model = model or agent_factory.make_model(args.backend, args.mock_latency, args.mock_tokens_per_s)
+    tracer = tracer or tracer_from_env()
+    #? ⏱️ Timed inside the limiter, so model latency excludes the wait for a slot (traced separately)
+    limited = LimitedModel(instrument_model(model, tracer), args.max_concurrent, bucket, tracer)
+    return AgentRuntime(build_agent(limited), FastPathRouter() if not args.no_fast_path else None,
+                        tracer=tracer)
+
+
+def add_runtime_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--backend", choices=["gemini", "mock"], default=None,
+                        help="model backend (default: MODEL_BACKEND or gemini)")
+    parser.add_argument("--mock-latency", type=float, default=None, help="mock backend: seconds per model call")
+    parser.add_argument("--mock-tokens-per-s", type=float, default=None, help="mock backend: output token rate")
+    parser.add_argument("--max-concurrent", type=int, default=8, help="model calls in flight at once")
+    parser.add_argument("--rate", type=float, default=0, help="model calls per second (0 = unlimited)")
+    parser.add_argument("--burst", type=float, default=None, help="calls allowed in a burst (default: rate)")
+    parser.add_argument("--no-fast-path", action="store_true", help="send every turn to the model")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "0")),
+                        help="serve Prometheus metrics on this port (default: METRICS_PORT, 0 = off)")
+
+
+def report(runtime: AgentRuntime):
+    stats = {**runtime.stats, **getattr(runtime.agent.model, "stats", {})}
+    if runtime.stats["llm_turns"]:
+        stats["model_calls_per_llm_turn"] = round(runtime.stats["turn_model_calls"] / runtime.stats["llm_turns"], 2)
+    print("📊 " + ", ".join(f"{k}={v}" for k, v in sorted(stats.items())), file=sys.stderr)
+    print("⏱️ " + json.dumps(runtime.tracer.metrics.summary()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Serve the job application assistant to many sessions at once")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--socket", metavar="HOST:PORT", help="accept line-based TCP connections")
+    mode.add_argument("--stdin", action="store_true", help="read 'session<TAB>message' lines from stdin")
+    add_runtime_arguments(parser)
+    args = parser.parse_args()
+
+    runtime = build_runtime(args)
+    metrics_server = serve_prometheus(runtime.tracer.metrics, args.metrics_port) if args.metrics_port else None
+    try:
+        if args.socket:
+            host, _, port = args.socket.rpartition(":")
+            asyncio.run(serve_socket(runtime, host or "127.0.0.1", int(port)))
+        else:
+            asyncio.run(serve_stdin(runtime))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if metrics_server:
+            metrics_server.shutdown()
+        report(runtime)
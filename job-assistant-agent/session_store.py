@@ -0,0 +1,185 @@
+import contextvars
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+#? 🧵 Session the current turn belongs to. Tools called by an agent read it,
+#? so one agent/tool set can serve many users without passing ids around.
+current_session: contextvars.ContextVar[str] = contextvars.ContextVar("current_session")
+
+
+def new_application_info() -> Dict[str, Optional[str]]:
+    return {"name": None, "email": None, "skills": None}
+
+
+class SessionStore(ABC):
+    """Application info per session id.
+
+    `session(id)` is the way to change it: it holds that session's lock,
+    yields its dict and saves it back when the block ends, so concurrent
+    turns of one session never lose each other's updates while different
+    sessions don't wait on each other. Sessions not touched for `idle_ttl`
+    seconds are evicted, checked at most every `sweep_every` seconds.
+    """
+
+    def __init__(self, idle_ttl: float = 3600.0, sweep_every: float = 60.0,
+                 default: Callable[[], dict] = new_application_info, clock: Callable[[], float] = time.time):
+        self.idle_ttl = idle_ttl
+        self.sweep_every = sweep_every
+        self.default = default
+        self.clock = clock
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._last_sweep = clock()
+
+    @abstractmethod
+    def load(self, session_id: str) -> dict:
+        """Snapshot of the session's data (a fresh default if it is new)."""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget the session and its data."""
+
+    @abstractmethod
+    def evict_idle(self) -> int:
+        """Drop sessions idle for longer than `idle_ttl`; returns how many."""
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[dict]:
+        self._maybe_sweep()
+        with self._lock_for(session_id):
+            with self._transaction(session_id) as data:
+                yield data
+
+    @abstractmethod
+    def _transaction(self, session_id: str):
+        """Context manager yielding the session's dict and saving it back when the block ends."""
+
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(session_id, threading.Lock())
+
+    def _forget_lock(self, session_id: str) -> None:
+        with self._locks_guard:
+            self._locks.pop(session_id, None)
+
+    def _maybe_sweep(self) -> None:
+        now = self.clock()
+        if now - self._last_sweep >= self.sweep_every:
+            self._last_sweep = now
+            self.evict_idle()
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions in a dict: fastest, but lost on restart and private to one process."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._data: Dict[str, dict] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._guard = threading.Lock()
+
+    def load(self, session_id: str) -> dict:
+        with self._guard:
+            data = self._data.get(session_id)
+            return dict(data) if data is not None else self.default()
+
+    def delete(self, session_id: str) -> None:
+        with self._guard:
+            self._data.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+        self._forget_lock(session_id)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def evict_idle(self) -> int:
+        cutoff = self.clock() - self.idle_ttl
+        with self._guard:
+            idle = [sid for sid, seen in self._last_seen.items() if seen < cutoff]
+        for session_id in idle:
+            self.delete(session_id)
+        return len(idle)
+
+    @contextmanager
+    def _transaction(self, session_id: str):
+        data = self.load(session_id)
+        yield data
+        with self._guard:
+            self._data[session_id] = data
+            self._last_seen[session_id] = self.clock()
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a local SQLite file, shared by every process on the machine.
+
+    Each thread gets its own connection; WAL mode lets readers run while a
+    turn writes, and `BEGIN IMMEDIATE` makes read-modify-write of a session
+    atomic across processes as well as threads.
+    """
+
+    def __init__(self, path: str = "sessions.db", **options):
+        super().__init__(**options)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                         "id TEXT PRIMARY KEY, data TEXT NOT NULL, last_seen REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id: str) -> dict:
+        row = self._connection().execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else self.default()
+
+    def delete(self, session_id: str) -> None:
+        self._connection().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+        self._forget_lock(session_id)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def evict_idle(self) -> int:
+        cutoff = self.clock() - self.idle_ttl
+        conn = self._connection()
+        idle = [row[0] for row in conn.execute("SELECT id FROM sessions WHERE last_seen < ?", (cutoff,))]
+        conn.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,))
+        for session_id in idle:
+            self._forget_lock(session_id)
+        return len(idle)
+
+    @contextmanager
+    def _transaction(self, session_id: str):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            data = self.load(session_id)
+            yield data
+            conn.execute("INSERT INTO sessions (id, data, last_seen) VALUES (?, ?, ?) "
+                         "ON CONFLICT(id) DO UPDATE SET data = excluded.data, last_seen = excluded.last_seen",
+                         (session_id, json.dumps(data), self.clock()))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def open_store(url: Optional[str] = None, **options) -> SessionStore:
+    """"memory" (default) or "sqlite:///path/to/sessions.db"."""
+    if not url or url == "memory":
+        return MemorySessionStore(**options)
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):], **options)
+    raise ValueError(f"Unknown session store {url!r}; use 'memory' or 'sqlite:///path'")
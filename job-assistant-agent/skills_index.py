@@ -0,0 +1,489 @@
+#? 🧭 Skill taxonomy matcher and inverted candidate index.
+#? The skills field is free text ("Python3, k8s and some ML"). SkillTaxonomy maps it to canonical
+#? skills ("python", "kubernetes", "machine learning") in one pass with an Aho-Corasick automaton
+#? over every skill name and alias, however many there are. SkillIndex keeps skill -> candidates
+#? posting sets, so "knows python and docker" is a set intersection instead of a scan of every record.
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import threading
+from collections import Counter, deque
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+#? 📚 Built-in taxonomy: canonical skill -> aliases (all matched case-insensitively, on word boundaries).
+#? Load a bigger one with SKILL_TAXONOMY / load_taxonomy(); see the README for the file format.
+DEFAULT_SKILLS: Dict[str, Tuple[str, ...]] = {
+    "python": ("python3", "python 3", "py", "cpython"),
+    "java": ("java 8", "java 11", "java 17", "core java"),
+    "javascript": ("js", "ecmascript", "es6", "vanilla js"),
+    "typescript": ("ts",),
+    "c": ("c language", "ansi c"),
+    "c++": ("cpp", "cplusplus", "c plus plus"),
+    "c#": ("csharp", "c sharp"),
+    "go": ("golang",),
+    "rust": ("rust lang", "rustlang"),
+    "ruby": (),
+    "php": (),
+    "kotlin": (),
+    "swift": (),
+    "scala": (),
+    "r": ("r language", "rstats", "r programming"),
+    "matlab": (),
+    "bash": ("shell scripting", "shell", "bash scripting"),
+    "powershell": (),
+    "perl": (),
+    "haskell": (),
+    "elixir": (),
+    "dart": (),
+    "sql": ("structured query language",),
+    "postgresql": ("postgres", "psql", "postgre"),
+    "mysql": (),
+    "mariadb": (),
+    "sqlite": (),
+    "oracle database": ("oracle db", "oracle"),
+    "sql server": ("mssql", "ms sql", "microsoft sql server"),
+    "mongodb": ("mongo",),
+    "redis": (),
+    "cassandra": (),
+    "elasticsearch": ("elastic search", "elk", "opensearch"),
+    "dynamodb": ("dynamo db",),
+    "html": ("html5",),
+    "css": ("css3",),
+    "sass": ("scss",),
+    "react": ("reactjs", "react.js", "react js"),
+    "react native": (),
+    "angular": ("angularjs", "angular.js"),
+    "vue": ("vuejs", "vue.js", "vue js"),
+    "svelte": (),
+    "next.js": ("nextjs", "next js"),
+    "node.js": ("nodejs", "node js", "node"),
+    "express": ("expressjs", "express.js"),
+    "django": ("django rest framework", "drf"),
+    "flask": (),
+    "fastapi": ("fast api",),
+    "spring": ("spring boot", "springboot", "spring framework"),
+    "ruby on rails": ("rails", "ror"),
+    "laravel": (),
+    ".net": ("dotnet", "asp.net", ".net core", "dot net"),
+    "graphql": (),
+    "rest api": ("restful", "rest apis", "restful apis"),
+    "grpc": (),
+    "docker": ("containers", "docker compose", "docker-compose"),
+    "kubernetes": ("k8s", "kube"),
+    "helm": ("helm charts",),
+    "terraform": ("iac", "infrastructure as code"),
+    "ansible": (),
+    "aws": ("amazon web services", "ec2", "s3", "lambda", "aws lambda"),
+    "azure": ("microsoft azure",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "linux": ("unix", "ubuntu", "debian", "centos", "red hat", "rhel"),
+    "git": ("github", "gitlab", "bitbucket", "version control"),
+    "ci/cd": ("ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"),
+    "jenkins": (),
+    "github actions": (),
+    "gitlab ci": ("gitlab ci/cd",),
+    "circleci": ("circle ci",),
+    "devops": (),
+    "microservices": ("micro services", "microservice architecture"),
+    "kafka": ("apache kafka",),
+    "rabbitmq": ("rabbit mq",),
+    "spark": ("apache spark", "pyspark"),
+    "hadoop": ("hdfs", "mapreduce"),
+    "airflow": ("apache airflow",),
+    "dbt": (),
+    "snowflake": (),
+    "bigquery": ("big query",),
+    "tableau": (),
+    "power bi": ("powerbi",),
+    "excel": ("microsoft excel", "ms excel", "spreadsheets"),
+    "pandas": (),
+    "numpy": (),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "tensorflow": (),
+    "keras": (),
+    "pytorch": ("torch",),
+    "machine learning": ("ml",),
+    "deep learning": ("neural networks",),
+    "natural language processing": ("nlp",),
+    "computer vision": ("opencv", "image processing"),
+    "large language models": ("llm", "llms", "generative ai", "genai", "gen ai"),
+    "langchain": ("lang chain",),
+    "data analysis": ("data analytics", "analytics"),
+    "data science": (),
+    "data engineering": ("etl", "elt", "data pipelines"),
+    "statistics": ("statistical analysis", "stats"),
+    "selenium": (),
+    "pytest": (),
+    "software testing": ("testing", "qa", "quality assurance"),
+    "unit testing": ("tdd", "test driven development"),
+    "agile": ("scrum", "kanban"),
+    "jira": (),
+    "figma": (),
+    "ui/ux": ("ui ux", "ux design", "ui design", "user experience", "user interface design"),
+    "android": ("android development",),
+    "ios": ("ios development",),
+    "flutter": (),
+    "unity": (),
+    "cybersecurity": ("infosec", "information security", "cyber security"),
+    "networking": ("tcp/ip", "computer networks"),
+    "project management": ("pmp",),
+    "communication": ("communication skills",),
+    "leadership": ("team leadership", "team lead"),
+}
+
+#? 🌳 Skills that are a kind or a tool of a broader one. Both are kept (a Helm user is not
+#? assumed to know all of Kubernetes), but a search for the broader skill finds them too.
+DEFAULT_PARENTS: Dict[str, str] = {
+    "helm": "kubernetes",
+    "keras": "deep learning",
+    "tensorflow": "deep learning",
+    "pytorch": "deep learning",
+    "jenkins": "ci/cd",
+    "github actions": "ci/cd",
+    "gitlab ci": "ci/cd",
+    "circleci": "ci/cd",
+    "mariadb": "mysql",
+    "sass": "css",
+    "unit testing": "software testing",
+    "pytest": "unit testing",
+    "selenium": "software testing",
+}
+
+#? 🗣️ Names that are also everyday words ("I excel at ...", "can go anywhere"). They only count
+#? when written capitalised ("Go", "Excel") or as a whole item of a list ("python, go and rust").
+AMBIGUOUS_NAMES: FrozenSet[str] = frozenset({
+    "go", "excel", "express", "swift", "rust", "spring", "unity", "dart", "shell", "node", "lambda",
+    "oracle", "r", "c", "kube", "stats", "testing", "containers", "analytics",
+})
+# What may come right before / after a whole list item
+_ITEM_START = re.compile(r"(?:^|[,;:/|(&+\n]|\band|\bor|\bin|\bwith)\s*$")
+_ITEM_END = re.compile(r"\s*(?:$|[,;/|)&+.!\n]|and\b|or\b)")
+
+
+def _normalise_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text.lower())
+
+
+def _is_list_item(text: str, start: int, end: int) -> bool:
+    return bool(_ITEM_START.search(text, max(0, start - 6), start)) and bool(_ITEM_END.match(text, end))
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher: finds every occurrence of any pattern in one pass.
+
+    The patterns form a trie; failure links say where to continue when the
+    next character doesn't extend the current match, so the text is read
+    once whatever the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, object]]] = [[]]  # (pattern length, value) ending at a node
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self.alphabet = frozenset(ch for edges in self._goto for ch in edges)
+        self._link()
+
+    def _add(self, pattern: str, value) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(pattern), value))
+
+    def _link(self) -> None:
+        # Breadth first, so every node's failure target is already linked
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Patterns that are suffixes of this one end here too
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """Yield (start, end, value) for every pattern occurrence, overlapping ones included."""
+        goto, fail, out, alphabet = self._goto, self._fail, self._out, self.alphabet
+        node = 0
+        for i, ch in enumerate(text):
+            if ch not in alphabet:  # no pattern contains it: straight back to the root
+                node = 0
+                continue
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i + 1 - length, i + 1, value
+
+
+class SkillTaxonomy:
+    """Canonical skills and their aliases, matched in free text in a single pass.
+
+    `parents` maps a skill to the broader one it belongs to ("helm" ->
+    "kubernetes"); `ambiguous` lists names that are also everyday words and
+    need a capital or a list of their own to count.
+    """
+
+    def __init__(self, skills: Mapping[str, Iterable[str]] = DEFAULT_SKILLS,
+                 parents: Mapping[str, str] = DEFAULT_PARENTS, ambiguous: Iterable[str] = AMBIGUOUS_NAMES):
+        self.skills: Dict[str, Tuple[str, ...]] = {}
+        self._names: Dict[str, str] = {}  # normalised name or alias -> canonical skill
+        for canonical, aliases in skills.items():
+            canonical = _normalise_text(canonical).strip()
+            self.skills[canonical] = tuple(aliases)
+            for name in (canonical, *aliases):
+                self._names.setdefault(_normalise_text(name).strip(), canonical)
+        self.parents = {_normalise_text(child).strip(): _normalise_text(parent).strip()
+                        for child, parent in parents.items()}
+        self._subtree: Dict[str, FrozenSet[str]] = {}  # skill -> itself and every skill below it
+        for child in self.parents:
+            skill, seen = child, set()
+            while skill is not None and skill not in seen:  # a loop in a loaded file stops here
+                seen.add(skill)
+                self._subtree[skill] = self._subtree.get(skill, frozenset({skill})) | {child}
+                skill = self.parents.get(skill)
+        ambiguous = {_normalise_text(name).strip() for name in ambiguous}
+        self._automaton = AhoCorasick((name, (canonical, name in ambiguous))
+                                      for name, canonical in self._names.items())
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def canonical(self, term: str) -> Optional[str]:
+        """The canonical skill for a skill name or alias ("k8s" -> "kubernetes"), or None."""
+        return self._names.get(_normalise_text(term).strip())
+
+    def subtree(self, skill: str) -> FrozenSet[str]:
+        """`skill` and every skill below it ("ci/cd" -> ci/cd, jenkins, github actions, ...)."""
+        return self._subtree.get(skill, frozenset({skill}))
+
+    def normalise(self, text: Optional[str]) -> List[str]:
+        """Canonical skills mentioned in `text`, in order of first mention, without duplicates.
+
+        Only whole words count ("java" is not found in "javascript") and
+        overlapping mentions resolve to the leftmost, then longest, one
+        ("react native" rather than "react"). Ambiguous names also need a
+        capital or to be a list item of their own.
+        """
+        if not text:
+            return []
+        original = re.sub(r"\s+", " ", text)
+        text = original.lower()
+        if len(text) != len(original):  # lowercasing moved the offsets: no capitals to go by
+            original = text
+        end_of_text = len(text)
+        matches = [(start, -(end - start), canonical)
+                   for start, end, (canonical, ambiguous) in self._automaton.iter_matches(text)
+                   if (start == 0 or not text[start - 1].isalnum())
+                   and (end == end_of_text or not text[end].isalnum())
+                   and (not ambiguous or original[start].isupper() or _is_list_item(text, start, end))]
+        found: Dict[str, None] = {}
+        taken_until = 0
+        for start, negative_length, canonical in sorted(matches):
+            if start >= taken_until:
+                found.setdefault(canonical)
+                taken_until = start - negative_length
+        return list(found)
+
+
+def load_taxonomy(path: Optional[str] = None, extend: bool = True) -> SkillTaxonomy:
+    """Taxonomy from a JSON file ({"skill": ["alias", ...]}, or {"skill":
+    {"aliases": [...], "parent": "broader skill"}}) or a text file ("skill:
+    alias, alias" per line); merged into the built-in one unless `extend` is
+    False. No path: the built-in taxonomy."""
+    if not path:
+        return SkillTaxonomy()
+    skills: Dict[str, Tuple[str, ...]] = dict(DEFAULT_SKILLS) if extend else {}
+    parents: Dict[str, str] = dict(DEFAULT_PARENTS) if extend else {}
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            loaded = {}
+            for name, entry in json.load(f).items():
+                if isinstance(entry, dict):
+                    if entry.get("parent"):
+                        parents[name] = entry["parent"]
+                    entry = entry.get("aliases", ())
+                loaded[name] = tuple(entry)
+        else:
+            loaded = {}
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    name, _, aliases = line.partition(":")
+                    loaded[name.strip()] = tuple(a.strip() for a in aliases.split(",") if a.strip())
+    for name, aliases in loaded.items():
+        skills[name] = tuple(dict.fromkeys(skills.get(name, ()) + aliases))
+    return SkillTaxonomy(skills, parents)
+
+
+class SkillIndex:
+    """Inverted index from canonical skill to candidate ids.
+
+    `add()` (re)indexes one candidate from their skills text and can be
+    called again whenever the application changes; the old postings are
+    replaced. Queries take skill names or aliases. Thread-safe.
+    """
+
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None):
+        self.taxonomy = taxonomy or SkillTaxonomy()
+        self._postings: Dict[str, Set[str]] = {}
+        self._skills: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Mapping]], taxonomy: Optional[SkillTaxonomy] = None):
+        """Index (candidate id, application_info) pairs, e.g. ApplicationLog.records().items()."""
+        index = cls(taxonomy)
+        for candidate_id, info in records:
+            index.add(candidate_id, info.get("skills"))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self._skills
+
+    def add(self, candidate_id: str, skills_text: Optional[str]) -> FrozenSet[str]:
+        """Index a candidate's skills (replacing what was indexed before); returns them normalised."""
+        skills = frozenset(self.taxonomy.normalise(skills_text))
+        with self._lock:
+            old = self._skills.get(candidate_id, frozenset())
+            for skill in old - skills:
+                self._discard(skill, candidate_id)
+            for skill in skills - old:
+                self._postings.setdefault(skill, set()).add(candidate_id)
+            self._skills[candidate_id] = skills
+        return skills
+
+    def remove(self, candidate_id: str) -> None:
+        with self._lock:
+            for skill in self._skills.pop(candidate_id, ()):
+                self._discard(skill, candidate_id)
+
+    def _discard(self, skill: str, candidate_id: str) -> None:
+        posting = self._postings[skill]
+        posting.discard(candidate_id)
+        if not posting:
+            del self._postings[skill]
+
+    def skills_of(self, candidate_id: str) -> FrozenSet[str]:
+        return self._skills.get(candidate_id, frozenset())
+
+    def count(self, skill: str) -> int:
+        """Number of candidates with `skill` (or one below it)."""
+        with self._lock:
+            return len(self._posting(self._resolve(skill)))
+
+    def _posting(self, skill: str) -> Set[str]:
+        """Candidates with `skill` or a skill below it; don't modify the result."""
+        subtree = self.taxonomy.subtree(skill)
+        if len(subtree) == 1:
+            return self._postings.get(skill, set())
+        return set().union(*(self._postings.get(s, ()) for s in subtree))
+
+    def _resolve(self, term: str) -> str:
+        return self.taxonomy.canonical(term) or _normalise_text(term).strip()
+
+    def search(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+               none_of: Iterable[str] = ()) -> Set[str]:
+        """Candidates with every skill in `all_of`, at least one in `any_of`
+        (if given) and none in `none_of`; a skill also stands for the ones
+        below it ("ci/cd" finds Jenkins users)."""
+        all_of = [self._resolve(t) for t in all_of]
+        any_of = [self._resolve(t) for t in any_of]
+        none_of = [self._resolve(t) for t in none_of]
+        with self._lock:
+            if all_of:
+                # Smallest posting first: every later intersection is at most that big
+                sets = sorted((self._posting(skill) for skill in all_of), key=len)
+                result = set(sets[0])
+                for posting in sets[1:]:
+                    if not result:
+                        break
+                    result &= posting
+                if any_of:
+                    any_postings = [self._posting(skill) for skill in any_of]
+                    result = {c for c in result if any(c in posting for posting in any_postings)}
+            elif any_of:
+                result = set().union(*(self._posting(skill) for skill in any_of))
+            else:
+                result = set(self._skills)
+            for skill in none_of:
+                result -= self._posting(skill)
+        return result
+
+    def rank(self, skills: Iterable[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """Top `limit` candidates by how many of `skills` they have, rare skills counting more (idf)."""
+        terms = list(dict.fromkeys(self._resolve(t) for t in skills))
+        scores: Counter = Counter()
+        with self._lock:
+            total = len(self._skills)
+            for skill in terms:
+                posting = self._posting(skill)
+                if posting:
+                    weight = math.log(1 + total / len(posting))
+                    for candidate_id in posting:
+                        scores[candidate_id] += weight
+        return [(c, round(s, 4)) for c, s in heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"candidates": len(self._skills), "skills": len(self._postings),
+                    "postings": sum(len(p) for p in self._postings.values())}
+
+
+def read_records(source: str) -> Dict[str, dict]:
+    """Latest application per session from an application log ("*.jsonl" or "sqlite:///*.db")."""
+    from persistence import open_log
+
+    log = open_log(source)
+    try:
+        return log.records()
+    finally:
+        log.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query candidates in an application log by skill")
+    parser.add_argument("source", nargs="?", default=os.getenv("APPLICATION_LOG", "application_log.jsonl"),
+                        help="application log (default: APPLICATION_LOG or application_log.jsonl)")
+    parser.add_argument("--all", nargs="+", default=[], metavar="SKILL", help="must have every one")
+    parser.add_argument("--any", nargs="+", default=[], metavar="SKILL", help="must have at least one")
+    parser.add_argument("--none", nargs="+", default=[], metavar="SKILL", help="must have none")
+    parser.add_argument("--rank", nargs="+", default=[], metavar="SKILL", help="best matches first")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--taxonomy", default=os.getenv("SKILL_TAXONOMY"), help="extra skills/aliases file")
+    args = parser.parse_args()
+
+    records = read_records(args.source)
+    index = SkillIndex.from_records(records.items(), load_taxonomy(args.taxonomy))
+    print(f"🧭 {index.stats()}", file=sys.stderr)
+    if args.rank:
+        for candidate_id, score in index.rank(args.rank, args.limit):
+            print(f"{score:7.3f}  {candidate_id}  {records[candidate_id].get('name')}  "
+                  f"[{', '.join(sorted(index.skills_of(candidate_id)))}]")
+    else:
+        for candidate_id in sorted(index.search(args.all, args.any, args.none))[:args.limit]:
+            print(f"{candidate_id}  {records[candidate_id].get('name')}  "
+                  f"[{', '.join(sorted(index.skills_of(candidate_id)))}]")
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live next to the entry points, not in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF with one page per text and return its path."""
+    fitz = pytest.importorskip("fitz")
+
+    def make(name, *pages):
+        doc = fitz.open()
+        for text in pages:
+            doc.new_page().insert_text((72, 72), text)
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        doc.save(path)
+        doc.close()
+        return path
+
+    return make
+
+
+@pytest.fixture
+def factory(tmp_path, monkeypatch):
+    """agent_factory working on an in-memory session and a log under tmp_path."""
+    import agent_factory
+    from persistence import JsonlApplicationLog
+    from session_store import MemorySessionStore, current_session
+
+    log = JsonlApplicationLog(str(tmp_path / "log.jsonl"), flush_interval=0.01)
+    for name, value in (("_store", MemorySessionStore()), ("_log", log),
+                        ("_snapshot_path", None), ("_skill_index", None)):
+        monkeypatch.setattr(agent_factory, name, value)
+    token = current_session.set("test")
+    yield agent_factory
+    current_session.reset(token)
+    log.close()
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("agents")
+
+
+def run(factory, message, tools):
+    from agents import Runner
+    from mock_llm import ScriptedModel
+
+    agent = factory.build_agent(ScriptedModel(latency=0, tokens_per_s=0), tools=tools)
+    return Runner.run_sync(agent, message)
+
+
+def test_combined_tool_answers_the_user_in_one_model_call(factory):
+    result = run(factory, "my email is jane@example.com", "combined")
+    assert len(result.raw_responses) == 1
+    assert result.final_output == "✅ Email saved. 📝 Could you also share your name and skills?"
+
+
+def test_model_still_reads_the_model_facing_status(factory):
+    update = factory.extract_and_check_application("my email is jane@example.com")
+    assert str(update).endswith("⏳ Still need: name, skills. Please ask the user to provide this.")
+    assert "ask the user" not in update.reply
+
+
+def test_parallel_tool_calls_only_for_providers_that_accept_them(factory):
+    from instrumentation import Tracer, instrument_model
+    from mock_llm import ScriptedModel
+
+    class OtherProvider(ScriptedModel):  # like LitellmModel: not known to accept the flag
+        supports_parallel_tool_calls = False
+
+    other = factory.build_agent(OtherProvider(latency=0, tokens_per_s=0), tools="separate")
+    assert other.model_settings.parallel_tool_calls is None
+    mock = instrument_model(ScriptedModel(latency=0, tokens_per_s=0), Tracer())
+    assert factory.build_agent(mock, tools="separate").model_settings.parallel_tool_calls is True
+    assert factory.build_agent(mock, tools="combined").model_settings.parallel_tool_calls is None
+
+
+def test_separate_tools_save_before_the_status_check(factory):
+    result = run(factory, "my email is jane@example.com", "separate")
+    assert len(result.raw_responses) == 2
+    assert "Still need: name, skills" in result.final_output
@@ -0,0 +1,33 @@
+from chat_history import ChatTranscript
+
+
+def fill(transcript, n):
+    for i in range(n):
+        transcript.append("user" if i % 2 == 0 else "bot", f"message {i}")
+
+
+def test_recent_window_and_older_pages_cover_everything_in_order():
+    transcript = ChatTranscript(window=5, page_size=4, max_pages=None)
+    fill(transcript, 23)
+    assert [text for _, text in transcript.recent()] == [f"message {i}" for i in range(18, 23)]
+    assert transcript.older_count == 18
+    older = []
+    for page in reversed(range(transcript.older_pages)):
+        older += [text for _, text in transcript.older(page)]
+    assert older == [f"message {i}" for i in range(18)]
+
+
+def test_pages_beyond_max_pages_are_dropped_oldest_first():
+    transcript = ChatTranscript(window=2, page_size=3, max_pages=2)
+    fill(transcript, 20)
+    assert transcript.dropped == 12
+    assert len(transcript) == 8
+    oldest_page = transcript.older(transcript.older_pages - 1)
+    assert oldest_page[0] == ("user", "message 12")
+
+
+def test_clear_forgets_everything():
+    transcript = ChatTranscript(window=2, page_size=2)
+    fill(transcript, 9)
+    transcript.clear()
+    assert (len(transcript), transcript.recent(), transcript.older_count) == (0, [], 0)
@@ -0,0 +1,51 @@
+import pytest
+
+from extraction import CHAT_EXTRACTOR, CV_EXTRACTOR
+
+
+@pytest.mark.parametrize("text, email", [
+    ("my email is _test@ex.com", "_test@ex.com"),
+    ("mail: x_y+tag@ex.co.uk", "x_y+tag@ex.co.uk"),
+    ("contact <jane@x.com> please", "jane@x.com"),
+    ("(jane.doe@x.org)", "jane.doe@x.org"),
+    ("-dash@ex.com", "-dash@ex.com"),
+    ("foo@bar", None),
+])
+def test_email_keeps_the_whole_local_part(text, email):
+    assert CHAT_EXTRACTOR.extract(text)["email"] == email
+
+
+def test_email_span_points_at_the_value():
+    text = "reach me at _a.b@ex.com today"
+    value, start, end = CHAT_EXTRACTOR.scan(text)["email"]
+    assert text[start:end] == value == "_a.b@ex.com"
+
+
+def test_chat_fields_in_one_message():
+    found = CHAT_EXTRACTOR.extract("Hi! My name is jane doe and my email is jane@example.com. Skills: Python, SQL")
+    assert found == {"name": "Jane Doe", "email": "jane@example.com", "skills": "Python, SQL"}
+
+
+@pytest.mark.parametrize("text", ["I'm a developer", "call me back later", "my name is not important"])
+def test_a_name_cue_followed_by_a_non_name(text):
+    assert CHAT_EXTRACTOR.extract(text)["name"] is None
+
+
+@pytest.mark.parametrize("text, name", [
+    ("Hi, I am John Smith and my email is john@x.com", "John Smith"),
+    ("i'm jane", "Jane"),
+])
+def test_i_am_still_gives_a_name_to_the_llm_tools(text, name):
+    assert CHAT_EXTRACTOR.extract(text)["name"] == name
+
+
+def test_cv_fields():
+    cv = "Full Name: Jane Doe\nEmail: jane@example.com\nPhone: +1 (555) 123-4567\nSkills: Python,  SQL\n" \
+         "linkedin.com/in/jane-doe"
+    assert CV_EXTRACTOR.extract(cv) == {"name": "Jane Doe", "email": "jane@example.com", "skills": "Python, SQL",
+                                        "phone": "+1 (555) 123-4567", "linkedin": "linkedin.com/in/jane-doe"}
+
+
+def test_extract_many_keeps_the_order():
+    texts = [f"my email is user{i}@example.com" for i in range(5)]
+    assert [r["email"] for r in CHAT_EXTRACTOR.extract_many(texts)] == [f"user{i}@example.com" for i in range(5)]
@@ -0,0 +1,38 @@
+def test_fast_reply_is_worded_for_the_user(factory):
+    reply = factory.fast_reply("my email is jane@example.com")
+    assert reply.startswith("✅ Email saved.")
+    assert "ask the user" not in reply
+    assert "name and skills" in reply
+
+
+def test_application_status_stays_worded_for_the_model(factory):
+    factory.save_application_info("my email is jane@example.com")
+    assert factory.application_status() == "⏳ Still need: name, skills. Please ask the user to provide this."
+
+
+def test_fast_reply_completes_the_application(factory, tmp_path):
+    factory.configure(snapshot_path=str(tmp_path / "application_info.json"))
+    factory.fast_reply("my name is Jane Doe, jane@example.com, skills: Python, SQL")
+    reply = factory.fast_reply("my email is jane@example.com")
+    assert "You're ready!" in reply
+    assert (tmp_path / "application_info.json").exists()
+
+
+def test_fast_reply_can_leave_the_status_to_the_ui(factory):
+    assert factory.fast_reply("my email is jane@example.com", status=False) == "✅ Email saved."
+
+
+def test_configure_only_changes_what_it_is_given(factory, tmp_path):
+    from session_store import MemorySessionStore
+
+    factory.configure(snapshot_path=str(tmp_path / "application_info.json"))
+    store = MemorySessionStore()
+    factory.configure(store=store)
+    assert factory.get_store() is store
+    assert factory._snapshot_path == str(tmp_path / "application_info.json")
+
+
+def test_llm_tools_still_save_a_name_given_with_i_am(factory):
+    text = "Hi, I am John Smith and my email is john@x.com"
+    assert factory.save_application_info(text) == "✅ Name saved. ✅ Email saved. Let me check what else I need."
+    assert factory.get_store().load("test")["name"] == "John Smith"
@@ -0,0 +1,49 @@
+import pytest
+
+from ingest import ingest
+
+
+def test_parquet_parts_share_one_schema(tmp_path, make_pdf):
+    pq = pytest.importorskip("pyarrow.parquet")
+    make_pdf("cvs/a.pdf", "Name: Ali Khan\nSkills: Python")
+    make_pdf("cvs/b.pdf", "Name: Sara Lee\nPhone: +92 300 1234567")
+    output = tmp_path / "records.parquet"
+
+    # One record per part: "phone" is None throughout the first, "skills" throughout the second
+    ingest(str(tmp_path / "cvs"), str(output), workers=1, batch_size=1)
+
+    table = pq.read_table(output)
+    assert sorted(table.column("source").to_pylist()) == ["a.pdf", "b.pdf"]
+    assert table.schema.field("phone").type == "string"
+
+
+def test_large_pdf_is_split_into_page_chunks(tmp_path, make_pdf):
+    from ingest import parse_parallel, split_job
+
+    pdf = make_pdf("long.pdf", "Name: Ali Khan", "Email: ali@example.com", "Skills: Python, SQL")
+    job = ("long.pdf", "file", str(pdf))
+    assert len(split_job(job, pages_per_chunk=1, min_split_bytes=0)) == 3
+    assert len(split_job(job, pages_per_chunk=1)) == 1  # small files stay whole
+
+    [record] = parse_parallel([job], workers=2, pages_per_chunk=1, min_split_bytes=0)
+    assert record["error"] is None and record["pages"] == 3
+    assert (record["name"], record["email"]) == ("Ali Khan", "ali@example.com")
+    assert record["skills"] == "Python, SQL"
+
+
+def test_failed_pdfs_are_retried_on_resume(tmp_path, make_pdf):
+    source = tmp_path / "cvs"
+    make_pdf("cvs/good.pdf", "Name: Ali Khan")
+    broken = source / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    output = tmp_path / "records.jsonl"
+
+    first = ingest(str(source), str(output), workers=1)
+    assert (first["parsed"], first["errors"], first["skipped"]) == (1, 1, 0)
+    assert (tmp_path / "records.jsonl.progress").read_text().split() == ["good.pdf"]
+    assert "broken.pdf" in (tmp_path / "records.jsonl.errors").read_text()
+
+    make_pdf("cvs/broken.pdf", "Name: Sara Lee")  # fixed in place
+    second = ingest(str(source), str(output), workers=1)
+    assert (second["parsed"], second["errors"], second["skipped"]) == (1, 0, 1)
+    assert len(output.read_text().splitlines()) == 2
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from instrumentation import Histogram, JsonlExporter, Metrics, Tracer
+
+
+def test_histogram_quantiles_stay_within_the_seen_values():
+    histogram = Histogram()
+    for ms in range(1, 101):
+        histogram.observe(ms / 1000)
+    assert histogram.count == 100
+    assert 0.040 <= histogram.quantile(0.5) <= 0.060
+    assert histogram.quantile(1.0) == pytest.approx(0.1)
+
+
+def test_nested_spans_feed_metrics_and_the_trace_tree(tmp_path):
+    exporter = JsonlExporter(str(tmp_path / "traces.jsonl"))
+    tracer = Tracer(Metrics("test"), sample_rate=1.0, exporter=exporter)
+    with tracer.span("turn", {"path": "llm"}):
+        with tracer.span("tool", {"tool": "save"}):
+            pass
+        tracer.record("model_call", 0.25)
+    exporter.close()
+
+    trace = json.loads((tmp_path / "traces.jsonl").read_text())
+    assert [child["name"] for child in trace["children"]] == ["tool", "model_call"]
+    summary = tracer.metrics.summary()
+    assert summary['turn_seconds{path="llm"}']["count"] == 1
+    assert 'test_tool_seconds_bucket{tool="save",le="+Inf"} 1' in tracer.metrics.prometheus()
+
+
+def test_failed_turns_are_always_exported():
+    kept = []
+    tracer = Tracer(Metrics(), sample_rate=0.0, exporter=type("Exporter", (), {"export": lambda self, t: kept.append(t)})())
+    with tracer.span("turn"):
+        pass
+    with pytest.raises(ValueError):
+        with tracer.span("turn"):
+            raise ValueError("boom")
+    assert [trace["attributes"]["error"] for trace in kept] == ["ValueError: boom"]
+    assert tracer.metrics.counters[("errors_total", (("span", "turn"),))] == 1
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from router import FastPathRouter
+
+
+def make_agent(factory, **options):
+    from mock_llm import ScriptedLLM
+
+    return factory.LazyLangChainAgent(lambda: ScriptedLLM(latency=0, tokens_per_s=0), **options)
+
+
+def test_fast_turns_skip_the_agent_but_reach_its_memory(factory):
+    agent = make_agent(factory)
+    turn = type("Span", (), {"labels": {}})()
+    reply = agent.answer("my email is jane@example.com", FastPathRouter(), turn)
+    assert turn.labels["path"] == "fast"
+    assert reply.startswith("✅ Email saved.")
+    assert agent._agent is None and agent._pending == [("my email is jane@example.com", reply)]
+
+
+def test_other_turns_go_to_the_agent(factory):
+    agent = make_agent(factory)
+    turn = type("Span", (), {"labels": {}})()
+    agent.answer("Hi, I would like some help with my job application", FastPathRouter(), turn)
+    assert turn.labels["path"] == "llm"
+    assert agent._agent is not None
+
+
+def test_async_turns_run_inside_the_limit(factory):
+    agent, entered = make_agent(factory), []
+
+    class Limit:
+        async def __aenter__(self):
+            entered.append(True)
+
+        async def __aexit__(self, *exc):
+            return False
+
+    asyncio.run(agent.aanswer("I know python and sql, what else do you need", FastPathRouter(), limit=Limit))
+    assert entered == [True]
+    assert factory.get_store().load("test")["skills"]
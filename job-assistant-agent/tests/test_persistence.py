@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from persistence import ApplicationLog, JsonlApplicationLog, SQLiteApplicationLog
+
+
+@pytest.mark.parametrize("backend, name", [(JsonlApplicationLog, "log.jsonl"), (SQLiteApplicationLog, "log.db")])
+def test_latest_record_per_session_survives_a_restart(tmp_path, backend, name):
+    path = str(tmp_path / name)
+    log = backend(path, flush_interval=0.01)
+    log.append("a", {"name": "Ann"})
+    log.append("b", {"name": "Bob"})
+    log.append("a", {"name": "Ann Lee"})
+    assert log.flush()
+    log.close()
+
+    reopened = backend(path, flush_interval=0.01)
+    assert {s: r["name"] for s, r in reopened.records().items()} == {"a": "Ann Lee", "b": "Bob"}
+    reopened.close()
+
+
+def test_a_torn_last_line_is_cut_off_on_open(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text(json.dumps({"session": "a", "name": "Ann"}) + "\n" + '{"session": "b", "na')
+    log = JsonlApplicationLog(str(path), flush_interval=0.01)
+    log.append("c", {"name": "Cy"})
+    assert log.flush()
+    log.close()
+
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["session"] for line in lines] == ["a", "c"]
+
+
+class FlakyLog(ApplicationLog):
+    def __init__(self, failures, **options):
+        self.failures = failures
+        self.written = []
+        super().__init__(**options)
+
+    def _write_batch(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk full")
+        self.written.extend(batch)
+
+
+def test_a_failed_batch_is_retried_and_the_flusher_keeps_going():
+    log = FlakyLog(failures=1, flush_interval=0.01)
+    log.append("a", {"name": "Ann"})
+    assert log.flush(timeout=5)
+    assert [r["session"] for r in log.written] == ["a"]
+    assert log.stats["errors"] == 1
+    log.close()
+
+
+def test_flush_reports_records_that_were_given_up_on():
+    log = FlakyLog(failures=10, flush_interval=0.01, max_retries=1)
+    log.append("a", {"name": "Ann"})
+    assert log.flush(timeout=5) is False
+    assert log.stats["failed"] == 1
+    log.append("b", {"name": "Bob"})  # the flusher is still alive
+    log.failures = 0
+    assert log.flush(timeout=5)
+    log.close()
+
+
+def test_storage_hooks_are_abstract():
+    from session_store import SessionStore
+
+    with pytest.raises(TypeError):
+        ApplicationLog()
+    with pytest.raises(TypeError):
+        SessionStore()
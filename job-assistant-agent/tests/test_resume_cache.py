@@ -0,0 +1,77 @@
+import threading
+import time
+
+from resume_cache import ResumeCache, content_hash
+
+
+class CountingParser:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, data):
+        self.calls += 1
+        time.sleep(self.delay)
+        return data.decode(), 1
+
+
+def extract(text):
+    return {"name": text.split()[0]}
+
+
+def test_same_bytes_are_parsed_once():
+    parse = CountingParser()
+    cache = ResumeCache(parse=parse, extract=extract)
+    first = cache.get(b"Ann Lee")
+    again = cache.get(b"Ann Lee")
+    assert again is first
+    assert first.digest == content_hash(b"Ann Lee")
+    assert first.fields == {"name": "Ann"}
+    assert parse.calls == 1
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "parsed": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    parse = CountingParser()
+    cache = ResumeCache(max_entries=2, parse=parse, extract=extract)
+    cache.get(b"a")
+    cache.get(b"b")
+    cache.get(b"a")  # b is now the oldest
+    cache.get(b"c")
+    assert len(cache) == 2
+    cache.get(b"a")
+    assert parse.calls == 3
+    cache.get(b"b")
+    assert parse.calls == 4
+
+
+def test_entries_on_disk_survive_a_restart(tmp_path):
+    ResumeCache(directory=str(tmp_path), parse=CountingParser(), extract=extract).get(b"Bob Stone")
+    assert not list(tmp_path.glob("*.tmp"))
+
+    parse = CountingParser()
+    reopened = ResumeCache(directory=str(tmp_path), parse=parse, extract=extract)
+    assert reopened.get(b"Bob Stone").text == "Bob Stone"
+    assert parse.calls == 0
+    assert reopened.stats["disk_hits"] == 1
+
+
+def test_unreadable_disk_entry_is_parsed_again(tmp_path):
+    (tmp_path / f"{content_hash(b'Cy')}.json").write_text('{"digest": ')
+    parse = CountingParser()
+    cache = ResumeCache(directory=str(tmp_path), parse=parse, extract=extract)
+    assert cache.get(b"Cy").fields == {"name": "Cy"}
+    assert parse.calls == 1
+
+
+def test_concurrent_uploads_of_one_file_parse_it_once():
+    parse = CountingParser(delay=0.05)
+    cache = ResumeCache(parse=parse, extract=extract)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(b"Dee Park"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert parse.calls == 1
+    assert len({id(result) for result in results}) == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from router import FastPathRouter
+
+
+@pytest.mark.parametrize("text, fields", [
+    ("my email is jane@example.com", {"email": "jane@example.com"}),
+    ("hi, my name is Jane Doe", {"name": "Jane Doe"}),
+    ("call me Jane, jane@example.com thanks", {"name": "Jane", "email": "jane@example.com"}),
+    ("my skills are Python, SQL", {"skills": "Python, SQL"}),
+])
+def test_plain_field_updates_take_the_fast_path(text, fields):
+    route = FastPathRouter().route(text)
+    assert (route.fast, route.fields) == (True, fields)
+
+
+@pytest.mark.parametrize("text, reason", [
+    ("my email is ali@x.com, can you also tell me the deadline", "question"),
+    ("my email is ali@x.com. what is the salary", "question"),
+    ("my email is ali@x.com?", "question"),
+    ("my email is ali@x.com and I want the backend role", "trailing_text"),
+    ("I am bored", "implicit_name"),
+    ("Hi, I am John Smith and my email is john@x.com", "implicit_name"),
+    ("I'm a developer from Lisbon", "no_fields"),
+    ("hello there, I was wondering about jobs, my email is ali@x.com", "free_form"),
+])
+def test_anything_more_goes_to_the_model(text, reason):
+    route = FastPathRouter().route(text)
+    assert (route.fast, route.reason) == (False, reason)
+
+
+def test_question_words_inside_an_email_do_not_count():
+    assert FastPathRouter().route("my email is what.ever@example.com").fast
+
+
+def test_stats_count_both_paths():
+    router = FastPathRouter()
+    router.route("my email is jane@example.com")
+    router.route("hello there")
+    assert (router.stats["fast"], router.stats["llm"], router.stats["reason:no_fields"]) == (1, 1, 1)
@@ -0,0 +1,43 @@
+import pytest
+
+from session_store import open_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**options):
+        url = "memory" if request.param == "memory" else f"sqlite:///{tmp_path / 'sessions.db'}"
+        return open_store(url, **options)
+    return make
+
+
+def test_sessions_are_kept_apart(make_store):
+    store = make_store()
+    with store.session("a") as info:
+        info["name"] = "Ann"
+    with store.session("b") as info:
+        info["email"] = "bob@example.com"
+    assert store.load("a") == {"name": "Ann", "email": None, "skills": None}
+    assert store.load("b")["name"] is None
+
+
+def test_a_failed_turn_does_not_save_half_an_update(make_store):
+    store = make_store()
+    with pytest.raises(RuntimeError):
+        with store.session("a") as info:
+            info["name"] = "Ann"
+            raise RuntimeError
+    assert store.load("a")["name"] is None
+
+
+def test_idle_sessions_are_evicted(make_store):
+    now = [0.0]
+    store = make_store(idle_ttl=10, clock=lambda: now[0])
+    with store.session("a") as info:
+        info["name"] = "Ann"
+    now[0] = 5.0
+    with store.session("b") as info:
+        info["name"] = "Bob"
+    now[0] = 12.0
+    assert store.evict_idle() == 1
+    assert (store.load("a")["name"], store.load("b")["name"]) == (None, "Bob")
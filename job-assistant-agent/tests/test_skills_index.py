@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from skills_index import SkillIndex, SkillTaxonomy, load_taxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy()
+
+
+@pytest.mark.parametrize("text, skills", [
+    ("Python3, k8s and some ML", ["python", "kubernetes", "machine learning"]),
+    ("react native and javascript", ["react native", "javascript"]),
+    ("I excel at teamwork and express ideas clearly", []),
+    ("I can go anywhere, less is more", []),
+    ("python, go and rust", ["python", "go", "rust"]),
+    ("I know Go and Excel", ["go", "excel"]),
+    ("helm, keras, jenkins, mariadb", ["helm", "keras", "jenkins", "mariadb"]),
+    ("security and testing mindset", []),
+])
+def test_normalise(taxonomy, text, skills):
+    assert taxonomy.normalise(text) == skills
+
+
+def test_a_broader_skill_finds_the_ones_below_it(taxonomy):
+    index = SkillIndex(taxonomy)
+    index.add("a", "jenkins")
+    index.add("b", "github actions, helm")
+    index.add("c", "kubernetes")
+    assert index.search(["ci/cd"]) == {"a", "b"}
+    assert index.search(["jenkins"]) == {"a"}
+    assert index.search(["kubernetes"], none_of=["helm"]) == {"c"}
+    assert index.count("k8s") == 2
+
+
+def test_reindexing_replaces_old_postings(taxonomy):
+    index = SkillIndex(taxonomy)
+    index.add("a", "python, sql")
+    index.add("a", "python")
+    assert index.search(["sql"]) == set()
+    assert index.stats() == {"candidates": 1, "skills": 1, "postings": 1}
+
+
+def test_rank_weights_rare_skills_higher(taxonomy):
+    index = SkillIndex(taxonomy)
+    for candidate, skills in (("a", "python"), ("b", "python"), ("c", "python, rust")):
+        index.add(candidate, skills)
+    assert index.rank(["python", "rust"])[0][0] == "c"
+    assert index.rank(["rust"], limit=5) == [("c", pytest.approx(1.3863, abs=1e-4))]
+
+
+def test_loaded_taxonomy_can_declare_parents(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"argo cd": {"aliases": ["argocd"], "parent": "ci/cd"}}))
+    index = SkillIndex(load_taxonomy(str(path)))
+    index.add("a", "ArgoCD")
+    assert index.search(["ci/cd"]) == {"a"}
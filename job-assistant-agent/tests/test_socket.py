@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("agents")
+
+import runtime
+
+
+class EchoRuntime:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.turns = []
+
+    async def handle(self, session_id, message):
+        await asyncio.sleep(self.delay)
+        self.turns.append((session_id, message))
+        return f"you said: {message}\nbye"
+
+
+async def serve(fake):
+    server = await asyncio.start_server(runtime.socket_client(fake), "127.0.0.1", 0, limit=runtime.MAX_LINE_BYTES)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_whole_lines_are_answered_and_a_cut_off_line_is_dropped():
+    async def go():
+        fake = EchoRuntime()
+        server, port = await serve(fake)
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert (await reader.readline()).decode().startswith("Hi!")
+            writer.write(b"my email is a@b.co\nhalf a mess")
+            await writer.drain()
+            assert await reader.readline() == b"you said: my email is a@b.co bye\n"  # one line per reply
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)
+        return fake.turns
+
+    assert [message for _, message in asyncio.run(go())] == ["my email is a@b.co"]
+
+
+def test_only_the_issued_token_resumes_a_session():
+    async def go():
+        fake = EchoRuntime()
+        server, port = await serve(fake)
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            token = (await reader.readline()).decode().split("/session ")[1].strip()
+            writer.write(b"my name is Ann\n")
+            await reader.readline()
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.readline()
+            replies = []
+            for line in ("/session conn-1", "/session sock-short", f"/session {token}", "my email is a@b.co"):
+                writer.write(f"{line}\n".encode())
+                replies.append((await reader.readline()).decode().strip())
+            writer.close()
+        return token, fake.turns, replies
+
+    token, turns, replies = asyncio.run(go())
+    assert runtime.SOCKET_SESSION.fullmatch(token)
+    assert replies[:3] == ["❌ Unknown session token.", "❌ Unknown session token.", "✅ Session resumed."]
+    assert turns == [(token, "my name is Ann"), (token, "my email is a@b.co")]
+
+
+def test_every_connection_gets_its_own_session():
+    assert runtime.new_socket_session() != runtime.new_socket_session()
+
+
+def test_a_client_leaving_mid_turn_does_not_break_the_server():
+    async def go():
+        fake = EchoRuntime(delay=0.1)
+        server, port = await serve(fake)
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.readline()
+            writer.write(b"my name is Ann\n")
+            await writer.drain()
+            writer.transport.abort()  # reset, without waiting for the reply
+            await asyncio.sleep(0.2)
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)  # still serving
+            await reader.readline()
+            writer.write(b"hello\n")
+            reply = await reader.readline()
+            writer.close()
+        return fake.turns, reply
+
+    turns, reply = asyncio.run(go())
+    assert [message for _, message in turns] == ["my name is Ann", "hello"]
+    assert reply.startswith(b"you said: hello")
+
+
+def test_an_oversized_line_closes_the_connection_with_an_error():
+    async def go():
+        server, port = await serve(EchoRuntime())
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.readline()
+            writer.write(b"x" * (runtime.MAX_LINE_BYTES + 10) + b"\n")
+            await writer.drain()
+            reply = await reader.readline()
+            eof = await reader.read()
+            writer.close()
+        return reply, eof
+
+    reply, eof = asyncio.run(go())
+    assert reply.startswith("❌ Message longer".encode()) and eof == b""